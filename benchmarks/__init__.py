@@ -0,0 +1,3 @@
+"""
+Benchmarks of the application database queries and endpoints.
+"""
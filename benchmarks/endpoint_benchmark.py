@@ -0,0 +1,368 @@
+"""
+Benchmark of the web service endpoints, this module seeds synthetic datasets of several
+sizes by SeedService and measures throughput and latency percentiles of every route of
+the application through the flask test client. Results are saved as json to compare
+them between commits, and the benchmark exits with status 1 when a route is slower than
+in a baseline result by more than the threshold.
+
+Usage:
+    python -m benchmarks.endpoint_benchmark --scales 10:1000,100:100000,1000:1000000 \
+        --output results.json --baseline previous.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from department_app import create_app
+from department_app.extensions import db, response_cache
+from department_app.logs import init_logging
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.seed import SeedService
+
+FIRST_BIRTH_DATE = datetime(1960, 1, 1)
+BIRTH_DATE_DAYS = 365 * 45
+# routes which are not benchmarked
+SKIPPED_ENDPOINTS = ('static', 'metrics')
+# routes reading whole tables, requested at most this number of times
+HEAVY_REQUESTS = 3
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Dataset:
+    """
+    Uuids of seeded rows used by requests, and of rows created by the benchmark
+    which are updated and deleted afterwards.
+    """
+    def __init__(self):
+        """
+        Constructor of Dataset class.
+        """
+        self.departments = db.session.execute(
+            select(DepartmentModel.__table__.c.uuid)).scalars().all()
+        self.employees = db.session.execute(select(EmployeeModel.__table__.c.uuid).limit(
+            10000)).scalars().all()
+        self.created_departments = []
+        self.created_employees = []
+        self.counter = 0
+
+    def name(self, prefix):
+        """
+        Returns a unique name.
+        :param prefix: prefix of the name
+        :return: name
+        """
+        self.counter += 1
+        return f'{prefix} {self.counter}'
+
+    @staticmethod
+    def birth_date():
+        """
+        Returns a random birth date in the seeded range.
+        :return: date in iso format
+        """
+        return (FIRST_BIRTH_DATE + timedelta(days=random.randrange(BIRTH_DATE_DAYS))).strftime(
+            '%Y-%m-%d')
+
+
+def post_json(client, url, data, method='post'):
+    """
+    Sends data in json format.
+    :param client: flask test client
+    :param url: url to request
+    :param data: request data
+    :param method: http method
+    :return: response
+    """
+    return getattr(client, method)(url, data=json.dumps(data), content_type='application/json')
+
+
+def create_department(client, dataset):
+    """
+    Creates a department and remembers its uuid.
+    """
+    response = post_json(client, '/api/departments',
+                         {'name': dataset.name('Bench'), 'description': 'Benchmark.'})
+    dataset.created_departments.append(response.json['uuid'])
+    return response
+
+
+def create_employee(client, dataset):
+    """
+    Creates an employee of a seeded department and remembers its uuid.
+    """
+    response = post_json(
+        client, f'/api/employees?department_uuid={random.choice(dataset.departments)}',
+        {'name': dataset.name('Bench'), 'birth_date': dataset.birth_date(), 'salary': 1000})
+    dataset.created_employees.append(response.json['uuid'])
+    return response
+
+
+def import_employees(client, dataset):
+    """
+    Imports a batch of employees of seeded departments in ndjson format.
+    """
+    lines = (json.dumps({'name': dataset.name('Import'), 'birth_date': dataset.birth_date(),
+                         'salary': 1000, 'department_uuid': random.choice(dataset.departments)})
+             for _ in range(100))
+    return client.post('/api/employees/import', data='\n'.join(lines),
+                       content_type='application/x-ndjson')
+
+
+def search_period(client, _):
+    """
+    Searches employees born in a random month.
+    """
+    start = FIRST_BIRTH_DATE + timedelta(days=random.randrange(BIRTH_DATE_DAYS - 30))
+    return client.get(f'/api/employees/search?start_date={start:%Y-%m-%d}'
+                      f'&end_date={start + timedelta(days=30):%Y-%m-%d}')
+
+
+# requests of every benchmarked route by resource or view name and method, run in this
+# order so that rows created by the benchmark are updated and then deleted
+SCENARIOS = {
+    'home.get': lambda client, _: client.get('/'),
+    'departments.get': lambda client, _: client.get('/departments'),
+    'add_department.get': lambda client, _: client.get('/add_department'),
+    'edit_department.get': lambda client, dataset: client.get(
+        f'/edit_department/{random.choice(dataset.departments)}'),
+    'employees.get': lambda client, _: client.get('/employees'),
+    'add_employee.get': lambda client, _: client.get('/add_employee'),
+    'edit_employee.get': lambda client, dataset: client.get(
+        f'/edit_employee/{random.choice(dataset.employees)}'),
+    'DepartmentList.get': lambda client, _: client.get('/api/departments'),
+    'Department.get': lambda client, dataset: client.get(
+        f'/api/departments/{random.choice(dataset.departments)}?include=stats'),
+    'DepartmentExport.get': lambda client, _: client.get('/api/departments/export'),
+    'EmployeeList.get': lambda client, _: client.get('/api/employees'),
+    'Employee.get': lambda client, dataset: client.get(
+        f'/api/employees/{random.choice(dataset.employees)}'),
+    'EmployeeSearchList.get': search_period,
+    'EmployeeExport.get': lambda client, _: client.get('/api/employees/export'),
+    'DepartmentList.post': create_department,
+    'EmployeeList.post': create_employee,
+    'EmployeeImport.post': import_employees,
+    'Department.put': lambda client, dataset: post_json(
+        client, f'/api/departments/{random.choice(dataset.created_departments)}',
+        {'name': dataset.name('Bench'), 'description': 'Updated.'}, 'put'),
+    'Department.patch': lambda client, dataset: post_json(
+        client, f'/api/departments/{random.choice(dataset.created_departments)}',
+        {'description': 'Patched.'}, 'patch'),
+    'Employee.put': lambda client, dataset: post_json(
+        client, f'/api/employees/{random.choice(dataset.created_employees)}'
+                f'?department_uuid={random.choice(dataset.departments)}',
+        {'name': dataset.name('Bench'), 'birth_date': dataset.birth_date(), 'salary': 2000},
+        'put'),
+    'Employee.patch': lambda client, dataset: post_json(
+        client, f'/api/employees/{random.choice(dataset.created_employees)}',
+        {'salary': random.randint(500, 5000)}, 'patch'),
+    'Employee.delete': lambda client, dataset: client.delete(
+        f'/api/employees/{dataset.created_employees.pop()}'),
+    'Department.delete': lambda client, dataset: client.delete(
+        f'/api/departments/{dataset.created_departments.pop()}'),
+}
+HEAVY_SCENARIOS = ('DepartmentExport.get', 'EmployeeExport.get')
+
+
+def route_names(app):
+    """
+    Returns names of the application routes as resource or view name and method,
+    e.g. Department.get.
+    :param app: flask application
+    :return: set of route names
+    """
+    names = set()
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint in SKIPPED_ENDPOINTS:
+            continue
+        view = app.view_functions[rule.endpoint]
+        resource = getattr(getattr(view, 'view_class', None), '__name__',
+                           rule.endpoint.rsplit('.', maxsplit=1)[-1])
+        names.update(f'{resource}.{method.lower()}' for method in rule.methods
+                     if method not in ('HEAD', 'OPTIONS'))
+    return names
+
+
+def summarize(timings, seconds, errors):
+    """
+    Calculates throughput and latency percentiles of a route.
+    :param timings: latencies of requests in milliseconds
+    :param seconds: total time of the requests
+    :param errors: number of responses with an error status
+    :return: dictionary of results
+    """
+    cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 \
+        else timings * 99
+    result = {
+        'requests': len(timings),
+        'errors': errors,
+        'throughput': len(timings) / seconds if seconds else 0.0,
+        'mean_ms': statistics.fmean(timings),
+        'max_ms': max(timings)
+    }
+    result.update({f'p{percentile}_ms': cuts[percentile - 1] for percentile in PERCENTILES})
+    return result
+
+
+def run_scenarios(client, requests_count):
+    """
+    Requests every route the given number of times.
+    :param client: flask test client
+    :param requests_count: number of requests of every route
+    :return: results by route name
+    """
+    dataset = Dataset()
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        count = min(requests_count, HEAVY_REQUESTS) if name in HEAVY_SCENARIOS \
+            else requests_count
+        timings, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(count):
+            start = time.perf_counter()
+            response = scenario(client, dataset)
+            response.get_data()
+            timings.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code >= 400
+        results[name] = summarize(timings, time.perf_counter() - started, errors)
+    return results
+
+
+def regressions(results, baseline, metric, threshold):
+    """
+    Compares results with a baseline.
+    :param results: results by scale and route name
+    :param baseline: baseline results by scale and route name
+    :param metric: compared latency, e.g. p95_ms
+    :param threshold: allowed relative increase of the latency, e.g. 0.2
+    :return: list of scale, route name, baseline and current values
+    """
+    found = []
+    for scale, routes in results.items():
+        for name, result in routes.items():
+            previous = baseline.get(scale, {}).get(name)
+            if previous and result[metric] > previous[metric] * (1 + threshold):
+                found.append((scale, name, previous[metric], result[metric]))
+    return found
+
+
+def create_benchmark_app(database_uri, cache):
+    """
+    Creates the application bound to the benchmark database, logging errors only
+    to console and with the response cache disabled unless requested.
+    :param database_uri: database uri
+    :param cache: True to keep the response cache
+    :return: the app instance
+    """
+    app = create_app()
+    app.config.update(SQLALCHEMY_DATABASE_URI=database_uri, LOG_FILE='', LOG_LEVEL='ERROR')
+    init_logging(app)
+    if not cache:
+        app.config['CACHE_TYPE'] = 'null'
+        response_cache.init_app(app)
+    return app
+
+
+def parse_args():
+    """
+    Parses the command line arguments of the benchmark.
+    :return: the parser and the parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--scales', default='10:1000,100:100000,1000:1000000',
+                        help='comma separated departments:employees pairs')
+    parser.add_argument('--skew', type=float, default=1.0,
+                        help="exponent of Zipf's distribution of department sizes")
+    parser.add_argument('--seed', type=int, default=1, help='seed of the generated data')
+    parser.add_argument('--requests', type=int, default=100,
+                        help='number of requests of every route')
+    parser.add_argument('--database-uri',
+                        help='database to seed, it is emptied, a temporary sqlite by default')
+    parser.add_argument('--cache', action='store_true', help='keep the response cache')
+    parser.add_argument('--output', default='benchmark_results.json', help='results file')
+    parser.add_argument('--baseline', help='results file of a previous run to compare with')
+    parser.add_argument('--metric', default='p95_ms', help='compared latency, e.g. p50_ms')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative increase of the latency')
+    return parser, parser.parse_args()
+
+
+def print_results(scale, routes):
+    """
+    Prints the rows of the results table of one scale.
+    :param scale: departments:employees pair
+    :param routes: results by route name
+    """
+    for name, result in routes.items():
+        print(f'{scale:>14} {name:>22} {result["throughput"]:>9.1f} '
+              f'{result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+              f'{result["p99_ms"]:>8.2f} {result["errors"]:>6}')
+
+
+def report(args, results):
+    """
+    Saves the results and checks them against the baseline, exits with status 1
+    on regressions.
+    :param args: parsed command line arguments
+    :param results: results by scale and route name
+    """
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump({'created': date.today().isoformat(), 'requests': args.requests,
+                   'results': results}, output, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            found = regressions(results, json.load(baseline)['results'], args.metric,
+                                args.threshold)
+        for scale, name, previous, current in found:
+            print(f'Regression of {name} at {scale}: {args.metric} {previous:.2f} -> '
+                  f'{current:.2f}')
+        if found:
+            sys.exit(1)
+
+
+def main():
+    """
+    Runs the benchmark for every scale, prints a table of results, saves them and
+    checks them against the baseline.
+    """
+    parser, args = parse_args()
+    path = None
+    if args.database_uri is None:
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+    app = create_benchmark_app(args.database_uri or f'sqlite:///{path}', args.cache)
+    missing = route_names(app) - set(SCENARIOS)
+    if missing:
+        parser.error(f'no scenarios of routes: {", ".join(sorted(missing))}')
+    results = {}
+    print(f'{"scale":>14} {"route":>22} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} '
+          f'{"p99 ms":>8} {"errors":>6}')
+    with app.app_context():
+        try:
+            for scale in args.scales.split(','):
+                departments_count, employees_count = map(int, scale.split(':'))
+                db.drop_all()
+                db.create_all()
+                SeedService.seed(departments_count, employees_count, args.skew,
+                                 seed=args.seed)
+                db.session.remove()
+                results[scale] = run_scenarios(app.test_client(), args.requests)
+                print_results(scale, results[scale])
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+            if path:
+                os.remove(path)
+    report(args, results)
+
+
+if __name__ == '__main__':
+    main()
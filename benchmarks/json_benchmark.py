@@ -0,0 +1,54 @@
+"""
+Benchmark of json encoding of the employee list, this module measures how long
+the flask-restful default encoding, the compact stdlib backend and the orjson backend
+take to encode an employee list payload, and the size of their output.
+
+Usage:
+    python -m benchmarks.json_benchmark --sizes 10000,100000
+"""
+import argparse
+import json
+
+from benchmarks.serializer_benchmark import build_departments, measure
+from department_app.representations import dumps_orjson, dumps_stdlib, orjson
+from department_app.schemas.compiled import CompiledSerializer
+from department_app.schemas.employee import EmployeeSchema
+
+
+def encoders():
+    """
+    Returns encoders to compare by name.
+    :return: list of names and encoding functions
+    """
+    result = [
+        ('default', lambda data: (json.dumps(data) + '\n').encode()),
+        ('stdlib', dumps_stdlib)
+    ]
+    if orjson is not None:
+        result.append(('orjson', dumps_orjson))
+    return result
+
+
+def main():
+    """
+    Runs the benchmark for every number of employees and prints a table of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help='comma separated numbers of employees')
+    parser.add_argument('--repeat', type=int, default=5, help='number of encodings')
+    args = parser.parse_args()
+
+    serializer = CompiledSerializer(EmployeeSchema(many=True))
+    print(f'{"rows":>8} {"encoder":>8} {"ms":>9} {"bytes":>11}')
+    for size in sorted(int(size) for size in args.sizes.split(',')):
+        _, employees = build_departments(size)
+        payload = serializer.dump(employees)
+        for name, encoder in encoders():
+            duration, output = measure(
+                lambda encoder=encoder, payload=payload: encoder(payload), args.repeat)
+            print(f'{size:>8} {name:>8} {duration:>9.1f} {len(output):>11}')
+
+
+if __name__ == '__main__':
+    main()
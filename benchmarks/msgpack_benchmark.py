@@ -0,0 +1,63 @@
+"""
+Benchmark of msgpack against json for the list endpoints, this module measures payload
+size and time to encode and decode employee and department list payloads.
+
+Usage:
+    python -m benchmarks.msgpack_benchmark --sizes 10000,100000
+"""
+import argparse
+import json
+
+from benchmarks.serializer_benchmark import build_departments, measure
+from department_app.representations import dumps_orjson, json_default, msgpack, orjson
+from department_app.schemas.compiled import CompiledSerializer
+from department_app.schemas.department import DepartmentSchema
+from department_app.schemas.employee import EmployeeSchema
+
+
+def codecs():
+    """
+    Returns encoding and decoding functions to compare by name.
+    :return: list of names, encoding and decoding functions
+    """
+    result = [('json', lambda data: json.dumps(data, separators=(',', ':')).encode(),
+               json.loads)]
+    if orjson is not None:
+        result.append(('orjson', dumps_orjson, orjson.loads))
+    result.append(('msgpack', lambda data: msgpack.packb(data, default=json_default),
+                   lambda data: msgpack.unpackb(data, raw=False)))
+    return result
+
+
+def main():
+    """
+    Runs the benchmark for every number of employees and prints a table of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help='comma separated numbers of employees')
+    parser.add_argument('--repeat', type=int, default=5, help='number of encodings')
+    args = parser.parse_args()
+    if msgpack is None:
+        parser.error('msgpack package is required')
+
+    print(f'{"rows":>8} {"payload":>11} {"codec":>8} {"bytes":>11} '
+          f'{"encode ms":>10} {"decode ms":>10}')
+    for size in sorted(int(size) for size in args.sizes.split(',')):
+        departments, employees = build_departments(size)
+        payloads = (
+            ('employees', CompiledSerializer(EmployeeSchema(many=True)).dump(employees)),
+            ('departments', CompiledSerializer(DepartmentSchema(many=True)).dump(departments))
+        )
+        for name, payload in payloads:
+            for codec, encode, decode in codecs():
+                encode_ms, encoded = measure(
+                    lambda encode=encode, payload=payload: encode(payload), args.repeat)
+                decode_ms, _ = measure(
+                    lambda decode=decode, encoded=encoded: decode(encoded), args.repeat)
+                print(f'{size:>8} {name:>11} {codec:>8} {len(encoded):>11} '
+                      f'{encode_ms:>10.1f} {decode_ms:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of the employee search by birth date, this module measures latency of
+EmployeeService.find_by_birth_date and find_by_birth_period as the employee table
+grows, with and without the birth date indexes.
+
+Usage:
+    python -m benchmarks.search_benchmark --sizes 10000,100000,1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from department_app import create_app
+from department_app.extensions import db
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.employee import EmployeeService
+
+BATCH_SIZE = 50000
+FIRST_BIRTH_DATE = datetime(1960, 1, 1)
+BIRTH_DATE_DAYS = 365 * 45
+
+
+def seed_employees(count, departments_count=100):
+    """
+    Inserts departments and given amount of employees with random birth dates in
+    batches. Departments are inserted first, since SQLite connections enforce the
+    foreign key of employee department.
+    :param count: number of employees
+    :param departments_count: number of departments to spread employees over
+    """
+    db.session.execute(DepartmentModel.__table__.insert(), [{
+        'name': f'Department {number}',
+        'description': f'Department number {number}.',
+        'uuid': str(uuid.uuid4())
+    } for number in range(1, departments_count + 1)])
+    department_ids = db.session.execute(
+        select(DepartmentModel.__table__.c.id)).scalars().all()
+    table = EmployeeModel.__table__
+    for start in range(0, count, BATCH_SIZE):
+        rows = [{
+            'name': f'Employee {number}',
+            'birth_date': FIRST_BIRTH_DATE + timedelta(days=random.randrange(BIRTH_DATE_DAYS)),
+            'salary': random.randint(500, 5000),
+            'uuid': str(uuid.uuid4()),
+            'department_id': random.choice(department_ids)
+        } for number in range(start, min(start + BATCH_SIZE, count))]
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+
+
+def measure(function, repeat):
+    """
+    Calls given function several times and returns median latency in milliseconds.
+    :param function: function to measure
+    :param repeat: number of calls
+    :return: median latency
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.remove()
+    return statistics.median(timings)
+
+
+def run_searches(repeat):
+    """
+    Measures exact date and one month period searches.
+    :param repeat: number of calls of each search
+    :return: median latencies of the searches
+    """
+    day = FIRST_BIRTH_DATE + timedelta(days=BIRTH_DATE_DAYS // 2)
+    return (
+        measure(lambda: EmployeeService.find_by_birth_date(day), repeat),
+        measure(lambda: EmployeeService.find_by_birth_period(day, day + timedelta(days=30)),
+                repeat)
+    )
+
+
+def main():
+    """
+    Runs the benchmark for every table size and prints a table of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='comma separated numbers of employees')
+    parser.add_argument('--repeat', type=int, default=20, help='number of searches')
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    indexes = [index for index in EmployeeModel.__table__.indexes
+               if 'birth_date' in index.columns]
+    print(f'{"employees":>10} {"index":>6} {"date ms":>9} {"period ms":>10}')
+    with app.app_context():
+        try:
+            for size in sorted(int(size) for size in args.sizes.split(',')):
+                db.drop_all()
+                db.create_all()
+                seed_employees(size)
+                for index_enabled in (False, True):
+                    for index in indexes:
+                        if index_enabled:
+                            index.create(db.engine)
+                        else:
+                            index.drop(db.engine)
+                    date_ms, period_ms = run_searches(args.repeat)
+                    print(f'{size:>10} {str(index_enabled):>6} '
+                          f'{date_ms:>9.2f} {period_ms:>10.2f}')
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
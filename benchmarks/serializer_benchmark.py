@@ -0,0 +1,103 @@
+"""
+Benchmark of employee and department serialization, this module measures how long
+EmployeeSchema and DepartmentSchema take to dump lists of objects compared with their
+compiled serializers, and checks that both produce the same json.
+
+Usage:
+    python -m benchmarks.serializer_benchmark --sizes 10000,100000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.schemas.compiled import CompiledSerializer
+from department_app.schemas.department import DepartmentSchema
+from department_app.schemas.employee import EmployeeSchema
+
+EMPLOYEES_PER_DEPARTMENT = 10
+FIRST_BIRTH_DATE = date(1960, 1, 1)
+BIRTH_DATE_DAYS = 365 * 45
+
+
+def build_departments(employees_count):
+    """
+    Builds unsaved departments with the given total amount of employees.
+    :param employees_count: number of employees
+    :return: list of departments and list of employees
+    """
+    departments, employees = [], []
+    for number in range(0, employees_count, EMPLOYEES_PER_DEPARTMENT):
+        department = DepartmentModel(f'Department {number}', 'Some department.')
+        department.uuid = str(uuid.uuid4())
+        department.employees = [EmployeeModel(
+            f'Employee {number + offset}',
+            FIRST_BIRTH_DATE + timedelta(days=random.randrange(BIRTH_DATE_DAYS)),
+            random.randint(500, 5000)
+        ) for offset in range(min(EMPLOYEES_PER_DEPARTMENT, employees_count - number))]
+        for employee in department.employees:
+            employee.uuid = str(uuid.uuid4())
+        departments.append(department)
+        employees.extend(department.employees)
+    return departments, employees
+
+
+def measure(function, repeat):
+    """
+    Calls given function several times and returns median duration in milliseconds
+    together with the result of the last call.
+    :param function: function to measure
+    :param repeat: number of calls
+    :return: median duration and result
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def compare(schema, objects, repeat):
+    """
+    Measures dump of objects by the schema and by its compiled serializer.
+    :param schema: marshmallow schema dumping lists
+    :param objects: list of objects
+    :param repeat: number of dumps
+    :return: durations of schema and compiled dumps in milliseconds
+    """
+    serializer = CompiledSerializer(schema)
+    schema_ms, expected = measure(lambda: schema.dump(objects), repeat)
+    compiled_ms, result = measure(lambda: serializer.dump(objects), repeat)
+    if json.dumps(expected, sort_keys=True) != json.dumps(result, sort_keys=True):
+        raise AssertionError(f'{type(schema).__name__} output differs from compiled one')
+    return schema_ms, compiled_ms
+
+
+def main():
+    """
+    Runs the benchmark for every number of employees and prints a table of results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help='comma separated numbers of employees')
+    parser.add_argument('--repeat', type=int, default=5, help='number of dumps')
+    args = parser.parse_args()
+
+    print(f'{"rows":>8} {"schema":>12} {"schema ms":>10} {"compiled ms":>12} {"speedup":>8}')
+    for size in sorted(int(size) for size in args.sizes.split(',')):
+        departments, employees = build_departments(size)
+        for schema, objects in ((EmployeeSchema(many=True), employees),
+                                (DepartmentSchema(many=True), departments)):
+            schema_ms, compiled_ms = compare(schema, objects, args.repeat)
+            print(f'{size:>8} {type(schema).__name__:>12} {schema_ms:>10.1f} '
+                  f'{compiled_ms:>12.1f} {schema_ms / compiled_ms:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
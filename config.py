@@ -16,6 +16,33 @@ server = os.environ.get('MYSQL_SERVER')
 database = os.environ.get('MYSQL_DATABASE')
 
 
+def engine_options():
+    """
+    Builds options of the database engine from environment variables. Connections are
+    checked before use and recycled before MySQL wait_timeout closes them, pool sizes
+    and timeouts are set only when their variables are present.
+    :return: dictionary of engine options
+    """
+    pre_ping = os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    options = {
+        'pool_pre_ping': pre_ping,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    }
+    for option, variable in (('pool_size', 'DB_POOL_SIZE'),
+                             ('max_overflow', 'DB_MAX_OVERFLOW'),
+                             ('pool_timeout', 'DB_POOL_TIMEOUT')):
+        if variable in os.environ:
+            options[option] = int(os.environ[variable])
+    connect_args = {argument: int(os.environ[variable]) for argument, variable in (
+        ('connect_timeout', 'DB_CONNECT_TIMEOUT'),
+        ('read_timeout', 'DB_READ_TIMEOUT'),
+        ('write_timeout', 'DB_WRITE_TIMEOUT')
+    ) if variable in os.environ}
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
 # pylint: disable=too-few-public-methods
 class Config:
     """
@@ -25,3 +52,51 @@ class Config:
     SECRET_KEY = secrets.token_hex(32)
     SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{user}:{password}@{server}/{database}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options()
+    # read replicas used by read-only service methods of GET requests
+    SQLALCHEMY_BINDS = {
+        f'replica_{number}': uri for number, uri in enumerate(
+            uri for uri in os.environ.get('SQLALCHEMY_REPLICA_URIS', '').split(',') if uri)
+    }
+    SQLALCHEMY_REPLICA_BINDS = list(SQLALCHEMY_BINDS)
+    # level of logs, DEBUG in development and INFO otherwise
+    LOG_LEVEL = os.environ.get(
+        'LOG_LEVEL', 'DEBUG' if os.environ.get('FLASK_ENV') == 'development' else 'INFO')
+    # levels of particular loggers, e.g. 'sqlalchemy.engine=INFO,werkzeug=WARNING'
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', 'sqlalchemy=WARNING')
+    # log file shared by worker processes, empty to log to console only
+    LOG_FILE = os.environ.get('LOG_FILE', 'logfile.log')
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    # number of connections opened when the application starts
+    DB_POOL_WARMUP = int(os.environ.get('DB_POOL_WARMUP', 0))
+    # default and maximum number of items on a page of list APIs
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 100))
+    API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 1000))
+    # response cache of read APIs: 'lru', 'redis' or 'null'
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'lru')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 60))
+    CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 1024))
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # number of employees deleted by a transaction of a background department delete
+    DEPARTMENT_DELETE_CHUNK_SIZE = int(os.environ.get('DEPARTMENT_DELETE_CHUNK_SIZE', 1000))
+    # responses smaller than the size in bytes are not compressed
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    # statements taking at least the seconds are logged as slow queries, 0 to disable
+    SLOW_QUERY_THRESHOLD = float(os.environ.get('SLOW_QUERY_THRESHOLD', 0.5))
+    # statements executed the number of times by a request are logged as probable N+1
+    # queries, 0 to disable
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+    # path of request metrics in Prometheus text format
+    METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+    # directory shared by worker processes to aggregate their metrics, empty for a
+    # single process, and seconds between writes of metrics of a process to it
+    METRICS_DIR = os.environ.get('METRICS_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+    # json encoder of API responses: 'auto', 'orjson' or 'stdlib'
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    # compact json output, indented in debug mode when not set
+    JSON_COMPACT = (os.environ['JSON_COMPACT'].lower() in ('1', 'true', 'yes')
+                    if 'JSON_COMPACT' in os.environ else None)
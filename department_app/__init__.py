@@ -8,13 +8,23 @@ from flask import Flask
 from config import Config
 from department_app.extensions import db
 from department_app.extensions import migrate
+from department_app.extensions import response_cache
+from department_app.extensions import compress
+from department_app.database import init_database
+from department_app.metrics import request_metrics
+from department_app.queries import query_instrumentation
+from department_app.logs import init_logging
 from department_app.extensions import logger
 from department_app.views import views_bp
 from department_app.models.department import DepartmentModel
 from department_app.models.employee import EmployeeModel
+from department_app.models.department_stats import DepartmentStatsModel
+from department_app.models.table_version import TableVersionModel
 from department_app.extensions import api
-from department_app.rest.department import Department, DepartmentList
-from department_app.rest.employee import Employee, EmployeeList, EmployeeSearchList
+from department_app.cli import department_stats_cli, employees_cli, seed_cli
+from department_app.rest.department import Department, DepartmentList, DepartmentExport
+from department_app.rest.employee import Employee, EmployeeList, EmployeeSearchList, \
+    EmployeeImport, EmployeeExport
 
 
 MIGRATION_DIRECTORY = os.path.join('department_app', 'migrations')
@@ -27,13 +37,21 @@ def create_app():
     """
     app = Flask(__name__)
     app.config.from_object(Config)
-    db.init_app(app)
+    init_logging(app)
+    init_database(app)
     # Create database if does not exist
     # with app.app_context():
     #     db.create_all()
     migrate.init_app(app, db, directory=MIGRATION_DIRECTORY)
+    query_instrumentation.init_app(app)
+    request_metrics.init_app(app)
+    response_cache.init_app(app)
+    compress.init_app(app)
     register_api_and_blueprint(app)
     api.init_app(app)
+    app.cli.add_command(department_stats_cli)
+    app.cli.add_command(employees_cli)
+    app.cli.add_command(seed_cli)
     return app
 
 
@@ -44,8 +62,11 @@ def register_api_and_blueprint(app):
     app.register_blueprint(views_bp)
     api.app = app
     api.add_resource(DepartmentList, '/api/departments')
+    api.add_resource(DepartmentExport, '/api/departments/export')
     api.add_resource(Department, '/api/departments/<uuid>')
 
     api.add_resource(EmployeeList, '/api/employees')
     api.add_resource(EmployeeSearchList, '/api/employees/search')
+    api.add_resource(EmployeeImport, '/api/employees/import')
+    api.add_resource(EmployeeExport, '/api/employees/export')
     api.add_resource(Employee, '/api/employees/<uuid>')
@@ -0,0 +1,255 @@
+"""
+Response cache module used to cache responses of the read APIs, this module
+defines the following classes:
+- LRUCacheBackend which is an in-process cache with expiration and size-bounded eviction
+- RedisCacheBackend which is an out-of-process cache stored in redis
+- NullCacheBackend which does not cache anything
+- ResponseCache which caches resource responses and invalidates them by tags
+"""
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request
+
+# key of the wsgi environment under which outer decorators, such as conditional which
+# stores the entity tag of the request, put a value the cache key has to include
+CACHE_VARIANT_KEY = 'department_app.cache_variant'
+
+
+class LRUCacheBackend:
+    """
+    In-process cache which evicts least recently used entries when it is full
+    and expired entries when they are read.
+    """
+    def __init__(self, max_size=1024, default_timeout=300):
+        """
+        Constructor of LRUCacheBackend class.
+        :param max_size: maximum number of entries
+        :param default_timeout: lifetime of entries in seconds
+        """
+        self.max_size = max_size
+        self.default_timeout = default_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns a cached value or None if there is no such or it has expired.
+        :param key: cache key
+        :return: cached value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Stores a value and evicts the least recently used entries above the size limit.
+        :param key: cache key
+        :param value: value to cache
+        :param timeout: lifetime of the entry in seconds
+        """
+        expires = time.monotonic() + (timeout or self.default_timeout)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        """
+        Removes given entries.
+        :param keys: cache keys
+        """
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all the entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """
+        Number of stored entries.
+        :return: number of entries
+        """
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Out-of-process cache shared by all the workers, values are stored in redis as json.
+    """
+    def __init__(self, client, default_timeout=300, prefix='department_app:'):
+        """
+        Constructor of RedisCacheBackend class.
+        :param client: redis client
+        :param default_timeout: lifetime of entries in seconds
+        :param prefix: prefix of the keys of the application
+        """
+        self.client = client
+        self.default_timeout = default_timeout
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """
+        Creates backend connected to redis server by url.
+        :param url: redis url
+        :return: backend instance
+        """
+        try:
+            import redis  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise RuntimeError('redis package is required for redis cache backend') from error
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        """
+        Returns a cached value or None if there is no such or it has expired.
+        :param key: cache key
+        :return: cached value
+        """
+        value = self.client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value, timeout=None):
+        """
+        Stores a value which expires after timeout.
+        :param key: cache key
+        :param value: value to cache
+        :param timeout: lifetime of the entry in seconds
+        """
+        self.client.set(self.prefix + key, json.dumps(value),
+                        ex=timeout or self.default_timeout)
+
+    def delete(self, *keys):
+        """
+        Removes given entries.
+        :param keys: cache keys
+        """
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        """
+        Removes all the entries of the application.
+        """
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class NullCacheBackend(LRUCacheBackend):
+    """
+    Cache backend which does not store anything, every entry is evicted as soon
+    as it is set.
+    """
+    def __init__(self):
+        """
+        Constructor of NullCacheBackend class.
+        """
+        super().__init__(max_size=0)
+
+
+class ResponseCache:
+    """
+    Caches responses of resource get methods. Every cached response is marked with tags,
+    such as a list or a single entity, and the key of the response includes the current
+    versions of the tags. Invalidation of a tag drops its version, so all the responses
+    stored under the old one are never read again and expire by themselves. The key also
+    includes the variant of the request set by outer decorators, so that a response cached
+    under an entity tag is returned only with that tag.
+    """
+    def __init__(self, app=None):
+        """
+        Constructor of ResponseCache class.
+        :param app: flask application
+        """
+        self.backend = NullCacheBackend()
+        self.timeout = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Creates the cache backend configured by CACHE_TYPE, which is 'lru', 'redis'
+        or 'null', CACHE_DEFAULT_TIMEOUT, CACHE_MAX_SIZE and CACHE_REDIS_URL.
+        :param app: flask application
+        """
+        cache_type = app.config.get('CACHE_TYPE', 'lru')
+        self.timeout = app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
+        if cache_type == 'redis':
+            self.backend = RedisCacheBackend.from_url(
+                app.config['CACHE_REDIS_URL'], default_timeout=self.timeout)
+        elif cache_type == 'lru':
+            self.backend = LRUCacheBackend(app.config.get('CACHE_MAX_SIZE', 1024), self.timeout)
+        else:
+            self.backend = NullCacheBackend()
+
+    def _version(self, tag):
+        """
+        Returns the current version of a tag, a new one is created when it is missing.
+        :param tag: tag of cached responses
+        :return: version of the tag
+        """
+        version = self.backend.get(f'version:{tag}')
+        if version is None:
+            version = uuid.uuid4().hex
+            self.backend.set(f'version:{tag}', version, self.timeout)
+        return version
+
+    def cached(self, tag_function):
+        """
+        Decorator of a resource get method, which returns cached response if there is
+        one and caches successful responses otherwise.
+        :param tag_function: function building a tag or a tuple of tags from the view
+        arguments
+        :return: decorator
+        """
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                tags = tag_function(**kwargs)
+                if isinstance(tags, str):
+                    tags = (tags,)
+                versions = ':'.join(f'{tag}:{self._version(tag)}' for tag in tags)
+                variant = request.environ.get(CACHE_VARIANT_KEY, '')
+                key = f'response:{versions}:{variant}:{request.full_path}'
+                cached_response = self.backend.get(key)
+                if cached_response is not None:
+                    return cached_response[0], cached_response[1]
+                body, status = function(*args, **kwargs)
+                if status == 200:
+                    self.backend.set(key, [body, status], self.timeout)
+                return body, status
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """
+        Invalidates all the responses cached with given tags.
+        :param tags: tags of cached responses
+        """
+        self.backend.delete(*(f'version:{tag}' for tag in tags))
+
+    def clear(self):
+        """
+        Removes all the cached responses.
+        """
+        self.backend.clear()
@@ -0,0 +1,6 @@
+"""
+Flask command line interface commands of the application.
+"""
+from department_app.cli.department_stats import department_stats_cli
+from department_app.cli.employees import employees_cli
+from department_app.cli.seed import seed_cli
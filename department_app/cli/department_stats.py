@@ -0,0 +1,34 @@
+"""
+Department statistics commands module, this module defines the following commands:
+- flask department-stats rebuild to recalculate the department_stats table
+- flask department-stats check to compare the department_stats table with employees
+"""
+import click
+from flask.cli import AppGroup
+
+from department_app.service.department_stats import DepartmentStatsService
+
+department_stats_cli = AppGroup('department-stats', help='Maintain department statistics.')
+
+
+@department_stats_cli.command('rebuild')
+def rebuild():
+    """
+    Recalculates statistics of all the departments from the employee table.
+    """
+    count = DepartmentStatsService.rebuild()
+    click.echo(f'Rebuilt statistics of {count} departments.')
+
+
+@department_stats_cli.command('check')
+def check():
+    """
+    Compares stored statistics with statistics recalculated from the employee table
+    and exits with a status code 1 when they differ.
+    """
+    differences = DepartmentStatsService.check_consistency()
+    for department_id, column, stored, expected in differences:
+        click.echo(f'Department {department_id}: {column} is {stored}, expected {expected}')
+    if differences:
+        raise click.exceptions.Exit(1)
+    click.echo('Department statistics are consistent.')
@@ -0,0 +1,43 @@
+"""
+Employees commands module, this module defines the following commands:
+- flask employees import to create employees in bulk from a csv or ndjson file
+"""
+import json
+import os
+
+import click
+from flask.cli import AppGroup
+
+from department_app.service.employee_import import (
+    EmployeeImportService, ImportFormatError, FORMATS)
+
+employees_cli = AppGroup('employees', help='Manage employees.')
+
+
+@employees_cli.command('import')
+@click.argument('file', type=click.File('rb'))
+@click.option('--format', 'input_format', type=click.Choice(FORMATS),
+              help='Input format, detected by the file extension by default.')
+@click.option('--batch-size', default=1000, show_default=True, type=click.IntRange(min=1),
+              help='Number of employees inserted in one transaction.')
+@click.option('--errors', 'errors_file', type=click.File('w'),
+              help='File to write the per-row error report to in json format.')
+def import_employees(file, input_format, batch_size, errors_file):
+    """
+    Creates employees from a csv or ndjson FILE with name, birth_date, salary
+    and optional department_uuid fields.
+    """
+    if input_format is None:
+        extension = os.path.splitext(file.name)[1].lstrip('.').lower()
+        input_format = 'csv' if extension == 'csv' else 'ndjson'
+    rows = EmployeeImportService.parse(file, input_format)
+    try:
+        report = EmployeeImportService.import_rows(rows, batch_size)
+    except ImportFormatError as error:
+        raise click.ClickException(str(error)) from error
+    if errors_file:
+        json.dump(report['errors'], errors_file, indent=2)
+    else:
+        for error in report['errors']:
+            click.echo(f'Line {error["line"]}: {json.dumps(error["messages"])}', err=True)
+    click.echo(f'Imported {report["imported"]} employees, {report["failed"]} failed.')
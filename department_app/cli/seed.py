@@ -0,0 +1,40 @@
+"""
+Seed command module, this module defines the following command:
+- flask seed to insert synthetic departments and employees for load testing
+"""
+import time
+
+import click
+from flask.cli import with_appcontext
+
+from department_app.service.seed import SeedService
+
+
+@click.command('seed')
+@click.option('--departments', default=100, show_default=True, type=click.IntRange(min=0),
+              help='Number of departments.')
+@click.option('--employees', default=10000, show_default=True, type=click.IntRange(min=0),
+              help='Number of employees.')
+@click.option('--skew', default=1.0, show_default=True, type=click.FloatRange(min=0),
+              help="Exponent of Zipf's distribution of department sizes, 0 for equal sizes.")
+@click.option('--batch-size', default=50000, show_default=True, type=click.IntRange(min=1),
+              help='Number of employees inserted by one statement.')
+@click.option('--processes', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of processes inserting employees.')
+@click.option('--seed', 'random_seed', type=int,
+              help='Seed of the random generator to repeat the same data.')
+@click.option('--truncate', is_flag=True,
+              help='Delete all the departments and employees first.')
+@with_appcontext
+def seed_cli(departments, employees, skew, batch_size, processes, random_seed, truncate):
+    """
+    Inserts synthetic departments and employees with realistic names, birth dates,
+    salaries and skewed department sizes.
+    """
+    # pylint: disable=too-many-arguments
+    if truncate:
+        SeedService.truncate()
+    started = time.perf_counter()
+    SeedService.seed(departments, employees, skew, batch_size, processes, random_seed)
+    click.echo(f'Inserted {departments} departments and {employees} employees in '
+               f'{time.perf_counter() - started:.1f}s.')
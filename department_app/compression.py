@@ -0,0 +1,224 @@
+"""
+Response compression module used to compress responses of the application, this module
+defines the following classes:
+- GzipStream and BrotliStream which compress data chunk by chunk
+- Compress which negotiates Accept-Encoding and compresses responses
+"""
+import threading
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# media types compressed by default
+COMPRESS_MIMETYPES = (
+    'application/json', 'application/msgpack', 'application/x-msgpack',
+    'application/x-ndjson', 'text/csv', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript'
+)
+
+
+class GzipStream:
+    """
+    Gzip compressor which flushes compressed data of every chunk.
+    """
+    def __init__(self, level=6):
+        """
+        Constructor of GzipStream class.
+        :param level: compression level from 1 to 9
+        """
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data):
+        """
+        Compresses a chunk of data.
+        :param data: bytes to compress
+        :return: compressed bytes
+        """
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        """
+        Finishes the compressed stream.
+        :return: remaining compressed bytes
+        """
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    """
+    Brotli compressor which flushes compressed data of every chunk.
+    """
+    def __init__(self, quality=4):
+        """
+        Constructor of BrotliStream class.
+        :param quality: compression quality from 0 to 11
+        """
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        """
+        Compresses a chunk of data.
+        :param data: bytes to compress
+        :return: compressed bytes
+        """
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        """
+        Finishes the compressed stream.
+        :return: remaining compressed bytes
+        """
+        return self._compressor.finish()
+
+
+class Compress:
+    """
+    Compresses responses with gzip or brotli, whichever the client prefers. Responses
+    are compressed when their media type is compressible, they are not encoded yet and
+    their size is not less than COMPRESS_MIN_SIZE. Streamed responses are compressed
+    chunk by chunk while they are sent. Counts bytes saved by compression.
+    """
+    def __init__(self, app=None):
+        """
+        Constructor of Compress class.
+        :param app: flask application
+        """
+        self.min_size = 500
+        self.mimetypes = COMPRESS_MIMETYPES
+        self.levels = {}
+        self.metrics = {'responses': 0, 'bytes_in': 0, 'bytes_out': 0}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Reads COMPRESS_MIN_SIZE, COMPRESS_MIMETYPES, COMPRESS_GZIP_LEVEL and
+        COMPRESS_BROTLI_QUALITY settings and registers compression of responses.
+        :param app: flask application
+        """
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.mimetypes = app.config.get('COMPRESS_MIMETYPES', COMPRESS_MIMETYPES)
+        self.levels = {'gzip': app.config.get('COMPRESS_GZIP_LEVEL', 6)}
+        if brotli is not None:
+            self.levels['br'] = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        app.after_request(self.after_request)
+
+    @property
+    def bytes_saved(self):
+        """
+        Number of bytes saved by compression of all the responses.
+        :return: bytes saved
+        """
+        return self.metrics['bytes_in'] - self.metrics['bytes_out']
+
+    def _record(self, bytes_in, bytes_out):
+        """
+        Adds sizes of a compressed response to the metrics.
+        :param bytes_in: size before compression
+        :param bytes_out: size after compression
+        """
+        with self._lock:
+            self.metrics['responses'] += 1
+            self.metrics['bytes_in'] += bytes_in
+            self.metrics['bytes_out'] += bytes_out
+
+    def _stream(self, encoding):
+        """
+        Creates a compressor for the encoding.
+        :param encoding: 'gzip' or 'br'
+        :return: compressor
+        """
+        if encoding == 'br':
+            return BrotliStream(self.levels['br'])
+        return GzipStream(self.levels['gzip'])
+
+    @staticmethod
+    def _compressible(response):
+        """
+        Checks whether a response may get a content encoding.
+        :param response: response
+        :return: True if the response has a full body which is not encoded yet
+        """
+        return not (response.status_code < 200 or response.status_code in (204, 206, 304)
+                    or 'Content-Encoding' in response.headers
+                    or response.direct_passthrough)
+
+    def _compress_data(self, response, encoding):
+        """
+        Compresses the body of a response which is not streamed, unless it is smaller
+        than the threshold or compression does not make it smaller.
+        :param response: response
+        :param encoding: 'gzip' or 'br'
+        :return: True if the body has been compressed
+        """
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return False
+        stream = self._stream(encoding)
+        compressed = stream.compress(data) + stream.finish()
+        if len(compressed) >= len(data):
+            return False
+        response.set_data(compressed)
+        self._record(len(data), len(compressed))
+        return True
+
+    def after_request(self, response):
+        """
+        Compresses the response with the encoding negotiated by Accept-Encoding.
+        :param response: response
+        :return: compressed or original response
+        """
+        if response.mimetype not in self.mimetypes and response.status_code != 304:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(
+            sorted(self.levels, key=lambda name: name != 'br'))
+        if encoding is not None and response.status_code == 304:
+            self._weaken_etag(response)
+        if encoding is None or not self._compressible(response):
+            return response
+        if response.is_streamed:
+            response.response = self._compress_stream(response.iter_encoded(), encoding)
+            response.headers.pop('Content-Length', None)
+        elif not self._compress_data(response, encoding):
+            return response
+        response.headers['Content-Encoding'] = encoding
+        self._weaken_etag(response)
+        return response
+
+    def _compress_stream(self, chunks, encoding):
+        """
+        Compresses chunks of a streamed response while they are produced.
+        :param chunks: iterable of bytes
+        :param encoding: 'gzip' or 'br'
+        :return: generator of compressed chunks
+        """
+        stream = self._stream(encoding)
+        bytes_in = bytes_out = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            compressed = stream.compress(chunk)
+            bytes_in += len(chunk)
+            bytes_out += len(compressed)
+            yield compressed
+        compressed = stream.finish()
+        self._record(bytes_in, bytes_out + len(compressed))
+        yield compressed
+
+    @staticmethod
+    def _weaken_etag(response):
+        """
+        Marks the entity tag of an encoded response as weak, since it is the same for
+        all the encodings of the representation.
+        :param response: response
+        """
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
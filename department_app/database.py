@@ -0,0 +1,169 @@
+"""
+Database engine module used to tune and observe the connection pool, this module
+defines the following:
+- PoolMetrics which counts connection checkouts and their wait time
+- InstrumentedQueuePool which is a queue pool measuring checkout wait time
+- dispose_engines_after_fork which drops inherited connections in forked workers
+- enable_sqlite_foreign_keys which turns on foreign key actions of SQLite connections
+- warm_up_pool which opens pool connections in advance
+- init_database which binds the database with a tuned engine to the application
+"""
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from department_app.extensions import db, logger
+
+
+class PoolMetrics:
+    """
+    Counts connection checkouts and the time spent waiting for them.
+    """
+    def __init__(self):
+        """
+        Constructor of PoolMetrics class.
+        """
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def observe_checkout(self, seconds):
+        """
+        Records a checkout of a connection.
+        :param seconds: time spent waiting for the connection
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def collect(self, engine):
+        """
+        Returns checkout statistics together with the current state of the engine pool.
+        Limit is the maximum number of connections and saturation is a share of checked
+        out connections in it, both are None when the pool is not limited.
+        :param engine: database engine
+        :return: dictionary of metrics
+        """
+        pool = engine.pool
+        metrics = {
+            'checkouts': self.checkouts,
+            'wait_seconds_total': self.wait_seconds_total,
+            'wait_seconds_max': self.wait_seconds_max,
+            'checked_out': None,
+            'size': None,
+            'limit': None,
+            'saturation': None
+        }
+        if isinstance(pool, QueuePool):
+            metrics['checked_out'] = pool.checkedout()
+            metrics['size'] = pool.size()
+            # pylint: disable=protected-access
+            if pool.size() > 0 and pool._max_overflow >= 0:
+                metrics['limit'] = pool.size() + pool._max_overflow
+                metrics['saturation'] = pool.checkedout() / metrics['limit']
+        return metrics
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    Queue pool which records time of every connection checkout, including waiting for
+    a free connection and opening a new one.
+    """
+    # name of the pool logger under sqlalchemy.pool, so that LOG_LEVELS of sqlalchemy
+    # loggers apply to it like to the pools of sqlalchemy
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.InstrumentedQueuePool'
+
+    def connect(self):
+        """
+        Checks out a connection from the pool.
+        :return: connection
+        """
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_metrics.observe_checkout(time.perf_counter() - start)
+
+
+# engines of the process, their pools are replaced in forked workers
+_engines = weakref.WeakSet()
+
+
+@event.listens_for(Engine, 'engine_connect')
+def track_engine(connection, branch):
+    """
+    Remembers the engine of a new connection.
+    """
+    # pylint: disable=unused-argument
+    _engines.add(connection.engine)
+
+
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    Enables foreign key constraints of a new SQLite connection, which are disabled
+    by default, so that employees are deleted by ON DELETE CASCADE like on MySQL.
+    """
+    # pylint: disable=unused-argument
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+
+def dispose_engines_after_fork():
+    """
+    Replaces pools of the engines inherited by a forked worker with new empty ones.
+    Connections of the parent process are dropped without being closed, so that the
+    parent can still use them, and the worker opens its own connections.
+    """
+    for engine in list(_engines):
+        engine.pool = engine.pool.recreate()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=dispose_engines_after_fork)
+
+
+def warm_up_pool(engine, count):
+    """
+    Opens given number of connections at once and returns them to the pool, so that
+    first requests do not wait for connections to be established.
+    :param engine: database engine
+    :param count: number of connections
+    """
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def init_database(app):
+    """
+    Binds the database to the application with the engine using the instrumented pool
+    and warms the pool up with DB_POOL_WARMUP connections.
+    :param app: flask application
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+    count = app.config.get('DB_POOL_WARMUP', 0)
+    if count:
+        with app.app_context():
+            try:
+                warm_up_pool(db.engine, count)
+            except exc.SQLAlchemyError as error:
+                logger.warning('Failed to warm up database pool: %s', error)
@@ -0,0 +1,208 @@
+"""
+Logging module used to write logs off the request path, this module defines the following:
+- SharedRotatingFileHandler which rotates a log file shared by several worker processes
+- DeferredQueueHandler which passes records to a queue without formatting them
+- LogListener which holds the queue listener of the process
+- init_logging which configures levels and a queue listener writing to file and console
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# format of log records written to file and console
+LOG_FORMAT = '%(asctime)s - %(process)d - %(levelname)s - %(name)s - %(message)s'
+
+
+class SharedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler which can be used by several worker processes writing the same
+    file. Records are written and the file is rotated under an exclusive lock of a lock
+    file, and a process reopens the file once another process has rotated it.
+    """
+    def __init__(self, filename, max_bytes=0, backup_count=0):
+        """
+        Constructor of SharedRotatingFileHandler class.
+        :param filename: path of the log file
+        :param max_bytes: size of the file in bytes which causes rotation
+        :param backup_count: number of rotated files kept
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        self._lock_file = None
+        self._open_lock_file()
+
+    def _open_lock_file(self):
+        """
+        Opens the lock file guarding writes and rotation of the log file.
+        """
+        if fcntl is not None:
+            # pylint: disable=consider-using-with
+            self._lock_file = open(f'{self.baseFilename}.lock', 'a', encoding='utf-8')
+
+    def after_fork(self):
+        """
+        Reopens the log and lock files in a forked worker, since locks of a file
+        opened by the parent process are shared with it.
+        """
+        if self._lock_file is not None:
+            self._lock_file.close()
+        self._open_lock_file()
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def emit(self, record):
+        """
+        Writes a record under the lock of the log file.
+        :param record: log record
+        """
+        if self._lock_file is None:
+            super().emit(record)
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            self._reopen_if_rotated()
+            super().emit(record)
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self):
+        """
+        Closes the stream when the log file has been rotated by another process,
+        so that the next record is written to the new file.
+        """
+        if self.stream is None:
+            return
+        try:
+            rotated = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = None
+
+    def close(self):
+        """
+        Closes the log file and the lock file.
+        """
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which leaves formatting of messages to the listener thread, so that
+    the request thread only puts a record into the queue. Arguments of log calls must
+    not be changed after logging.
+    """
+    def prepare(self, record):
+        """
+        Returns a record to put into the queue as it is.
+        :param record: log record
+        :return: the same record
+        """
+        return record
+
+
+class LogListener:
+    """
+    Holder of the queue listener writing queued records of the process, which is
+    replaced whenever logging is configured again.
+    """
+    def __init__(self):
+        """
+        Constructor of LogListener class.
+        """
+        self.listener = None
+
+    def start(self, records, handlers):
+        """
+        Stops the current listener and starts a new one.
+        :param records: queue of log records
+        :param handlers: handlers writing the records
+        """
+        self.stop()
+        self.listener = logging.handlers.QueueListener(records, *handlers)
+        self.listener.start()
+
+    def stop(self):
+        """
+        Writes the remaining queued records and stops the listener.
+        """
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+    def restart_after_fork(self):
+        """
+        Starts a new listener thread in a forked worker, since threads are not
+        inherited, with its own handles of the log file.
+        """
+        if self.listener is not None:
+            for handler in self.listener.handlers:
+                if isinstance(handler, SharedRotatingFileHandler):
+                    handler.after_fork()
+            self.listener._thread = None  # pylint: disable=protected-access
+            self.listener.start()
+
+
+log_listener = LogListener()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=log_listener.restart_after_fork)
+atexit.register(log_listener.stop)
+
+
+def parse_levels(value):
+    """
+    Parses levels of particular loggers.
+    :param value: comma separated logger=LEVEL pairs, e.g. 'sqlalchemy=WARNING'
+    :return: dict of levels by logger name
+    """
+    levels = {}
+    for item in value.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def init_logging(app):
+    """
+    Configures the root logger to put records into a queue, which is read by a listener
+    thread writing them to the log file and console. The level is set by LOG_LEVEL and
+    levels of particular loggers by LOG_LEVELS, records of disabled levels are dropped
+    before any message is built.
+    :param app: flask application
+    """
+    log_listener.stop()
+    formatter = logging.Formatter(LOG_FORMAT)
+    level = app.config['LOG_LEVEL'].upper()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if app.config['LOG_FILE']:
+        handlers.append(SharedRotatingFileHandler(
+            app.config['LOG_FILE'], app.config['LOG_MAX_BYTES'],
+            app.config['LOG_BACKUP_COUNT']))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(DeferredQueueHandler(records))
+    root.setLevel(level)
+    # flask sets DEBUG level of the application logger in debug mode otherwise
+    app.logger.setLevel(level)
+    for name, logger_level in parse_levels(app.config['LOG_LEVELS']).items():
+        logging.getLogger(name).setLevel(logger_level)
+    log_listener.start(records, handlers)
@@ -0,0 +1,411 @@
+"""
+Request metrics module used to observe the web service, this module defines the following:
+- MetricsRegistry which keeps counters, gauges and histograms of a process
+- RequestMetrics which measures requests per resource and method, their database time and
+  queries, and exposes metrics of all worker processes in Prometheus text format
+- collect_components which reads metrics of the connection pool and response compression
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from flask import Response, current_app, request
+
+from department_app.database import pool_metrics
+from department_app.extensions import compress, db
+from department_app.queries import QUERY_STATS_KEY
+
+# upper bounds of request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# prefix of metric names
+PREFIX = 'department_app_'
+# key of the start time and labels of a request in its wsgi environment
+METRICS_KEY = 'department_app.metrics'
+# media type of Prometheus text exposition format
+EXPOSITION_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# descriptions of metrics by name
+HELP = {
+    'requests_total': 'Requests by resource, method and status.',
+    'request_duration_seconds': 'Request latency by resource and method.',
+    'requests_in_flight': 'Requests being processed by resource and method.',
+    'request_db_seconds_total': 'Time spent in database queries by resource and method.',
+    'request_db_queries_total': 'Database queries by resource and method.',
+    'db_pool_checkouts_total': 'Connection checkouts of the pool.',
+    'db_pool_wait_seconds_total': 'Time spent waiting for pool connections.',
+    'db_pool_checked_out': 'Connections currently checked out of the pool.',
+    'db_pool_limit': 'Maximum number of connections of the pool.',
+    'compress_responses_total': 'Compressed responses.',
+    'compress_bytes_saved_total': 'Bytes saved by compression of responses.',
+}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms of a process identified by metric name
+    and a tuple of label pairs.
+    """
+    def __init__(self):
+        """
+        Constructor of MetricsRegistry class.
+        """
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        """
+        Increases a counter.
+        :param name: metric name
+        :param labels: tuple of label name and value pairs
+        :param value: increment
+        """
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def add(self, name, labels, value):
+        """
+        Changes a gauge by the value.
+        :param name: metric name
+        :param labels: tuple of label name and value pairs
+        :param value: change of the gauge
+        """
+        key = (name, labels)
+        with self._lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        """
+        Adds an observation to a histogram with LATENCY_BUCKETS.
+        :param name: metric name
+        :param labels: tuple of label name and value pairs
+        :param value: observed value
+        """
+        key = (name, labels)
+        index = bisect_left(LATENCY_BUCKETS, value)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # counts of buckets including +Inf, sum and count of observations
+                histogram = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0, 0]
+            histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        """
+        Returns a json serializable copy of the metrics.
+        :return: dictionary of counters, gauges and histograms lists
+        """
+        with self._lock:
+            return {
+                'counters': [[name, labels, value]
+                             for (name, labels), value in self.counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self.gauges.items()],
+                'histograms': [[name, labels, list(values)]
+                               for (name, labels), values in self.histograms.items()],
+            }
+
+    def clear(self):
+        """
+        Removes all the metrics.
+        """
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+def _process_alive(pid):
+    """
+    Checks whether a process is running.
+    :param pid: process id
+    :return: True if the process exists
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _file_pid(filename):
+    """
+    Returns the process id of a metrics file named metrics_<pid>_<worker id>.json.
+    :param filename: name of a file of the metrics directory
+    :return: process id or None if the file is not a metrics file
+    """
+    if not (filename.startswith('metrics_') and filename.endswith('.json')):
+        return None
+    try:
+        return int(filename[8:-5].split('_')[0])
+    except ValueError:
+        return None
+
+
+def merge_snapshots(snapshots):
+    """
+    Aggregates snapshots of worker processes. Counters and histograms of all processes are
+    summed, including exited ones, and gauges are summed over running processes only.
+    :param snapshots: list of process ids and snapshots
+    :return: dictionaries of counters, gauges and histograms by name and labels
+    """
+    counters, gauges, histograms = {}, {}, {}
+    for pid, snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        if _process_alive(pid):
+            for name, labels, value in snapshot['gauges']:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0) + value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                merged[index] += value
+    return counters, gauges, histograms
+
+
+def _format_labels(labels, extra=()):
+    """
+    Formats labels of a sample.
+    :param labels: tuple of label name and value pairs
+    :param extra: additional label pairs
+    :return: labels in braces or an empty string
+    """
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def exposition(counters, gauges, histograms, help_texts=None):
+    """
+    Renders metrics in Prometheus text exposition format.
+    :param counters: dictionary of counter values by name and labels
+    :param gauges: dictionary of gauge values by name and labels
+    :param histograms: dictionary of histogram values by name and labels
+    :param help_texts: descriptions of metrics by name
+    :return: text of the metrics
+    """
+    help_texts = help_texts or {}
+    lines = []
+    for metric_type, samples in (('counter', counters), ('gauge', gauges),
+                                 ('histogram', histograms)):
+        by_name = {}
+        for (name, labels), value in samples.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(by_name):
+            full_name = PREFIX + name
+            if name in help_texts:
+                lines.append(f'# HELP {full_name} {help_texts[name]}')
+            lines.append(f'# TYPE {full_name} {metric_type}')
+            for labels, value in sorted(by_name[name]):
+                if metric_type != 'histogram':
+                    lines.append(f'{full_name}{_format_labels(labels)} {value}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), value):
+                    cumulative += count
+                    lines.append(f'{full_name}_bucket'
+                                 f'{_format_labels(labels, (("le", bound),))} {cumulative}')
+                lines.append(f'{full_name}_sum{_format_labels(labels)} {value[-2]}')
+                lines.append(f'{full_name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics:
+    """
+    Measures latency, statuses, requests in flight, database time and queries of every
+    request by flask-restful resource and method, e.g. Department.get, and exposes them
+    at METRICS_PATH. With METRICS_DIR set, every worker process periodically writes its
+    metrics to a file of the directory and the endpoint aggregates files of all workers.
+    Files are named by the process id and a random worker id, so that a worker reusing the
+    process id of an exited one does not overwrite its counters.
+    """
+    def __init__(self, app=None):
+        """
+        Constructor of RequestMetrics class.
+        :param app: flask application
+        """
+        self.registry = MetricsRegistry()
+        self.directory = None
+        self.flush_interval = 1.0
+        self._flushed_at = 0.0
+        self._flush_lock = threading.Lock()
+        self._worker_pid = None
+        self._filename = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Reads METRICS_PATH, METRICS_DIR and METRICS_FLUSH_INTERVAL settings, registers
+        measurement of requests and the metrics endpoint.
+        :param app: flask application
+        """
+        self.directory = app.config.get('METRICS_DIR') or None
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 1.0)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', self.view)
+
+    @staticmethod
+    def _labels():
+        """
+        Returns resource and method labels of the current request. Resource is the name
+        of the flask-restful resource class or the endpoint of another view.
+        :return: tuple of label pairs
+        """
+        endpoint = request.url_rule.endpoint if request.url_rule else 'unmatched'
+        view = current_app.view_functions.get(endpoint)
+        resource = getattr(getattr(view, 'view_class', None), '__name__', endpoint)
+        return ('resource', resource), ('method', request.method.lower())
+
+    def before_request(self):
+        """
+        Starts measurement of a request.
+        """
+        labels = self._labels()
+        request.environ[METRICS_KEY] = (time.perf_counter(), labels)
+        self.registry.add('requests_in_flight', labels, 1)
+
+    def after_request(self, response):
+        """
+        Records latency, status, database time and queries of a request.
+        :param response: response object
+        :return: the response
+        """
+        measurement = request.environ.pop(METRICS_KEY, None)
+        if measurement is None:
+            return response
+        started, labels = measurement
+        self.registry.add('requests_in_flight', labels, -1)
+        self.registry.observe('request_duration_seconds', labels,
+                              time.perf_counter() - started)
+        self.registry.inc('requests_total', labels + (('status', str(response.status_code)),))
+        stats = request.environ.get(QUERY_STATS_KEY)
+        self.registry.inc('request_db_seconds_total', labels, stats.seconds if stats else 0.0)
+        self.registry.inc('request_db_queries_total', labels, stats.count if stats else 0)
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+        return response
+
+    def snapshot(self):
+        """
+        Returns metrics of the process including the pool and compression metrics.
+        :return: json serializable snapshot
+        """
+        snapshot = self.registry.snapshot()
+        for metric_type, name, value in collect_components():
+            if value is not None:
+                snapshot[f'{metric_type}s'].append([name, [], value])
+        return snapshot
+
+    def _write(self, filename, snapshot):
+        """
+        Atomically writes a snapshot to a file of METRICS_DIR.
+        :param filename: name of the file
+        :param snapshot: json serializable snapshot
+        """
+        handle, path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as metrics_file:
+            json.dump(snapshot, metrics_file)
+        os.replace(path, os.path.join(self.directory, filename))
+
+    def _retire_reused(self, pid):
+        """
+        Drops gauges of exited workers which had the process id of the current process,
+        their counters and histograms are kept.
+        :param pid: process id of the current process
+        """
+        for filename in os.listdir(self.directory):
+            if _file_pid(filename) != pid or filename == self._filename:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if snapshot.get('gauges'):
+                snapshot['gauges'] = []
+                self._write(filename, snapshot)
+
+    def flush(self):
+        """
+        Atomically writes metrics of the process to its file of METRICS_DIR. The file
+        is named when the process flushes for the first time, e.g. after a fork.
+        """
+        with self._flush_lock:
+            self._flushed_at = time.monotonic()
+            pid = os.getpid()
+            if self._worker_pid != pid:
+                self._worker_pid = pid
+                self._filename = f'metrics_{pid}_{uuid.uuid4().hex}.json'
+                self._retire_reused(pid)
+            self._write(self._filename, self.snapshot())
+
+    def _snapshots(self):
+        """
+        Reads snapshots of all the worker processes.
+        :return: list of process ids and snapshots
+        """
+        if not self.directory:
+            return [(os.getpid(), self.snapshot())]
+        self.flush()
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            pid = _file_pid(filename)
+            if pid is None:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as file:
+                    snapshots.append((pid, json.load(file)))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """
+        Renders metrics of all the worker processes in Prometheus text format.
+        :return: text of the metrics
+        """
+        return exposition(*merge_snapshots(self._snapshots()), HELP)
+
+    def view(self):
+        """
+        Returns metrics in Prometheus text exposition format.
+        :return: response with the metrics
+        """
+        return Response(self.render(), mimetype=EXPOSITION_MIMETYPE)
+
+
+def collect_components():
+    """
+    Reads metrics of the connection pool and response compression of the process.
+    :return: list of metric type ('counter' or 'gauge'), name and value tuples
+    """
+    pool = pool_metrics.collect(db.engine)
+    return [
+        ('counter', 'db_pool_checkouts_total', pool['checkouts']),
+        ('counter', 'db_pool_wait_seconds_total', pool['wait_seconds_total']),
+        ('gauge', 'db_pool_checked_out', pool['checked_out']),
+        ('gauge', 'db_pool_limit', pool['limit']),
+        ('counter', 'compress_responses_total', compress.metrics['responses']),
+        ('counter', 'compress_bytes_saved_total', compress.bytes_saved),
+    ]
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,53 @@
+"""Department stats rollup migration.
+
+Revision ID: 8c4e1a7b5d20
+Revises: 3f1b9c2d7a4e
+Create Date: 2026-10-17 11:40:05.207318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e1a7b5d20'
+down_revision = '3f1b9c2d7a4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    department_stats = op.create_table(
+        'department_stats',
+        sa.Column('department_id', sa.Integer(), nullable=False),
+        sa.Column('headcount', sa.Integer(), nullable=False),
+        sa.Column('salary_sum', sa.BigInteger(), nullable=False),
+        sa.Column('salary_min', sa.Integer(), nullable=True),
+        sa.Column('salary_max', sa.Integer(), nullable=True),
+        sa.Column('birth_year_sum', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['department_id'], ['department.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('department_id')
+    )
+    # fill statistics of existing departments
+    employee = sa.table(
+        'employee',
+        sa.column('department_id', sa.Integer),
+        sa.column('salary', sa.Integer),
+        sa.column('birth_date', sa.DateTime)
+    )
+    op.execute(department_stats.insert().from_select(
+        ['department_id', 'headcount', 'salary_sum', 'salary_min', 'salary_max',
+         'birth_year_sum'],
+        sa.select(
+            employee.c.department_id,
+            sa.func.count(),
+            sa.func.sum(employee.c.salary),
+            sa.func.min(employee.c.salary),
+            sa.func.max(employee.c.salary),
+            sa.func.sum(sa.extract('year', employee.c.birth_date))
+        ).where(employee.c.department_id.isnot(None)).group_by(employee.c.department_id)
+    ))
+
+
+def downgrade():
+    op.drop_table('department_stats')
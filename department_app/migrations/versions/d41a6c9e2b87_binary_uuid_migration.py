@@ -0,0 +1,267 @@
+"""Binary uuid migration.
+
+Revision ID: d41a6c9e2b87
+Revises: b7d3e9f41c62
+Create Date: 2026-10-17 15:21:08.417392
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a6c9e2b87'
+down_revision = 'b7d3e9f41c62'
+branch_labels = None
+depends_on = None
+
+# tables with uuid columns
+TABLES = ('department', 'employee')
+# number of rows updated by a single statement
+BATCH_SIZE = 5000
+
+
+def binary_uuid_type():
+    """
+    Returns type of binary uuid column for the database being migrated.
+    :return: BINARY(16) on MySQL and a blob elsewhere
+    """
+    if op.get_bind().dialect.name == 'mysql':
+        return mysql.BINARY(16)
+    return sa.LargeBinary(16)
+
+
+def uuid_table(table_name, source, target):
+    """
+    Returns a lightweight table with id, source and target columns.
+    :param table_name: name of the table
+    :param source: name of the source column
+    :param target: name of the target column
+    :return: table
+    """
+    return sa.table(table_name, sa.column('id', sa.Integer), sa.column(source),
+                    sa.column(target))
+
+
+def invalid_rows(table_name, convert):
+    """
+    Finds rows whose uuid can not be converted, batch by batch.
+    :param table_name: name of the table
+    :param convert: function converting an original value
+    :return: list of ids of the rows
+    """
+    table = uuid_table(table_name, 'uuid', 'uuid_new')
+    connection = op.get_bind()
+    invalid, last_id = [], 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.uuid)
+            .where(table.c.id > last_id, table.c.uuid.isnot(None))
+            .order_by(table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            return invalid
+        for row_id, value in rows:
+            try:
+                convert(value)
+            except (ValueError, TypeError):
+                invalid.append(row_id)
+        last_id = rows[-1][0]
+
+
+def validate(convert):
+    """
+    Checks uuids of all the tables before any of them is changed, so that a malformed
+    uuid does not leave the tables half migrated.
+    :param convert: function converting an original value
+    :raises ValueError: if some uuids can not be converted
+    """
+    errors = []
+    for table_name in TABLES:
+        invalid = invalid_rows(table_name, convert)
+        if invalid:
+            errors.append(f'{table_name} rows {invalid[:20]} ({len(invalid)} in total)')
+    if errors:
+        raise ValueError('Malformed uuids, fix or remove them before the migration: '
+                         + '; '.join(errors))
+
+
+def convert_row(table, row_id, value, convert):
+    """
+    Converts the uuid of a row.
+    :param table: table returned by uuid_table
+    :param row_id: id of the row
+    :param value: source value
+    :param convert: function converting a source value
+    :return: converted value
+    :raises ValueError: if a uuid can not be converted
+    """
+    try:
+        return convert(value)
+    except (ValueError, TypeError) as error:
+        raise ValueError(f'Malformed uuid of {table.name} row {row_id}') from error
+
+
+def copy_rows(connection, table, values):
+    """
+    Writes converted uuids of the rows to the target column.
+    :param connection: database connection
+    :param table: table returned by uuid_table
+    :param values: list of dicts with row_id and converted value
+    """
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(
+        uuid_new=sa.bindparam('value'))
+    if values:
+        connection.execute(update, values)
+
+
+def backfill(table_name, convert):
+    """
+    Copies converted uuids to the new column batch by batch, every batch is committed on
+    its own, so that rows are not locked for long. Rows written meanwhile are copied by
+    catch_up.
+    :param table_name: name of the table
+    :param convert: function converting an original value
+    """
+    table = uuid_table(table_name, 'uuid', 'uuid_new')
+    last_id = 0
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c.uuid)
+                .where(table.c.id > last_id, table.c.uuid.isnot(None))
+                .order_by(table.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                return
+            copy_rows(connection, table, [
+                {'row_id': row_id, 'value': convert_row(table, row_id, value, convert)}
+                for row_id, value in rows])
+            last_id = rows[-1][0]
+
+
+def lock_table(table_name):
+    """
+    Blocks writes to the table until unlock_table on MySQL or the end of the migration
+    transaction elsewhere.
+    :param table_name: name of the table
+    """
+    connection = op.get_bind()
+    if connection.dialect.name == 'mysql':
+        connection.exec_driver_sql(f'LOCK TABLES {table_name} WRITE')
+    elif connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(f'LOCK TABLE {table_name} IN EXCLUSIVE MODE')
+    else:
+        # a write statement takes the database write lock of sqlite
+        connection.execute(uuid_table(table_name, 'uuid', 'uuid_new').update().where(
+            sa.false()).values(uuid_new=None))
+
+
+def unlock_table():
+    """
+    Releases tables locked by lock_table on MySQL.
+    """
+    connection = op.get_bind()
+    if connection.dialect.name == 'mysql':
+        connection.exec_driver_sql('UNLOCK TABLES')
+
+
+def catch_up(table_name, convert):
+    """
+    Copies uuids of the rows inserted during the backfill and of the rows whose uuid was
+    changed after it had been copied: every row is scanned batch by batch and copied
+    again when its new column does not match the converted uuid. Must be called with the
+    table locked, so that no row is written between the copy and the column swap.
+    :param table_name: name of the table
+    :param convert: function converting an original value
+    """
+    table = uuid_table(table_name, 'uuid', 'uuid_new')
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.uuid, table.c.uuid_new)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            return
+        values = []
+        for row_id, value, copied in rows:
+            expected = None if value is None else convert_row(table, row_id, value,
+                                                              convert)
+            if copied != expected:
+                values.append({'row_id': row_id, 'value': expected})
+        copy_rows(connection, table, values)
+        last_id = rows[-1][0]
+
+
+def replace_column(table_name, new_type, convert):
+    """
+    Replaces the uuid column of a table with a column of a new type: adds a temporary
+    column, backfills it in committed batches without locking the table, then locks the
+    table, copies rows inserted or changed during the backfill and swaps the columns. The
+    swap is not online: on MySQL batch_alter_table drops and adds columns by ALTER TABLE
+    statements, which rebuild the table under LOCK TABLES, so writes are blocked for as
+    long as the table is copied. The temporary column is dropped if a uuid written during
+    the backfill is malformed.
+    :param table_name: name of the table
+    :param new_type: type of the new uuid column
+    :param convert: function converting an original value
+    """
+    op.add_column(table_name, sa.Column('uuid_new', new_type, nullable=True))
+    try:
+        backfill(table_name, convert)
+        lock_table(table_name)
+        try:
+            catch_up(table_name, convert)
+            with op.batch_alter_table(table_name) as batch_op:
+                # sqlite tables are recreated without the dropped column and its constraint
+                if op.get_bind().dialect.name != 'sqlite':
+                    batch_op.drop_constraint('uuid', type_='unique')
+                batch_op.drop_column('uuid')
+                batch_op.alter_column('uuid_new', new_column_name='uuid',
+                                      existing_type=new_type)
+            # created after the swap, since sqlite batch mode skips a constraint on a
+            # renamed column
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.create_unique_constraint('uuid', ['uuid'])
+        finally:
+            unlock_table()
+    except ValueError:
+        # committed on its own, so that the failed migration does not roll it back
+        with op.get_context().autocommit_block():
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.drop_column('uuid_new')
+        raise
+
+
+def to_bytes(value):
+    """
+    Converts a uuid string to 16 bytes.
+    :param value: uuid string
+    :return: bytes of the uuid
+    """
+    return uuid.UUID(value).bytes
+
+
+def to_string(value):
+    """
+    Converts 16 bytes to a canonical uuid string.
+    :param value: bytes of the uuid
+    :return: uuid string
+    """
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+def upgrade():
+    validate(to_bytes)
+    for table_name in TABLES:
+        replace_column(table_name, binary_uuid_type(), to_bytes)
+
+
+def downgrade():
+    validate(to_string)
+    for table_name in TABLES:
+        replace_column(table_name, sa.String(length=36), to_string)
@@ -0,0 +1,53 @@
+"""Employee department cascade migration.
+
+Revision ID: f2a8c5d13e96
+Revises: d41a6c9e2b87
+Create Date: 2026-10-17 16:02:45.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8c5d13e96'
+down_revision = 'd41a6c9e2b87'
+branch_labels = None
+depends_on = None
+
+# name of the recreated foreign key of employee department
+FOREIGN_KEY = 'fk_employee_department_id_department'
+# names unnamed foreign keys of sqlite tables, so that batch mode can drop them
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def department_foreign_key():
+    """
+    Finds name of the foreign key of employee department.
+    :return: name of the foreign key or None if there is no such
+    """
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys('employee'):
+        if foreign_key['constrained_columns'] == ['department_id']:
+            return foreign_key['name'] or FOREIGN_KEY
+    return None
+
+
+def replace_foreign_key(ondelete):
+    """
+    Recreates the foreign key of employee department with given delete action.
+    :param ondelete: action of the foreign key on delete of a department
+    """
+    name = department_foreign_key()
+    with op.batch_alter_table('employee', naming_convention=NAMING_CONVENTION) as batch_op:
+        if name:
+            batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(FOREIGN_KEY, 'department', ['department_id'], ['id'],
+                                    ondelete=ondelete)
+
+
+def upgrade():
+    replace_foreign_key('CASCADE')
+
+
+def downgrade():
+    replace_foreign_key(None)
@@ -4,6 +4,7 @@ This module defines the following classes:
 """
 import uuid
 from department_app.extensions import db
+from department_app.models.types import BinaryUUID
 
 # pylint: disable=too-few-public-methods
 
@@ -22,16 +23,20 @@ class DepartmentModel(db.Model):
     name = db.Column(db.String(20), unique=True, nullable=False)
     # description column in db for department
     description = db.Column(db.String(120), nullable=False)
-    # uuid column in db for department
-    uuid = db.Column(db.String(36), unique=True)
-    # employees working in the department
+    # uuid column in db for department stored as 16 bytes
+    uuid = db.Column(BinaryUUID, unique=True)
+    # employees working in the department, which are deleted by ON DELETE CASCADE
+    # of the database instead of being loaded when the department is deleted
     employees = db.relationship(
         'EmployeeModel',
         cascade="all,delete,delete-orphan",
+        passive_deletes=True,
         single_parent=True,
         backref='department',
         lazy=True
     )
+    # precomputed statistics of department employees, not stored in db
+    stats = None
 
     def __init__(self, name, description, employees=[]):
         """
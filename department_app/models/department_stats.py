@@ -0,0 +1,39 @@
+"""
+This module defines the following classes:
+- DepartmentStatsModel, model used to represent aggregated statistics of department employees
+"""
+from department_app.extensions import db
+
+# pylint: disable=too-few-public-methods
+
+
+class DepartmentStatsModel(db.Model):
+    """
+    The DepartmentStatsModel object represents department_stats table in db,
+    which is maintained incrementally whenever employees change.
+    """
+
+    # name of the department statistics table in db
+    __tablename__ = 'department_stats'
+
+    # database id of the department statistics belong to
+    department_id = db.Column(db.Integer,
+                              db.ForeignKey('department.id', ondelete='CASCADE'),
+                              primary_key=True)
+    # number of employees working in the department
+    headcount = db.Column(db.Integer, nullable=False, default=0)
+    # sum of salaries of employees working in the department
+    salary_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    # minimal salary of employees working in the department
+    salary_min = db.Column(db.Integer)
+    # maximal salary of employees working in the department
+    salary_max = db.Column(db.Integer)
+    # sum of birth years of employees used to determine their average age
+    birth_year_sum = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        """
+        String representation of DepartmentStatsModel class.
+        :return: department id and headcount of the department
+        """
+        return f'{self.department_id}, {self.headcount}'
@@ -5,6 +5,7 @@ This module defines the following classes:
 from datetime import date
 import uuid
 from department_app.extensions import db
+from department_app.models.types import BinaryUUID
 
 # pylint: disable=too-few-public-methods
 
@@ -16,19 +17,24 @@ class EmployeeModel(db.Model):
 
     # name of the department table in db
     __tablename__ = 'employee'
+    # indexes used by search of employees by birth date
+    __table_args__ = (
+        db.Index('ix_employee_department_id_birth_date', 'department_id', 'birth_date'),
+    )
 
     # id of the employee in db
     id = db.Column(db.Integer, primary_key=True)
     # employee name column in db
     name = db.Column(db.String(25), nullable=False)
     # birth_date of employee column
-    birth_date = db.Column(db.DateTime, nullable=False)
+    birth_date = db.Column(db.DateTime, nullable=False, index=True)
     # salary of employee column
     salary = db.Column(db.Integer, nullable=False)
-    # employee uuid column
-    uuid = db.Column(db.String(36), unique=True)
-    # database id of the department employee works in (foreign key)
-    department_id = db.Column(db.Integer, db.ForeignKey('department.id'))
+    # employee uuid column stored as 16 bytes
+    uuid = db.Column(BinaryUUID, unique=True)
+    # database id of the department employee works in (foreign key),
+    # employees are deleted by the database together with their department
+    department_id = db.Column(db.Integer, db.ForeignKey('department.id', ondelete='CASCADE'))
 
     def __init__(self, name, birth_date, salary, department=None):
         """
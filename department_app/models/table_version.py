@@ -0,0 +1,31 @@
+"""
+This module defines the following classes:
+- TableVersionModel, model used to represent versions of tables used by conditional requests
+"""
+from department_app.extensions import db
+
+# pylint: disable=too-few-public-methods
+
+
+class TableVersionModel(db.Model):
+    """
+    The TableVersionModel object represents table_version table in db, which stores
+    a version counter increased by every change of a table.
+    """
+
+    # name of the table version table in db
+    __tablename__ = 'table_version'
+
+    # name of the versioned table
+    table_name = db.Column(db.String(50), primary_key=True)
+    # number of changes of the table
+    version = db.Column(db.Integer, nullable=False, default=0)
+    # time of the last change of the table
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        """
+        String representation of TableVersionModel class.
+        :return: table name and version
+        """
+        return f'{self.table_name}, {self.version}'
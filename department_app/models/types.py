@@ -0,0 +1,111 @@
+"""
+This module defines the following column types:
+- BinaryUUID, uuid stored as 16 bytes and exchanged as a canonical string
+and the following function:
+- parse_uuid which checks a uuid received from a client before a lookup
+"""
+import uuid
+
+from sqlalchemy import types
+from sqlalchemy.dialects import mysql
+
+
+def parse_uuid(value):
+    """
+    Converts a uuid string or object to a canonical uuid string.
+    :param value: uuid string or object
+    :return: canonical uuid string or None if the value is not a valid uuid
+    """
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+class BinaryUUID(types.TypeDecorator):
+    """
+    Uuid column stored as BINARY(16) on MySQL and as a 16 byte blob elsewhere, values
+    are bound and returned as canonical uuid strings. A value which is not a valid uuid
+    is rejected, lookups check values received from clients by parse_uuid beforehand.
+    """
+    impl = types.LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        """
+        Returns BINARY(16) type on MySQL and a blob on other databases.
+        :param dialect: database dialect
+        :return: column type
+        """
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.BINARY(16))
+        return dialect.type_descriptor(types.LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        """
+        Converts a uuid string or object to 16 bytes.
+        :param value: uuid string or object
+        :param dialect: database dialect
+        :return: bytes of the uuid
+        :raises ValueError: if the value is not a valid uuid
+        """
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            if len(value) != 16:
+                raise ValueError(f'Invalid uuid bytes: {value!r}')
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        try:
+            return uuid.UUID(value).bytes
+        except (ValueError, AttributeError, TypeError) as error:
+            raise ValueError(f'Invalid uuid: {value!r}') from error
+
+    def process_literal_param(self, value, dialect):
+        """
+        Renders a uuid as a binary literal of the dialect, e.g. in offline migration
+        scripts.
+        :param value: uuid string or object
+        :param dialect: database dialect
+        :return: SQL literal of the uuid bytes
+        :raises ValueError: if the value is not a valid uuid
+        """
+        data = self.process_bind_param(value, dialect)
+        if data is None:
+            return 'NULL'
+        if dialect.name == 'postgresql':
+            return f"decode('{data.hex()}', 'hex')"
+        return f"X'{data.hex()}'"
+
+    def literal_processor(self, dialect):
+        """
+        Returns the function rendering literal uuids, the literal is not passed through
+        the processor of the blob type, which expects bytes.
+        :param dialect: database dialect
+        :return: function converting a uuid to its SQL literal
+        """
+        def process(value):
+            return self.process_literal_param(value, dialect)
+        return process
+
+    def process_result_value(self, value, dialect):
+        """
+        Converts 16 bytes to a canonical uuid string.
+        :param value: bytes of the uuid
+        :param dialect: database dialect
+        :return: uuid string
+        """
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
+
+    @property
+    def python_type(self):
+        """
+        Type of values exchanged with the application.
+        :return: str
+        """
+        return str
@@ -0,0 +1,212 @@
+"""
+Query instrumentation module used to observe database queries of requests, this module
+defines the following:
+- normalize_sql which turns a statement into a form shared by all its executions
+- QueryStats which counts statements and their time
+- QueryInstrumentation which logs slow queries and probable N+1 patterns of a request
+- capture_queries and query_budget context managers to check queries in tests
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from department_app.extensions import logger
+
+# patterns of literals, lists of placeholders and whitespace replaced by normalization
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s|:\w+|\$\d+')
+_WHITESPACE = re.compile(r'\s+')
+
+slow_query_logger = logger.getChild('slow_query')
+# key of the statistics of a request in its wsgi environment
+QUERY_STATS_KEY = 'department_app.query_stats'
+
+
+def normalize_sql(statement):
+    """
+    Normalizes a statement so that its executions with different values are the same:
+    whitespace is collapsed, literals and placeholders are replaced with ? and lists
+    of values with a single (?).
+    :param statement: SQL statement
+    :return: normalized statement
+    """
+    statement = _PLACEHOLDERS.sub('?', statement)
+    statement = _LITERALS.sub('?', statement)
+    statement = _PLACEHOLDER_LISTS.sub('(?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryStats:
+    """
+    Statements executed in a request or a captured block with their count and time.
+    """
+    def __init__(self):
+        """
+        Constructor of QueryStats class.
+        """
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = []
+
+    def record(self, statement, seconds):
+        """
+        Adds an executed statement.
+        :param statement: SQL statement
+        :param seconds: time of the execution
+        """
+        self.count += 1
+        self.seconds += seconds
+        self.statements.append(statement)
+
+    def repeated(self, threshold):
+        """
+        Returns statements executed at least threshold times, which are probable N+1
+        patterns, e.g. lazy loading of a relationship for every row of a list.
+        :param threshold: number of executions
+        :return: dict of execution counts by normalized statement
+        """
+        counts = Counter(normalize_sql(statement) for statement in self.statements)
+        return {statement: count for statement, count in counts.items() if count >= threshold}
+
+
+class QueryInstrumentation:
+    """
+    Counts statements and their time for every request. Statements taking at least
+    SLOW_QUERY_THRESHOLD seconds are logged with their normalized SQL, and statements
+    executed N_PLUS_ONE_THRESHOLD times or more by a request are logged as probable
+    N+1 patterns.
+    """
+    def __init__(self, app=None):
+        """
+        Constructor of QueryInstrumentation class.
+        :param app: flask application
+        """
+        self.slow_query_threshold = 0.5
+        self.n_plus_one_threshold = 10
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Reads SLOW_QUERY_THRESHOLD and N_PLUS_ONE_THRESHOLD settings and registers
+        counting of queries of each request.
+        :param app: flask application
+        """
+        self.slow_query_threshold = app.config.get('SLOW_QUERY_THRESHOLD', 0.5)
+        self.n_plus_one_threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 10)
+        app.before_request(self.before_request)
+        app.teardown_request(self.teardown_request)
+
+    @staticmethod
+    def before_request():
+        """
+        Starts counting queries of a request. The statistics are kept in the wsgi
+        environment of the request rather than in g, which belongs to the application
+        context and can outlive the request.
+        """
+        request.environ[QUERY_STATS_KEY] = QueryStats()
+
+    def observe(self, statement, seconds):
+        """
+        Records a statement executed in a request and logs it when it is slow.
+        :param statement: SQL statement
+        :param seconds: time of the execution
+        """
+        stats = request.environ.get(QUERY_STATS_KEY) if has_request_context() else None
+        if stats is not None:
+            stats.record(statement, seconds)
+        if self.slow_query_threshold and seconds >= self.slow_query_threshold:
+            slow_query_logger.warning('Slow query %.3fs: %s', seconds, normalize_sql(statement))
+
+    def teardown_request(self, exception=None):
+        """
+        Logs probable N+1 patterns of the request and stops counting its queries.
+        :param exception: unhandled exception of the request
+        """
+        # pylint: disable=unused-argument
+        stats = request.environ.pop(QUERY_STATS_KEY, None)
+        if stats is None or not self.n_plus_one_threshold:
+            return
+        for statement, count in stats.repeated(self.n_plus_one_threshold).items():
+            logger.warning('Probable N+1 query in %s %s, executed %d times: %s',
+                           request.method, request.path, count, statement)
+
+
+query_instrumentation = QueryInstrumentation()
+
+# statistics of active capture_queries blocks
+_captures = []
+_captures_lock = threading.Lock()
+
+
+@contextmanager
+def capture_queries():
+    """
+    Captures statements executed inside the block by any engine, including requests
+    of a test client.
+    :return: QueryStats of the block
+    """
+    stats = QueryStats()
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+@contextmanager
+def query_budget(max_queries):
+    """
+    Checks that the block executes at most max_queries statements.
+    :param max_queries: allowed number of statements
+    :return: QueryStats of the block
+    """
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise AssertionError(
+            f'{stats.count} queries executed, budget is {max_queries}:\n'
+            + '\n'.join(normalize_sql(statement) for statement in stats.statements))
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    """
+    Remembers start time of a statement.
+    """
+    # pylint: disable=unused-argument,too-many-arguments
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    """
+    Records time of an executed statement.
+    """
+    # pylint: disable=unused-argument,too-many-arguments
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    query_instrumentation.observe(statement, seconds)
+    for stats in list(_captures):
+        stats.record(statement, seconds)
+
+
+@event.listens_for(Engine, 'handle_error')
+def drop_query_timer(context):
+    """
+    Drops start time of a failed statement.
+    """
+    started = context.connection.info.get('query_started') if context.connection else None
+    if started:
+        started.pop()
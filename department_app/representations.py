@@ -0,0 +1,137 @@
+"""
+Representations module used to encode API responses, this module defines the following:
+- dumps_stdlib and dumps_orjson which encode data with the stdlib json module and orjson
+- json_backend which chooses the encoder configured by JSON_BACKEND
+- output_json which is the application/json representation of the API
+- output_msgpack which is the application/msgpack representation of the API
+- request_body which decodes a json or msgpack request body
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask import current_app, make_response, request
+from flask_restful import abort
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# supported values of JSON_BACKEND
+JSON_BACKENDS = ('auto', 'orjson', 'stdlib')
+# media types of msgpack requests and responses
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+def json_default(value):
+    """
+    Converts values which the stdlib json module can not encode.
+    :param value: value to convert
+    :return: json compatible value
+    """
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps_stdlib(data, compact=True):
+    """
+    Encodes data with the stdlib json module, the output is the same as of orjson.
+    :param data: data to encode
+    :param compact: whether to omit whitespaces, output is indented otherwise
+    :return: encoded bytes
+    """
+    if compact:
+        return json.dumps(data, default=json_default, ensure_ascii=False,
+                          separators=(',', ':')).encode()
+    return json.dumps(data, default=json_default, ensure_ascii=False, indent=2).encode()
+
+
+def dumps_orjson(data, compact=True):
+    """
+    Encodes data with orjson, which handles dates and uuids natively.
+    :param data: data to encode
+    :param compact: whether to omit whitespaces, output is indented otherwise
+    :return: encoded bytes
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if not compact:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=json_default, option=option)
+
+
+def json_backend(name):
+    """
+    Returns the encoder for a JSON_BACKEND value, 'auto' chooses orjson when it is
+    installed and the stdlib json module otherwise.
+    :param name: 'auto', 'orjson' or 'stdlib'
+    :return: encoding function
+    """
+    if name not in JSON_BACKENDS:
+        raise ValueError(f'Unknown json backend: {name}')
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('orjson package is required for orjson json backend')
+    if name != 'stdlib' and orjson is not None:
+        return dumps_orjson
+    return dumps_stdlib
+
+
+def output_json(data, code, headers=None):
+    """
+    Makes a response with a json encoded body. The encoder is chosen by JSON_BACKEND and
+    the output is compact unless JSON_COMPACT is false, which is the default in debug mode.
+    :param data: data to encode
+    :param code: status code
+    :param headers: response headers
+    :return: response
+    """
+    config = current_app.config
+    compact = config.get('JSON_COMPACT')
+    if compact is None:
+        compact = not current_app.debug
+    dumps = json_backend(config.get('JSON_BACKEND', 'auto'))
+    response = make_response(dumps(data, compact) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
+
+
+def output_msgpack(data, code, headers=None):
+    """
+    Makes a response with a msgpack encoded body, values which msgpack can not
+    encode, such as dates and uuids, are converted as for json.
+    :param data: data to encode
+    :param code: status code
+    :param headers: response headers
+    :return: response
+    """
+    response = make_response(msgpack.packb(data, default=json_default), code)
+    response.headers.extend(headers or {})
+    return response
+
+
+def request_body():
+    """
+    Decodes the body of the request, which is msgpack when its content type is
+    msgpack and json otherwise. Aborts with a status code 415 if msgpack is not
+    installed and with a status code 400 if the body is not valid msgpack.
+    :return: decoded data
+    """
+    if request.mimetype not in MSGPACK_MIMETYPES:
+        return request.json
+    if msgpack is None:
+        return abort(415, message="Msgpack requests are not supported")
+    try:
+        return msgpack.unpackb(request.get_data(), raw=False)
+    except ValueError:
+        return abort(400, message="Not valid msgpack")
@@ -0,0 +1,77 @@
+"""
+Conditional request helpers shared by the read APIs, this module defines the following:
+- conditional which is a decorator answering 304 Not Modified to revalidation requests
+"""
+import hashlib
+from datetime import date, timezone
+from functools import wraps
+
+from flask import Response, request
+from werkzeug.http import http_date
+
+from department_app.cache import CACHE_VARIANT_KEY
+from department_app.service.table_version import TableVersionService
+
+# tables whose changes affect department and employee representations
+API_TABLES = ('department', 'employee')
+
+
+def build_validators(table_names):
+    """
+    Builds a strong entity tag and a last modification time of the requested
+    representation from versions of the tables it is built from.
+    :param table_names: names of tables
+    :return: entity tag and last modification time or None
+    """
+    versions = TableVersionService.find_versions(table_names)
+    # ages of employees depend on the current year
+    source = [request.full_path, request.headers.get('Accept', ''), str(date.today().year)]
+    source.extend(f'{table_name}={versions[table_name][0]}' for table_name in sorted(versions))
+    etag = hashlib.sha1('|'.join(source).encode()).hexdigest()
+    modified = [updated_at for _, updated_at in versions.values() if updated_at]
+    last_modified = max(modified).replace(tzinfo=timezone.utc) if modified else None
+    return etag, last_modified
+
+
+def not_modified(etag, last_modified):
+    """
+    Checks If-None-Match and If-Modified-Since headers of the request, the latter
+    is used only when the former is missing. Entity tags are compared weakly, since
+    compressed responses carry the weak form of the tag.
+    :param etag: current entity tag
+    :param last_modified: current last modification time
+    :return: True when the client has an up-to-date representation
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(table_names=API_TABLES):
+    """
+    Decorator of a resource get method, which adds ETag and Last-Modified headers to
+    successful responses and answers 304 Not Modified without calling the method when
+    the client already has the current representation. The entity tag is made a part
+    of the key of a cached response, so that a body cached before the tables changed
+    is never sent under the current tag.
+    :param table_names: names of tables the representation is built from
+    :return: decorator
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = build_validators(table_names)
+            headers = {'ETag': f'"{etag}"'}
+            if last_modified:
+                headers['Last-Modified'] = http_date(last_modified)
+            if not_modified(etag, last_modified):
+                return Response(status=304, headers=headers)
+            request.environ[CACHE_VARIANT_KEY] = etag
+            body, status = function(*args, **kwargs)
+            if status != 200:
+                return body, status
+            return body, status, headers
+        return wrapper
+    return decorator
@@ -2,81 +2,201 @@
 Departments REST API, this module defines the following classes:
 - Department which is department API class
 - DepartmentList which is department list API class
+- DepartmentExport which is department streaming export API class
 """
-from flask import request
-from flask_restful import Resource, abort
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from flask import current_app
+from flask_restful import Resource, abort, inputs, reqparse
 from marshmallow import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 
+from department_app.representations import request_body
+from department_app.rest.conditional import conditional
+from department_app.rest.export import export_parser, stream_export
+from department_app.rest.fieldsets import (
+    department_serializer_for, fieldsets_parser, load_options, needs_stats,
+    requested_fields)
+from department_app.rest.pagination import pagination_parser, paginate
 from department_app.schemas.department import DepartmentSchema
 from department_app.service.department import DepartmentService
-from department_app.extensions import logger
+from department_app.service.errors import ConflictError
+from department_app.extensions import db, logger, response_cache
 
 department_service = DepartmentService()
 department_schema = DepartmentSchema()
-department_list_schema = DepartmentSchema(many=True)
+department_patch_schema = DepartmentSchema(
+    only=('name', 'description'), partial=True, load_instance=False)
+
+# single worker thread deleting departments in background one at a time
+delete_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='department-delete')
+
+
+def invalidate_department(department_uuid):
+    """
+    Invalidates cached responses embedding a department: the department itself, lists
+    of departments and employees and single employees, which all carry the
+    employee-details tag, so that employees of the department are not fetched.
+    :param department_uuid: department uuid
+    """
+    response_cache.invalidate(
+        'departments', 'employees', 'employee-details', f'department:{department_uuid}')
+
+
+def delete_in_background(app, department):
+    """
+    Schedules deletion of a department and its employees chunk by chunk in the delete
+    worker. The worker is joined when the interpreter exits, so a worker process shutting
+    down gracefully waits for scheduled deletions to finish. Chunks are committed one by
+    one, so a deletion interrupted by a killed worker is resumed by deleting the department
+    again.
+    :param app: flask application
+    :param department: department object
+    :return: future of the deletion
+    """
+    department_id, department_uuid = department.id, department.uuid
+
+    def delete():
+        with app.app_context():
+            try:
+                department_service.delete_in_chunks(
+                    department_id, app.config['DEPARTMENT_DELETE_CHUNK_SIZE'])
+                logger.info('Succeeded to delete department with uuid %s in background',
+                            department_uuid)
+            except SQLAlchemyError:
+                logger.exception('Failed to delete department with uuid %s in background',
+                                 department_uuid)
+            finally:
+                invalidate_department(department_uuid)
+                db.session.remove()
+
+    return delete_executor.submit(delete)
 
 
 class Department(Resource):
     """
     Department API class
     """
+    delete_parser = reqparse.RequestParser()
+    delete_parser.add_argument('background', type=inputs.boolean, default=False,
+                               location='args')
+
     @classmethod
+    @conditional()
+    @response_cache.cached(lambda uuid: f'department:{uuid}')
     def get(cls, uuid):
         """
         Fetches a department by uuid via a service and returns it in json format with a status
         code 200 when success or an error message in json with a 404 status code if department
-        with such an uuid has not been found.
+        with such an uuid has not been found. Employees and their statistics are included
+        unless the fields or include arguments limit the representation.
         :param uuid: department uuid
         :return: json representation of the department and a status code 200 or an error
         message and a status code 404
         """
-        department = department_service.find_by_uuid(uuid)
+        requested = requested_fields(fieldsets_parser.parse_args(), ('employees', 'stats'))
+        options = load_options(requested)
+        department = department_service.find_by_uuid(uuid, **options)
         if not department:
-            logger.info(f'Failed to find department with uuid: "{uuid}"')
+            logger.info('Failed to find department with uuid: "%s"', uuid)
             abort(404, description="Department not found error")
-        return department_schema.dump(department), 200
+        if options and needs_stats(requested):
+            department_service.load_employees_stats([department], all_departments=False)
+        return department_serializer_for(requested).dump(department), 200
 
     @classmethod
     def put(cls, uuid):
         """
         Updates a department by its uuid in case such a department has been found and returns
         it in json format with status code 200. Returns an error message with status code
-        400 when request data does not pass validation or a department input name is empty.
+        400 when request data does not pass validation or a department input name is empty
+        and with status code 409 when another department has the same name.
         :param uuid: department uuid
         :return: json representation of the department and a status code 200 or an error
-        message and a status code 400
+        message and a status code 400 or 409
         """
         department = department_service.find_by_uuid(uuid)
         try:
-            department = department_schema.load(request.json, instance=department)
+            department = department_schema.load(request_body(), instance=department)
         except ValidationError as error:
             return error.messages, 400
         if department.name.isspace():
             logger.info(
                 'Failed to edit department: only whitespaces in department name.')
             abort(400, message="Empty department name is not allowed. Please provide some.")
-        department_service.update_in_db()
-        logger.info(
-            f'Succeeded to update department: name "{department.name}",'
-            f' description "{department.description}"')
+        try:
+            department_service.update_in_db()
+        except ConflictError:
+            logger.info('Failed to edit department: department with name %s already exists',
+                        department.name)
+            abort(409, message=f"Department with name {department.name} already exists.")
+        invalidate_department(department.uuid)
+        logger.info('Succeeded to update department with uuid %s', department.uuid)
+        logger.debug('Updated department: name "%s", description "%s"',
+                     department.name, department.description)
         return department_schema.dump(department), 200
 
+    @classmethod
+    def patch(cls, uuid):
+        """
+        Updates only the supplied name or description of a department by its uuid and
+        returns uuid, name and description of the department in json format with status
+        code 200. Returns an error message with status code 400 when supplied data does
+        not pass validation, 404 when department with such uuid does not exist and 409
+        when another department has the same name.
+        :param uuid: department uuid
+        :return: json representation of the department columns and a status code 200 or
+        an error message and a status code 400, 404 or 409
+        """
+        try:
+            changes = department_patch_schema.load(request_body())
+        except ValidationError as error:
+            return error.messages, 400
+        if changes.get('name', '').isspace():
+            logger.info(
+                'Failed to edit department: only whitespaces in department name.')
+            abort(400, message="Empty department name is not allowed. Please provide some.")
+        try:
+            department = department_service.patch(uuid, changes)
+        except ConflictError:
+            logger.info('Failed to edit department: department with name %s already exists',
+                        changes['name'])
+            abort(409, message=f"Department with name {changes['name']} already exists.")
+        if department is None:
+            logger.info('Failed to edit department with fake uuid: %s', uuid)
+            abort(404, message="Department not found error")
+        invalidate_department(department.uuid)
+        logger.info('Succeeded to patch department with uuid %s', uuid)
+        logger.debug('Patched department fields: %s', tuple(changes))
+        return {'uuid': department.uuid, 'name': department.name,
+                'description': department.description}, 200
+
     @classmethod
     def delete(cls, uuid):
         """
         Deletes a department by its uuid in case department with such an uuid was found and
-        returns 204 status code. Returns an error message with status code 204 when department
-        with such uuid does not exist.
+        returns 204 status code. Employees are deleted by the database without being loaded.
+        With the background argument employees are deleted chunk by chunk by a background
+        worker and 202 status code is returned immediately. Returns an error message with
+        status code 404 when department with such uuid does not exist.
         :param uuid: department uuid
-        :return: no content message and a status code 204 or an error message with a status code 404
+        :return: no content message and a status code 204 or 202 or an error message with
+        a status code 404
         """
-        department = department_service.find_by_uuid(uuid)
+        args = cls.delete_parser.parse_args()
+        department = department_service.find_by_uuid(uuid, with_employees=False)
         if not department:
-            logger.info(f'Failed to delete department with fake uuid: {uuid}')
+            logger.info('Failed to delete department with fake uuid: %s', uuid)
             abort(404, message="Department not found error")
-        logger.info(
-            f'Succeeded to delete department with name: "{department.name}"')
+        if args['background']:
+            logger.info('Scheduled to delete department with uuid %s in background', uuid)
+            # pylint: disable=protected-access
+            delete_in_background(current_app._get_current_object(), department)
+            return '', 202
         department_service.delete_from_db(department)
+        invalidate_department(department.uuid)
+        logger.info('Succeeded to delete department with uuid %s', uuid)
         return '', 204
 
 
@@ -85,42 +205,82 @@ class DepartmentList(Resource):
     Department list API class
     """
     @classmethod
+    @conditional()
+    @response_cache.cached(lambda: 'departments')
     def get(cls):
         """
-         Fetches a list of all departments via a service and returns them in the list of
-         json format data items with status code 200 or en empty list in case no departments
-         have been found.
+         Fetches a page of departments via a service and returns them in json format with
+         a cursor of the next page and status code 200. The page size is set by the limit
+         argument and the page start by the after cursor. Pages include employees statistics
+         but not employees, unless the fields or include arguments say otherwise. A list of
+         all departments with employees is returned when the all argument is true.
 
-        :return: list of departments in json format and status code 200
+        :return: page or list of departments in json format and status code 200
         """
-        departments = department_service.find_all()
-        return department_list_schema.dump(departments), 200
+        args = pagination_parser.parse_args()
+        default_include = ('employees', 'stats') if args['all'] else ('stats',)
+        requested = requested_fields(fieldsets_parser.parse_args(), default_include)
+        options = load_options(requested)
+        serializer = department_serializer_for(requested, many=True)
+        if args['all']:
+            departments = department_service.find_all(**options)
+            if needs_stats(requested):
+                department_service.load_employees_stats(departments)
+            return serializer.dump(departments), 200
+        departments, next_cursor = paginate(
+            partial(department_service.find_page, **options), args)
+        if needs_stats(requested):
+            department_service.load_employees_stats(departments, all_departments=False)
+        return {'items': serializer.dump(departments), 'next_cursor': next_cursor}, 200
 
     @classmethod
     def post(cls):
         """
         Creates new department and returns its json representation with a status code 200.
         Returns an error message with a status code 400 in case request data does not pass
-        validation or an input department name is empty.
+        validation or an input department name is empty, and with a status code 409 when
+        the unique constraint of the database finds a department with the same name.
         :return: json representation of the department and a status code 201 or an error
-        message and a status code 400
+        message and a status code 400 or 409
         """
-        name = request.json['name']
-        department_exists_check = department_service.find_by_name(name)
-        if department_exists_check:
-            logger.info(f'Failed to add a new department:'
-                        f' department with name {name} already exists')
-            abort(400, description=f"Department with name {name} already exists.")
         try:
-            department = department_schema.load(request.json)
+            department = department_schema.load(request_body())
         except ValidationError as error:
             return error.messages, 400
         if department.name.isspace():
             logger.info(
                 'Failed to add a new department: only whitespaces in department name.')
             abort(400, description="Department name should not contain only whitespaces.")
-        department_service.save_to_db(department)
-        logger.info(
-            f'Succeeded to add department: name "{department.name}",'
-            f' description "{department.description}"')
+        try:
+            department_service.save_to_db(department)
+        except ConflictError:
+            logger.info('Failed to add a new department: department with name %s already'
+                        ' exists', department.name)
+            abort(409, message=f"Department with name {department.name} already exists.")
+        response_cache.invalidate('departments')
+        logger.info('Succeeded to add department with uuid %s', department.uuid)
+        logger.debug('Added department: name "%s", description "%s"',
+                     department.name, department.description)
         return department_schema.dump(department), 201
+
+
+class DepartmentExport(Resource):
+    """
+    Department streaming export API class
+    """
+    # columns of exported departments
+    fieldnames = ('uuid', 'name', 'description', 'employees_count', 'average_salary',
+                  'employees_average_age')
+
+    @classmethod
+    def get(cls):
+        """
+        Streams all the departments with employees statistics in ndjson or csv format,
+        chosen by the format argument, with a status code 200 while they are read from
+        database.
+        :return: streamed response with departments
+        """
+        args = export_parser.parse_args()
+        logger.info('Export of departments in format "%s"', args['format'])
+        return stream_export(department_service.iter_export(), cls.fieldnames,
+                             args['format'], 'departments')
@@ -3,23 +3,66 @@ Employees REST API, this module defines the following classes:
 - Employee which is employee API class
 - EmployeeList which is employee list API class
 - EmployeeSearchList which is employee search API class
+- EmployeeImport which is employee bulk import API class
+- EmployeeExport which is employee streaming export API class
 """
 from datetime import datetime
 
 from flask import request
-from flask_restful import Resource, abort, reqparse
+from flask_restful import Resource, abort, inputs, reqparse
 from marshmallow import ValidationError
 
+from department_app.representations import request_body
+from department_app.rest.conditional import conditional
+from department_app.rest.export import export_parser, stream_export
+from department_app.rest.pagination import pagination_parser, paginate
+from department_app.schemas.compiled import CompiledSerializer
 from department_app.schemas.employee import EmployeeSchema
 from department_app.service.employee import EmployeeService
 from department_app.service.department import DepartmentService
-from department_app.extensions import logger
+from department_app.service.employee_import import EmployeeImportService, ImportFormatError
+from department_app.service.errors import ConflictError, ConstraintError
+from department_app.extensions import logger, response_cache
 
 department_service = DepartmentService()
 employee_service = EmployeeService()
+employee_import_service = EmployeeImportService()
 
 employee_schema = EmployeeSchema()
-employee_list_schema = EmployeeSchema(many=True)
+employee_patch_schema = EmployeeSchema(
+    only=('name', 'birth_date', 'salary'), partial=True, load_instance=False)
+employee_list_serializer = CompiledSerializer(EmployeeSchema(many=True))
+
+
+def write_employee(write):
+    """
+    Runs a service write of an employee and aborts with status code 409 when it
+    conflicts with an existing employee or 400 when it violates another constraint,
+    e.g. its department has been deleted meanwhile.
+    :param write: function writing the employee
+    :return: result of the write
+    """
+    try:
+        result = write()
+    except ConflictError:
+        logger.info('Failed to save employee: employee already exists.')
+        abort(409, message="Employee already exists.")
+    except ConstraintError:
+        logger.info('Failed to save employee: constraint violation.')
+        abort(400, message="Employee department not found.")
+    return result
+
+
+def invalidate_employee(employee_uuid, *departments):
+    """
+    Invalidates cached responses embedding an employee: the employee itself, lists
+    of employees and departments and the departments an employee works or worked in.
+    :param employee_uuid: employee uuid
+    :param departments: departments of the employee
+    """
+    response_cache.invalidate(
+        'employees', 'departments', f'employee:{employee_uuid}',
+        *(f'department:{department.uuid}' for department in departments if department))
 
 
 class Employee(Resource):
@@ -30,6 +73,8 @@ class Employee(Resource):
     parser.add_argument('department_uuid')
 
     @classmethod
+    @conditional()
+    @response_cache.cached(lambda uuid: (f'employee:{uuid}', 'employee-details'))
     def get(cls, uuid):
         """
         Fetches an employee by uuid via a service and returns it in json format with a status
@@ -41,7 +86,7 @@ class Employee(Resource):
         """
         employee = employee_service.find_by_uuid(uuid)
         if not employee:
-            logger.info(f'Failed to find employee with uuid: "{uuid}"')
+            logger.info('Failed to find employee with uuid: "%s"', uuid)
             abort(404, description="Employee not found error")
         return employee_schema.dump(employee), 200
 
@@ -50,30 +95,72 @@ class Employee(Resource):
         """
         Updates a employee by its uuid in case such an employee has been found and returns
         it in json format with status code 200. Returns an error message with status code
-        400 when request data does not pass validation or an employee input name is empty.
+        400 when request data does not pass validation, an employee input name is empty or
+        the department does not exist anymore when the employee is written.
         :param uuid: employee uuid
         :return: json representation of the employee and a status code 200 or an error
         message and a status code 400
         """
         args = cls.parser.parse_args()
         employee = employee_service.find_by_uuid(uuid)
+        previous_department = employee.department if employee else None
         try:
-            employee = employee_schema.load(request.json, instance=employee)
+            employee = employee_schema.load(request_body(), instance=employee)
         except ValidationError as error:
             return error.messages, 400
         if employee.name.isspace():
             logger.info(
                 'Failed to edit employee: only whitespaces in employee name.')
             abort(400, message="Please provide some name.")
-        employee.department = department_service.find_by_uuid(args['department_uuid'])
-        employee_service.update_in_db()
-        logger.info(
-            f'Succeeded to edit employee with name "{employee.name}", '
-            f'birth_date: "{employee.birth_date}", '
-            f'salary: "{employee.salary}" and '
-            f'department: "{employee.department.name}"')
+        employee.department = department_service.find_by_uuid(
+            args['department_uuid'], with_employees=False)
+        write_employee(employee_service.update_in_db)
+        invalidate_employee(employee.uuid, previous_department, employee.department)
+        logger.info('Succeeded to edit employee with uuid %s', employee.uuid)
+        logger.debug('Edited employee: name "%s", birth_date: "%s", salary: "%s" and '
+                     'department: "%s"', employee.name, employee.birth_date, employee.salary,
+                     getattr(employee.department, 'name', None))
         return employee_schema.dump(employee), 200
 
+    @classmethod
+    def patch(cls, uuid):
+        """
+        Updates only the supplied name, birth_date, salary or department_uuid of an employee
+        by its uuid and returns the employee in json format with status code 200. Returns an
+        error message with status code 400 when supplied data does not pass validation or
+        the department does not exist and 404 when employee with such uuid does not exist.
+        :param uuid: employee uuid
+        :return: json representation of the employee and a status code 200 or an error
+        message and a status code 400 or 404
+        """
+        data = request_body()
+        department_change = {}
+        if isinstance(data, dict) and 'department_uuid' in data:
+            data = dict(data)
+            department_change['department_uuid'] = data.pop('department_uuid') or None
+        try:
+            changes = employee_patch_schema.load(data)
+        except ValidationError as error:
+            return error.messages, 400
+        if changes.get('name', '').isspace():
+            logger.info(
+                'Failed to edit employee: only whitespaces in employee name.')
+            abort(400, message="Please provide some name.")
+        changes.update(department_change)
+        result = write_employee(lambda: employee_service.patch(uuid, changes))
+        if result is None:
+            logger.info('Failed to edit employee with fake uuid: %s', uuid)
+            abort(404, message="Employee not found error")
+        employee, previous_department_uuid = result
+        response_cache.invalidate(
+            'employees', 'departments', f'employee:{uuid}',
+            *{f'department:{department_uuid}'
+              for department_uuid in (previous_department_uuid, employee['department_uuid'])
+              if department_uuid not in (None, 'Not added')})
+        logger.info('Succeeded to patch employee with uuid %s', uuid)
+        logger.debug('Patched employee fields: %s', tuple(changes))
+        return employee, 200
+
     @classmethod
     def delete(cls, uuid):
         """
@@ -85,11 +172,12 @@ class Employee(Resource):
         """
         employee = employee_service.find_by_uuid(uuid)
         if not employee:
-            logger.info(f'Failed to delete employee with fake uuid: {uuid}')
+            logger.info('Failed to delete employee with fake uuid: %s', uuid)
             abort(404, message="Employee not found error")
+        department = employee.department
         employee_service.delete_from_db(employee)
-        logger.info(
-            f'Succeeded to delete employee with name: "{employee.name}"')
+        invalidate_employee(uuid, department)
+        logger.info('Succeeded to delete employee with uuid %s', uuid)
         return '', 204
 
 
@@ -101,40 +189,50 @@ class EmployeeList(Resource):
     parser.add_argument('department_uuid')
 
     @classmethod
+    @conditional()
+    @response_cache.cached(lambda: 'employees')
     def get(cls):
         """
-         Fetches all the employees via a service and returns them in the list of
-         json format data items with status code 200 or en empty list in case no employees
-         have been found.
+         Fetches a page of employees via a service and returns them in json format with
+         a cursor of the next page and status code 200. The page size is set by the limit
+         argument and the page start by the after cursor. A list of all employees is
+         returned when the all argument is true.
 
-        :return: list of employees in json format and status code 200
+        :return: page or list of employees in json format and status code 200
         """
-        employees = employee_service.find_all()
-        return employee_list_schema.dump(employees, many=True), 200
+        args = pagination_parser.parse_args()
+        if args['all']:
+            employees = employee_service.find_all()
+            return employee_list_serializer.dump(employees), 200
+        employees, next_cursor = paginate(employee_service.find_page, args)
+        return {'items': employee_list_serializer.dump(employees),
+                'next_cursor': next_cursor}, 200
 
     @classmethod
     def post(cls):
         """
         Creates new employee and returns its json representation with a status code 200.
         Returns an error message with a status code 400 in case request data does not pass
-        validation or an input employee name is empty.
+        validation, an input employee name is empty or the department does not exist anymore
+        when the employee is written.
         :return: json representation of the employee and a status code 201 or an error
         message and a status code 400
         """
         args = cls.parser.parse_args()
         try:
-            employee = employee_schema.load(request.json)
+            employee = employee_schema.load(request_body())
         except ValidationError as error:
             return error.messages, 400
         if employee.name.isspace():
             logger.info(
                 'Failed to add a new employee: only whitespaces in employee name.')
             abort(400, description="Employee name should not contain only whitespaces.")
-        employee.department = department_service.find_by_uuid(args['department_uuid'])
-        employee_service.save_to_db(employee)
-        name = employee.name
-        logger.info(
-            f'Succeeded to add employee with name "{name}"')
+        employee.department = department_service.find_by_uuid(
+            args['department_uuid'], with_employees=False)
+        write_employee(lambda: employee_service.save_to_db(employee))
+        invalidate_employee(employee.uuid, employee.department)
+        logger.info('Succeeded to add employee with uuid %s', employee.uuid)
+        logger.debug('Added employee with name "%s"', employee.name)
         return employee_schema.dump(employee), 201
 
 
@@ -161,13 +259,74 @@ class EmployeeSearchList(Resource):
         if args['date']:
             date = datetime.strptime(args['date'], '%Y-%m-%d')
             employees = employee_service.find_by_birth_date(date)
-            logger.info(f'Search by exact date: "{date}"')
+            logger.info('Search by exact date: "%s"', date)
         elif args['start_date'] and args['end_date']:
             start_date = datetime.strptime(args['start_date'], '%Y-%m-%d')
             end_date = datetime.strptime(args['end_date'], '%Y-%m-%d')
             employees = employee_service.find_by_birth_period(start_date, end_date)
-            logger.info(f'Search by period between dates: from "{start_date}" to "{end_date}"')
+            logger.info('Search by period between dates: from "%s" to "%s"', start_date, end_date)
         else:
             logger.info('Invalid date input.')
             abort(400, message="Not valid date input")
-        return employee_list_schema.dump(employees, many=True), 200
+        return employee_list_serializer.dump(employees), 200
+
+
+class EmployeeImport(Resource):
+    """
+    Employee bulk import API class
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('batch_size', type=inputs.positive, default=1000, location='args')
+
+    # formats of the request body by content type
+    content_types = {
+        'text/csv': 'csv',
+        'application/x-ndjson': 'ndjson',
+        'application/ndjson': 'ndjson'
+    }
+
+    @classmethod
+    def post(cls):
+        """
+        Creates employees from a csv or ndjson request body, which is parsed as a stream
+        and inserted in batches, and returns a report with the number of imported employees
+        and errors by line with a status code 200. Returns an error message with a status
+        code 415 when the content type is not supported or 400 when the body can not be parsed.
+        :return: import report in json format and a status code 200 or an error message
+        and a status code 415 or 400
+        """
+        args = cls.parser.parse_args()
+        input_format = cls.content_types.get(request.mimetype)
+        if not input_format:
+            logger.info('Failed to import employees: unsupported type "%s"', request.mimetype)
+            abort(415, message="Only text/csv and application/x-ndjson are supported.")
+        rows = employee_import_service.parse(request.stream, input_format)
+        try:
+            report = employee_import_service.import_rows(rows, args['batch_size'])
+        except ImportFormatError as error:
+            logger.info('Failed to import employees: %s', error)
+            abort(400, message=str(error))
+        if report['imported']:
+            response_cache.clear()
+        logger.info('Imported %s employees, %s failed', report['imported'], report['failed'])
+        return report, 200
+
+
+class EmployeeExport(Resource):
+    """
+    Employee streaming export API class
+    """
+    # columns of exported employees
+    fieldnames = ('uuid', 'name', 'birth_date', 'salary', 'age', 'department', 'department_uuid')
+
+    @classmethod
+    def get(cls):
+        """
+        Streams all the employees in ndjson or csv format, chosen by the format argument,
+        with a status code 200 while they are read from database.
+        :return: streamed response with employees
+        """
+        args = export_parser.parse_args()
+        logger.info('Export of employees in format "%s"', args['format'])
+        return stream_export(employee_service.iter_export(), cls.fieldnames,
+                             args['format'], 'employees')
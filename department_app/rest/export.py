@@ -0,0 +1,78 @@
+"""
+Streaming export helpers shared by the export APIs, this module defines the following:
+- export_parser which is a parser of export request arguments
+- stream_export which builds a streamed ndjson or csv response from rows
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from flask import Response, stream_with_context
+from flask_restful import reqparse
+
+# number of rows written to the response at once
+CHUNK_SIZE = 500
+# content types of the export formats
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', choices=tuple(CONTENT_TYPES), default='ndjson',
+                           location='args')
+
+
+def iter_ndjson(rows):
+    """
+    Encodes rows as newline delimited json chunk by chunk.
+    :param rows: iterable of dictionaries
+    :return: generator of text chunks
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield ''.join(json.dumps(row) + '\n' for row in chunk)
+
+
+def iter_csv(rows, fieldnames):
+    """
+    Encodes rows as csv with a header row chunk by chunk.
+    :param rows: iterable of dictionaries
+    :param fieldnames: names of csv columns
+    :return: generator of text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        if not chunk:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream_export(rows, fieldnames, export_format, filename):
+    """
+    Builds a response which streams rows to the client while they are read from database.
+    :param rows: iterable of dictionaries
+    :param fieldnames: names of csv columns
+    :param export_format: 'ndjson' or 'csv'
+    :param filename: name of the downloaded file without extension
+    :return: streamed response
+    """
+    if export_format == 'csv':
+        chunks = iter_csv(rows, fieldnames)
+    else:
+        chunks = iter_ndjson(rows)
+    response = Response(stream_with_context(chunks), mimetype=CONTENT_TYPES[export_format])
+    response.headers['Content-Disposition'] = \
+        f'attachment; filename={filename}.{export_format}'
+    return response
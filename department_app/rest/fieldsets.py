@@ -0,0 +1,92 @@
+"""
+Sparse fieldset helpers of the department APIs, this module defines the following:
+- fieldsets_parser which is a parser of fields and include request arguments
+- requested_fields which resolves the fields of a department representation
+- load_options which builds arguments of department lookups loading only requested data
+- needs_stats which checks whether employees statistics are requested
+- department_serializer_for which returns a department serializer limited to requested fields
+"""
+from functools import lru_cache
+
+from flask_restful import abort, reqparse
+
+from department_app.schemas.compiled import CompiledSerializer
+from department_app.schemas.department import (
+    COLUMN_FIELDS, INCLUDE_FIELDS, STATS_FIELDS, DepartmentSchema)
+
+fieldsets_parser = reqparse.RequestParser()
+fieldsets_parser.add_argument('fields', location='args')
+fieldsets_parser.add_argument('include', location='args')
+
+# all the fields of a department representation
+ALL_FIELDS = frozenset(COLUMN_FIELDS + STATS_FIELDS + ('employees',))
+
+
+def _split(value):
+    """
+    Splits a comma separated request argument.
+    :param value: argument value
+    :return: list of non-empty names
+    """
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def requested_fields(args, default_include):
+    """
+    Resolves fields of a department representation from the fields argument, which
+    lists department fields, and the include argument, which adds groups of fields.
+    Columns of the department are returned when fields are not given and the default
+    groups are included when include is not given. Aborts with a status code 400 if
+    an unknown field or group is requested.
+    :param args: parsed fieldsets arguments
+    :param default_include: groups included when the include argument is not given
+    :return: set of field names
+    """
+    include = default_include if args['include'] is None else _split(args['include'])
+    unknown = [name for name in include if name not in INCLUDE_FIELDS]
+    if unknown:
+        abort(400, message=f"Not valid include: {', '.join(unknown)}")
+    fields = _split(args['fields']) if args['fields'] else COLUMN_FIELDS
+    unknown = [name for name in fields if name not in ALL_FIELDS]
+    if unknown:
+        abort(400, message=f"Not valid fields: {', '.join(unknown)}")
+    requested = set(fields)
+    for group in include:
+        requested.update(INCLUDE_FIELDS[group])
+    return frozenset(requested)
+
+
+def load_options(requested):
+    """
+    Builds keyword arguments of department service lookups which load only the columns
+    and relationships needed for requested fields. Nothing is passed for the full
+    representation, so lookups use their defaults.
+    :param requested: set of field names
+    :return: dictionary of lookup arguments
+    """
+    if requested == ALL_FIELDS:
+        return {}
+    return {'with_employees': 'employees' in requested,
+            'columns': [field for field in COLUMN_FIELDS
+                        if field in requested or field == 'uuid']}
+
+
+def needs_stats(requested):
+    """
+    Checks whether any of employees statistics fields is requested.
+    :param requested: set of field names
+    :return: True if statistics are requested
+    """
+    return not requested.isdisjoint(STATS_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def department_serializer_for(requested, many=False):
+    """
+    Returns a department serializer dumping only requested fields, serializers are
+    compiled once for every combination of fields.
+    :param requested: set of field names
+    :param many: whether the serializer dumps a list
+    :return: compiled department serializer
+    """
+    return CompiledSerializer(DepartmentSchema(only=requested, many=many))
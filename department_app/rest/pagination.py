@@ -0,0 +1,56 @@
+"""
+Keyset pagination helpers shared by the list APIs, this module defines the following:
+- pagination_parser which is a parser of pagination request arguments
+- encode_cursor and decode_cursor to convert a row id to an opaque cursor and back
+- paginate which fetches a page of rows after the given cursor
+"""
+import base64
+import binascii
+
+from flask import current_app
+from flask_restful import abort, inputs, reqparse
+
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=inputs.positive, location='args')
+pagination_parser.add_argument('after', location='args')
+pagination_parser.add_argument('all', type=inputs.boolean, default=False, location='args')
+
+
+def encode_cursor(row_id):
+    """
+    Converts a database id of the last row on a page to an opaque cursor.
+    :param row_id: id of the row
+    :return: cursor string
+    """
+    return base64.urlsafe_b64encode(str(row_id).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Converts a cursor received from a client back to a database id.
+    Aborts with a status code 400 if the cursor is malformed.
+    :param cursor: cursor string
+    :return: id of the row
+    """
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return abort(400, message="Not valid cursor")
+
+
+def paginate(find_page, args):
+    """
+    Fetches a page of rows ordered by id via given service method and
+    determines a cursor of the next page. One extra row is requested to
+    find out whether the next page exists.
+    :param find_page: service method accepting limit and after_id
+    :param args: parsed pagination arguments
+    :return: rows of the page and a cursor of the next page or None
+    """
+    limit = min(args['limit'] or current_app.config.get('API_PAGE_SIZE', 100),
+                current_app.config.get('API_MAX_PAGE_SIZE', 1000))
+    after_id = decode_cursor(args['after']) if args['after'] else None
+    rows = find_page(limit + 1, after_id)
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].id) if len(rows) > limit else None
+    return page, next_cursor
@@ -0,0 +1,137 @@
+"""
+Database routing module used to send reads of GET requests to read replicas, this module
+defines the following:
+- RoutingSession which routes every query to its replica or the primary database
+- RoutingSQLAlchemy which is a database extension creating routing sessions and
+  providing read_only decorator of service methods allowed to read from replicas
+"""
+import inspect
+import random
+from functools import wraps
+
+from flask import has_request_context, request
+from flask_sqlalchemy import SignallingSession, SQLAlchemy, get_state
+from sqlalchemy import event, orm
+
+# methods of requests which are allowed to read from replicas
+REPLICA_METHODS = ('GET', 'HEAD')
+
+
+class RoutingSession(SignallingSession):
+    """
+    Session which reads from a replica configured by SQLALCHEMY_REPLICA_BINDS inside
+    read-only service methods of GET requests. The replica is chosen at random once per
+    session, so that all the reads of a request see the same replication state.
+    Everything else, as well as all the reads after the session has written anything,
+    goes to the primary database.
+    """
+    def reads_from_replica(self):
+        """
+        Checks whether the next query of the session may be routed to a replica.
+        :return: True if the query is a read of a GET request before any write
+        """
+        if not self.info.get('read_only') or self.info.get('wrote'):
+            return False
+        if self.new or self.deleted or self.identity_map.check_modified():
+            return False
+        return has_request_context() and request.method in REPLICA_METHODS
+
+    def get_bind(self, mapper=None, clause=None):
+        """
+        Returns the engine of the replica of the session or of the primary database.
+        :param mapper: mapper of the queried model
+        :param clause: queried statement
+        :return: database engine
+        """
+        replicas = self.app.config.get('SQLALCHEMY_REPLICA_BINDS')
+        if replicas and self.reads_from_replica():
+            replica = self.info.get('replica')
+            if replica is None:
+                replica = self.info['replica'] = random.choice(replicas)
+            return get_state(self.app).db.get_engine(self.app, bind=replica)
+        return super().get_bind(mapper, clause)
+
+
+def remember_write(session, flush_context):
+    """
+    Marks the session as written, so that following reads see the changes.
+    """
+    # pylint: disable=unused-argument
+    session.info['wrote'] = True
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """
+    Database extension using routing sessions.
+    """
+    def create_session(self, options):
+        """
+        Creates factory of routing sessions which remember their writes.
+        :param options: dict of keyword arguments passed to session class
+        :return: session factory
+        """
+        session_factory = orm.sessionmaker(class_=RoutingSession, db=self, **options)
+        event.listen(session_factory, 'after_flush', remember_write)
+        return session_factory
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        """
+        Allows pooled SQLite connections to be checked out by any thread, since the
+        queue pool of the application hands a connection to one thread at a time.
+        :param app: flask application
+        :param sa_url: database url
+        :param options: dict of engine options
+        :return: database url and engine options
+        """
+        sa_url, options = super().apply_driver_hacks(app, sa_url, options)
+        if sa_url.drivername.startswith('sqlite'):
+            options.setdefault('connect_args', {})['check_same_thread'] = False
+        return sa_url, options
+
+    def init_app(self, app):
+        """
+        Binds the database to the application and resets routing of the session
+        at the end of every request.
+        :param app: flask application
+        """
+        super().init_app(app)
+        app.teardown_request(self.reset_routing)
+
+    def reset_routing(self, error=None):
+        """
+        Allows reads from replicas again after a request which has written and lets
+        the next request choose its replica.
+        :param error: exception raised by the request
+        """
+        # pylint: disable=unused-argument
+        if self.session.registry.has():
+            self.session.info.pop('wrote', None)
+            self.session.info.pop('replica', None)
+
+    def read_only(self, function):
+        """
+        Decorator of a service method which only reads data, so that it may be routed
+        to a replica. Generator methods are routed while they are iterated.
+        :param function: service method
+        :return: decorated method
+        """
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                previous = self.session.info.get('read_only', False)
+                self.session.info['read_only'] = True
+                try:
+                    yield from function(*args, **kwargs)
+                finally:
+                    self.session.info['read_only'] = previous
+            return generator_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            previous = self.session.info.get('read_only', False)
+            self.session.info['read_only'] = True
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.session.info['read_only'] = previous
+        return wrapper
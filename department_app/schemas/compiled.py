@@ -0,0 +1,151 @@
+"""
+Compiled serializer module used to dump objects on hot read paths, this module
+defines the following class:
+- CompiledSerializer which dumps objects by code generated from schema fields
+"""
+from marshmallow import fields
+from marshmallow.utils import ensure_text_type
+
+
+class CompiledSerializer:
+    """
+    Serializer generated once from the dump fields of a marshmallow schema. Every
+    object is dumped by a single function building the dictionary in straight-line
+    code instead of dispatching to the schema fields one by one, output is the same
+    as the output of the schema. Schemas are still used to load data.
+    """
+    def __init__(self, schema):
+        """
+        Constructor of CompiledSerializer class.
+        :param schema: marshmallow schema instance
+        """
+        self.schema = schema
+        self.many = schema.many
+        self.dump_one = self.compile(schema)
+
+    def dump(self, obj, many=None):
+        """
+        Serializes an object or a list of objects.
+        :param obj: object or list of objects
+        :param many: whether obj is a list, the schema setting is used if not given
+        :return: serialized data
+        """
+        many = self.many if many is None else many
+        if many:
+            dump_one = self.dump_one
+            return [dump_one(item) for item in obj]
+        return self.dump_one(obj)
+
+    @classmethod
+    def compile(cls, schema):
+        """
+        Generates a function dumping a single object with the fields of given schema.
+        :param schema: marshmallow schema instance
+        :return: function accepting an object and returning a dictionary
+        """
+        namespace = {'ensure_text_type': ensure_text_type}
+        lines, items = [], []
+        for number, (name, field) in enumerate(schema.dump_fields.items()):
+            key = field.data_key if field.data_key is not None else name
+            statement, value = cls._compile_field(number, name, field, namespace)
+            if statement:
+                lines.append(statement)
+            items.append(f'{key!r}: {value}')
+        source = '\n'.join(['def dump_one(obj):', *lines,
+                            f"    return {{{', '.join(items)}}}"])
+        # pylint: disable=exec-used
+        exec(compile(source, f'<compiled {type(schema).__name__}>', 'exec'), namespace)
+        return namespace['dump_one']
+
+    @staticmethod
+    def _compile_field(number, name, field, namespace):
+        """
+        Generates code of a single field value by the value compiler of the field type,
+        fields without one are serialized by the field itself. Objects used by the code
+        are added to the namespace.
+        :param number: number of the field
+        :param name: name of the field
+        :param field: marshmallow field
+        :param namespace: namespace of the generated function
+        :return: statement reading the attribute or None and expression of the value
+        """
+        variable = f'value_{number}'
+        if isinstance(field, fields.Method) and field.serialize_method_name:
+            namespace[f'method_{number}'] = getattr(field.parent, field.serialize_method_name)
+            return None, f'method_{number}(obj)'
+        value = None
+        for field_class in type(field).__mro__:
+            if field_class in VALUE_COMPILERS:
+                value = VALUE_COMPILERS[field_class](variable, number, field, namespace)
+                break
+        if value is None:
+            namespace[f'field_{number}'] = field
+            return f'    {variable} = field_{number}.serialize({name!r}, obj)', variable
+        return f'    {variable} = obj.{field.attribute or name}', value
+
+
+def _nested_value(variable, number, field, namespace):
+    """
+    Generates expression of a nested schema value dumped by its compiled function.
+    :param variable: variable holding the attribute
+    :param number: number of the field
+    :param field: nested field
+    :param namespace: namespace of the generated function
+    :return: expression of the serialized value
+    """
+    namespace[f'nested_{number}'] = CompiledSerializer.compile(field.schema)
+    if field.schema.many or field.many:
+        return f'None if {variable} is None else [nested_{number}(item) for item in {variable}]'
+    return f'None if {variable} is None else nested_{number}({variable})'
+
+
+def _string_value(variable, number, field, namespace):
+    """
+    Generates expression of a string value.
+    :param variable: variable holding the attribute
+    :return: expression of the serialized value
+    """
+    # pylint: disable=unused-argument
+    return (f'{variable} if {variable} is None or {variable}.__class__ is str '
+            f'else ensure_text_type({variable})')
+
+
+def _number_value(variable, number, field, namespace):
+    """
+    Generates expression of an integer or float value, numbers dumped as strings are
+    left to the field.
+    :param variable: variable holding the attribute
+    :param number: number of the field
+    :param field: integer or float field
+    :param namespace: namespace of the generated function
+    :return: expression of the serialized value or None
+    """
+    if field.as_string:
+        return None
+    namespace[f'type_{number}'] = field.num_type
+    return f'None if {variable} is None else type_{number}({variable})'
+
+
+def _datetime_value(variable, number, field, namespace):
+    """
+    Generates expression of a date or time value with a strftime format, iso and rfc
+    formats are left to the field.
+    :param variable: variable holding the attribute
+    :param field: date or time field
+    :return: expression of the serialized value or None
+    """
+    # pylint: disable=unused-argument
+    data_format = field.format or field.DEFAULT_FORMAT
+    if data_format in field.SERIALIZATION_FUNCS:
+        return None
+    return f'None if {variable} is None else {variable}.strftime({data_format!r})'
+
+
+# value compilers by field type, subclasses use the compiler of their closest base
+VALUE_COMPILERS = {
+    fields.Nested: _nested_value,
+    fields.String: _string_value,
+    fields.Integer: _number_value,
+    fields.Float: _number_value,
+    fields.DateTime: _datetime_value,
+}
@@ -2,6 +2,10 @@
 Department schema module used to serialize and deserialize departments, this module
 defines the following classes:
 - DepartmentSchema which is department serialization and deserialization schema
+and the following groups of its fields:
+- COLUMN_FIELDS which are fields stored in the department table
+- STATS_FIELDS which are fields of employees statistics
+- INCLUDE_FIELDS which are groups of fields a client can include into a representation
 """
 from marshmallow import fields
 
@@ -10,6 +14,13 @@ from department_app.schemas.employee import EmployeeSchema
 from department_app.models.department import DepartmentModel
 from department_app.service.department import DepartmentService
 
+# fields stored in the department table
+COLUMN_FIELDS = ('uuid', 'name', 'description')
+# fields of employees statistics of the department
+STATS_FIELDS = ('employees_count', 'average_salary', 'employees_average_age')
+# groups of fields which are included into a representation by name
+INCLUDE_FIELDS = {'employees': ('employees',), 'stats': STATS_FIELDS}
+
 
 # pylint: disable=too-many-ancestors
 class DepartmentSchema(ma.SQLAlchemyAutoSchema):
@@ -30,7 +41,7 @@ class DepartmentSchema(ma.SQLAlchemyAutoSchema):
         # exclude id from schema
         exclude = ('id',)
         # fields provided only for serialization
-        dump_only = ('department_uuid',)
+        dump_only = ('department_uuid', 'uuid')
     # employees working in the department nested list
     employees = ma.Nested(EmployeeSchema, many=True)   # pylint: disable=E1101
     # number of employees working in the department
@@ -47,6 +58,8 @@ class DepartmentSchema(ma.SQLAlchemyAutoSchema):
         :param department: department object
         :return: amount of the employees
         """
+        if department.stats is not None:
+            return department.stats['employees_count']
         return DepartmentService.find_employees_count(department)
 
     @classmethod
@@ -56,6 +69,8 @@ class DepartmentSchema(ma.SQLAlchemyAutoSchema):
         :param department: department object
         :return: average salary of all the employees in the department
         """
+        if department.stats is not None:
+            return department.stats['average_salary']
         return DepartmentService.find_employees_average_salary(department)
 
     @classmethod
@@ -65,4 +80,6 @@ class DepartmentSchema(ma.SQLAlchemyAutoSchema):
         :param department: department object
         :return: average age of all the employees in the department
         """
+        if department.stats is not None:
+            return department.stats['employees_average_age']
         return DepartmentService.find_employees_average_age(department)
@@ -2,6 +2,7 @@
 Employee schema module used to serialize and deserialize departments, this module
 defines the following classes:
 - EmployeeSchema which is employee serialization and deserialization schema
+- EmployeeImportSchema which is deserialization schema of imported employee rows
 """
 from marshmallow import fields
 
@@ -27,6 +28,8 @@ class EmployeeSchema(ma.SQLAlchemyAutoSchema):
         load_instance = True
         # exclude id and department_id from schema
         exclude = ('id', 'department_id')
+        # fields provided only for serialization
+        dump_only = ('uuid',)
 
     # employee`s date of birth
     birth_date = fields.DateTime(format='%Y-%m-%d')
@@ -71,3 +74,12 @@ class EmployeeSchema(ma.SQLAlchemyAutoSchema):
             return f"{employee.department.uuid}"
         except AttributeError:
             return 'Not added'
+
+
+# pylint: disable=too-many-ancestors
+class EmployeeImportSchema(EmployeeSchema):
+    """
+    Deserialization schema of imported employee rows
+    """
+    # uuid of the department an employee works in, checked to be a string
+    department_uuid = fields.String(allow_none=True)
@@ -3,26 +3,67 @@ Department service module used to realize interaction with database, this module
 defines the following class:
 - DepartmentService which is a department serialization and deserialization schema
 """
-from typing import List
+from typing import Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 from department_app.extensions import db
 from department_app.models.department import DepartmentModel
+from department_app.models.department_stats import DepartmentStatsModel
+from department_app.models.employee import EmployeeModel
+from department_app.models.types import parse_uuid
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.errors import constraint_errors
+from department_app.service.partial_update import update_and_fetch
+from department_app.service.table_version import TableVersionService
+
+DEPARTMENT_TABLE = DepartmentModel.__table__
+STATS_TABLE = DepartmentStatsModel.__table__
+EMPLOYEE_TABLE = EmployeeModel.__table__
+# columns of a department returned by a partial update
+PATCH_COLUMNS = (DEPARTMENT_TABLE.c.id, DEPARTMENT_TABLE.c.uuid, DEPARTMENT_TABLE.c.name,
+                 DEPARTMENT_TABLE.c.description)
 
 
 class DepartmentService:
     """
     Department service used to make database queries.
     """
+    @staticmethod
+    def _query(columns=None):
+        """
+        Builds a department query loading only given columns.
+        :param columns: names of department columns to load, all of them if not given
+        :return: department query
+        """
+        query = db.session.query(DepartmentModel)
+        if columns is not None:
+            query = query.options(load_only(*columns))
+        return query
+
     @classmethod
-    def find_by_uuid(cls, uuid):
+    @db.read_only
+    def find_by_uuid(cls, uuid, with_employees=True, columns=None):
         """
-        Fetches the department by given uuid from database.
+        Fetches the department by given uuid from database. Employees of the
+        department are joined into the same query unless they are not needed.
         :param uuid: department`s uuid
-        :return: department with given uuid
+        :param with_employees: whether to eagerly load department employees
+        :param columns: names of department columns to load, all of them if not given
+        :return: department with given uuid or None if it does not exist or the uuid
+        is not valid
         """
-        return db.session.query(DepartmentModel).filter_by(uuid=uuid).first()
+        uuid = parse_uuid(uuid)
+        if uuid is None:
+            return None
+        query = cls._query(columns)
+        if with_employees:
+            query = query.options(joinedload(DepartmentModel.employees))
+        return query.filter_by(uuid=uuid).first()
 
     @classmethod
+    @db.read_only
     def find_by_name(cls, name):
         """
         Fetches the department by given name from database.
@@ -32,40 +73,120 @@ class DepartmentService:
         return db.session.query(DepartmentModel).filter_by(name=name).first()
 
     @classmethod
-    def find_all(cls) -> List[DepartmentModel]:
+    @db.read_only
+    def find_all(cls, with_employees=True, columns=None) -> List[DepartmentModel]:
         """
-        Fetches all the departments from database.
+        Fetches all the departments from database together with their
+        employees, which are loaded by a single additional IN query.
+        :param with_employees: whether to eagerly load department employees
+        :param columns: names of department columns to load, all of them if not given
         :return: list of all the departments
         """
-        return db.session.query(DepartmentModel).all()
+        query = cls._query(columns)
+        if with_employees:
+            query = query.options(selectinload(DepartmentModel.employees))
+        return query.all()
 
+    @classmethod
+    @db.read_only
+    def find_page(cls, limit, after_id=None, with_employees=True,
+                  columns=None) -> List[DepartmentModel]:
+        """
+        Fetches a page of departments ordered by primary key together with
+        their employees. Departments are seeked by id instead of offset.
+        :param limit: maximum number of departments
+        :param after_id: id of the last department on the previous page
+        :param with_employees: whether to eagerly load department employees
+        :param columns: names of department columns to load, all of them if not given
+        :return: list of the departments
+        """
+        query = cls._query(columns)
+        if with_employees:
+            query = query.options(selectinload(DepartmentModel.employees))
+        if after_id is not None:
+            query = query.filter(DepartmentModel.id > after_id)
+        return query.order_by(DepartmentModel.id).limit(limit).all()
 
     @classmethod
     def save_to_db(cls, department_object):
         """
         Saves provided department in database.
         :param department_object: given department
+        :raises ConflictError: if the department violates a unique constraint
+        :raises ConstraintError: if the department violates another constraint
         """
-        db.session.add(department_object)
-        db.session.commit()
+        with constraint_errors():
+            db.session.add(department_object)
+            db.session.commit()
 
     @classmethod
     def update_in_db(cls):
         """
         Updates given department in the database and
         saves changes.
+        :raises ConflictError: if the department violates a unique constraint
+        :raises ConstraintError: if the department violates another constraint
         """
-        db.session.commit()
+        with constraint_errors():
+            db.session.commit()
+
+    @classmethod
+    def patch(cls, uuid, changes):
+        """
+        Updates only the given columns of the department with given uuid by a single
+        UPDATE statement, without loading the department and its employees.
+        :param uuid: department`s uuid
+        :param changes: dict of new name and description values
+        :return: updated department row with id, uuid, name and description or None
+        if department with such uuid does not exist
+        :raises ConflictError: if the new name belongs to another department
+        """
+        uuid = parse_uuid(uuid)
+        if uuid is None:
+            return None
+        with constraint_errors():
+            row = update_and_fetch(DEPARTMENT_TABLE, DEPARTMENT_TABLE.c.uuid == uuid,
+                                   changes, PATCH_COLUMNS)
+            if row is not None and changes:
+                TableVersionService.bump(db.session.connection(), ['department'])
+            db.session.commit()
+        return row
 
     @classmethod
     def delete_from_db(cls, department_object):
         """
-        Deletes provided department from database.
+        Deletes provided department from database, its employees are deleted
+        by the database unless they have been loaded.
         :param department_object: given department
         """
         db.session.delete(department_object)
         db.session.commit()
 
+    @classmethod
+    def delete_in_chunks(cls, department_id, chunk_size=1000):
+        """
+        Deletes employees of the department chunk by chunk, every chunk in its own
+        transaction, so that locks are held briefly, and then deletes the department
+        with its statistics. Statistics are not updated while employees are deleted.
+        :param department_id: id of the department
+        :param chunk_size: number of employees deleted by a transaction
+        """
+        while True:
+            ids = db.session.execute(select(EMPLOYEE_TABLE.c.id).where(
+                EMPLOYEE_TABLE.c.department_id == department_id
+            ).limit(chunk_size)).scalars().all()
+            if not ids:
+                break
+            connection = db.session.connection()
+            connection.execute(EMPLOYEE_TABLE.delete().where(EMPLOYEE_TABLE.c.id.in_(ids)))
+            TableVersionService.bump(connection, ['employee'])
+            db.session.commit()
+        connection = db.session.connection()
+        connection.execute(STATS_TABLE.delete().where(STATS_TABLE.c.department_id == department_id))
+        connection.execute(DEPARTMENT_TABLE.delete().where(DEPARTMENT_TABLE.c.id == department_id))
+        TableVersionService.bump(connection, ['department'])
+        db.session.commit()
+
     @classmethod
     def find_employees_count(cls, department_object):
         """
@@ -106,3 +227,59 @@ class DepartmentService:
                                  ) / employees_count))
         except ZeroDivisionError:
             return 0
+
+    @classmethod
+    @db.read_only
+    def load_employees_stats(cls, departments, all_departments=True):
+        """
+        Attaches employees statistics maintained in the department_stats table to the
+        given saved departments, so that they are not calculated from the loaded
+        employees one by one.
+        :param departments: list of departments
+        :param all_departments: whether given departments are all the departments
+        :return: list of departments with statistics
+        """
+        if all_departments:
+            stats = DepartmentStatsService.find_by_department_ids()
+        else:
+            stats = DepartmentStatsService.find_by_department_ids(
+                [department.id for department in departments if department.id is not None])
+        for department in departments:
+            if department.id is None:
+                continue
+            department_stats = stats.get(department.id)
+            if department_stats is None:
+                department.stats = DepartmentStatsService.employees_stats(0, 0, 0)
+            else:
+                department.stats = DepartmentStatsService.employees_stats(
+                    department_stats.headcount, department_stats.salary_sum,
+                    department_stats.birth_year_sum)
+        return departments
+
+    @classmethod
+    @db.read_only
+    def iter_export(cls, batch_size=1000) -> Iterator[dict]:
+        """
+        Streams all the departments with employees statistics joined from the
+        department_stats table. Rows are read from a server-side cursor batch by batch,
+        so memory use does not depend on the table size.
+        :param batch_size: number of rows fetched from the cursor at once
+        :return: generator of department representations
+        """
+        query = select(
+            DEPARTMENT_TABLE.c.uuid, DEPARTMENT_TABLE.c.name, DEPARTMENT_TABLE.c.description,
+            STATS_TABLE.c.headcount, STATS_TABLE.c.salary_sum, STATS_TABLE.c.birth_year_sum
+        ).select_from(DEPARTMENT_TABLE.outerjoin(
+            STATS_TABLE, DEPARTMENT_TABLE.c.id == STATS_TABLE.c.department_id
+        )).order_by(DEPARTMENT_TABLE.c.id).execution_options(stream_results=True)
+        result = db.session.execute(query)
+        for rows in result.partitions(batch_size):
+            for row in rows:
+                department = {
+                    'uuid': row.uuid,
+                    'name': row.name,
+                    'description': row.description
+                }
+                department.update(DepartmentStatsService.employees_stats(
+                    row.headcount, row.salary_sum, row.birth_year_sum))
+                yield department
@@ -0,0 +1,289 @@
+"""
+Department statistics service module used to maintain the department_stats rollup
+table, this module defines the following class:
+- DepartmentStatsService which keeps statistics of department employees up to date
+"""
+from datetime import date
+
+from sqlalchemy import case, event, extract, func, or_, select
+from sqlalchemy.orm import attributes
+
+from department_app.extensions import db
+from department_app.models.department import DepartmentModel
+from department_app.models.department_stats import DepartmentStatsModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.upsert import insert_or_update
+
+STATS_TABLE = DepartmentStatsModel.__table__
+EMPLOYEE_TABLE = EmployeeModel.__table__
+# statistics columns compared by the consistency check
+STATS_COLUMNS = ('headcount', 'salary_sum', 'salary_min', 'salary_max', 'birth_year_sum')
+# key of the session info used to pass employee changes from before to after flush
+CHANGES_KEY = 'department_stats_changes'
+# attributes of an employee which affect department statistics
+TRACKED_ATTRIBUTES = ('salary', 'birth_date', 'department_id', 'department')
+
+
+class DepartmentStatsService:
+    """
+    Department statistics service used to make database queries.
+    """
+    @classmethod
+    @db.read_only
+    def find_by_department_ids(cls, department_ids=None):
+        """
+        Fetches statistics of the given or of all the departments from database.
+        :param department_ids: ids of departments, all departments when None
+        :return: dictionary of statistics by department id
+        """
+        query = db.session.query(DepartmentStatsModel)
+        if department_ids is not None:
+            query = query.filter(STATS_TABLE.c.department_id.in_(department_ids))
+        return {stats.department_id: stats for stats in query.all()}
+
+    @staticmethod
+    def employees_stats(headcount, salary_sum, birth_year_sum):
+        """
+        Converts stored department statistics to the number, average salary
+        and average age of employees.
+        :param headcount: number of employees
+        :param salary_sum: sum of salaries of employees
+        :param birth_year_sum: sum of birth years of employees
+        :return: dictionary of employees statistics
+        """
+        if not headcount:
+            return {'employees_count': 0, 'average_salary': 0, 'employees_average_age': 0}
+        return {
+            'employees_count': headcount,
+            'average_salary': round(salary_sum / headcount, 1),
+            'employees_average_age': int(round(date.today().year - birth_year_sum / headcount))
+        }
+
+    @classmethod
+    def aggregate_query(cls, department_id=None):
+        """
+        Builds a query calculating statistics from the employee table grouped by department.
+        :param department_id: id of the department to limit calculation to
+        :return: select statement
+        """
+        query = select(
+            EMPLOYEE_TABLE.c.department_id,
+            func.count(EMPLOYEE_TABLE.c.id).label('headcount'),
+            func.sum(EMPLOYEE_TABLE.c.salary).label('salary_sum'),
+            func.min(EMPLOYEE_TABLE.c.salary).label('salary_min'),
+            func.max(EMPLOYEE_TABLE.c.salary).label('salary_max'),
+            func.sum(extract('year', EMPLOYEE_TABLE.c.birth_date)).label('birth_year_sum')
+        )
+        if department_id is None:
+            query = query.where(EMPLOYEE_TABLE.c.department_id.isnot(None))
+        else:
+            query = query.where(EMPLOYEE_TABLE.c.department_id == department_id)
+        return query.group_by(EMPLOYEE_TABLE.c.department_id)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recalculates statistics of all the departments from the employee table
+        and replaces the stored ones.
+        :return: number of departments with statistics
+        """
+        db.session.execute(STATS_TABLE.delete())
+        db.session.execute(STATS_TABLE.insert().from_select(
+            ('department_id',) + STATS_COLUMNS, cls.aggregate_query()))
+        db.session.commit()
+        return db.session.query(DepartmentStatsModel).count()
+
+    @classmethod
+    def check_consistency(cls):
+        """
+        Compares stored statistics with statistics recalculated from the employee table.
+        :return: list of differences, each one is a tuple of department id, column name,
+        stored and expected values
+        """
+        stored = {row['department_id']: row
+                  for row in db.session.execute(select(STATS_TABLE)).mappings()}
+        expected = {row['department_id']: row
+                    for row in db.session.execute(cls.aggregate_query()).mappings()}
+        differences = []
+        for department_id in sorted(set(stored) | set(expected)):
+            for column in STATS_COLUMNS:
+                stored_value = cls._value(stored.get(department_id), column)
+                expected_value = cls._value(expected.get(department_id), column)
+                if stored_value != expected_value:
+                    differences.append((department_id, column, stored_value, expected_value))
+        return differences
+
+    @staticmethod
+    def _value(row, column):
+        """
+        Returns a statistics value of a row, empty statistics are treated as zero headcount.
+        :param row: statistics row or None
+        :param column: column name
+        :return: value of the column
+        """
+        if row is None or not row['headcount']:
+            return None if column in ('salary_min', 'salary_max') else 0
+        return int(row[column])
+
+    @classmethod
+    def collect_changes(cls, session, flush_context, instances):
+        """
+        Collects changes of employees which affect department statistics before
+        the session is flushed, while previous values are still stored in database.
+        :param session: flushed session
+        """
+        # pylint: disable=unused-argument
+        changes = session.info[CHANGES_KEY] = []
+        changed = [instance for instance in session.dirty
+                   if isinstance(instance, EmployeeModel) and any(
+                       attributes.get_history(
+                           instance, key, attributes.PASSIVE_NO_INITIALIZE).has_changes()
+                       for key in TRACKED_ATTRIBUTES)]
+        removed = [instance for instance in session.deleted if isinstance(instance, EmployeeModel)]
+        changes.extend(cls._stored_states(session, changed + removed))
+        changes.extend(cls._current_state(instance) for instance in changed)
+        changes.extend(cls._current_state(instance) for instance in session.new
+                       if isinstance(instance, EmployeeModel))
+
+    @staticmethod
+    def _current_state(employee):
+        """
+        Returns statistics change adding the current state of an employee.
+        :param employee: employee object
+        :return: sign, department or its id, salary and birth year
+        """
+        history = attributes.get_history(
+            employee, 'department', attributes.PASSIVE_NO_INITIALIZE)
+        department = history.added[0] if history.added else employee.department_id
+        return 1, department, employee.salary, employee.birth_date.year
+
+    @staticmethod
+    def _stored_states(session, employees):
+        """
+        Returns statistics changes removing the stored states of employees, which
+        are selected from database by a single query.
+        :param session: flushed session
+        :param employees: list of changed or deleted employees
+        :return: list of sign, department id, salary and birth year
+        """
+        ids = [attributes.instance_state(employee).identity[0] for employee in employees
+               if attributes.instance_state(employee).has_identity]
+        if not ids:
+            return []
+        rows = session.connection().execute(select(
+            EMPLOYEE_TABLE.c.department_id, EMPLOYEE_TABLE.c.salary, EMPLOYEE_TABLE.c.birth_date
+        ).where(EMPLOYEE_TABLE.c.id.in_(ids)))
+        return [(-1, row.department_id, row.salary, row.birth_date.year) for row in rows]
+
+    @classmethod
+    def apply_changes(cls, session, flush_context):
+        """
+        Applies collected employee changes to department statistics after the session
+        is flushed, in the same transaction, when ids of new departments are known.
+        :param session: flushed session
+        """
+        # pylint: disable=unused-argument
+        changes = session.info.pop(CHANGES_KEY, [])
+        deleted_ids = {instance.id for instance in session.deleted
+                       if isinstance(instance, DepartmentModel)}
+        connection = session.connection()
+        if deleted_ids:
+            connection.execute(
+                STATS_TABLE.delete().where(STATS_TABLE.c.department_id.in_(deleted_ids)))
+        cls.apply_deltas(connection, changes, deleted_ids)
+
+    @classmethod
+    def apply_deltas(cls, connection, changes, deleted_ids=frozenset()):
+        """
+        Accumulates employee changes by department and applies them to department
+        statistics. Used directly by bulk writes which bypass the session.
+        :param connection: connection of the current transaction
+        :param changes: list of sign, department or its id, salary and birth year
+        :param deleted_ids: ids of deleted departments to skip
+        """
+        deltas = {}
+        for sign, department, salary, birth_year in changes:
+            department_id = department.id if isinstance(department, DepartmentModel) \
+                else department
+            if department_id is None or department_id in deleted_ids:
+                continue
+            delta = deltas.setdefault(department_id, {
+                'headcount': 0, 'salary_sum': 0, 'birth_year_sum': 0,
+                'added': [], 'removed': []})
+            delta['headcount'] += sign
+            delta['salary_sum'] += sign * salary
+            delta['birth_year_sum'] += sign * birth_year
+            delta['added' if sign > 0 else 'removed'].append(salary)
+        for department_id, delta in deltas.items():
+            cls._apply_delta(connection, department_id, delta)
+
+    @classmethod
+    def _apply_delta(cls, connection, department_id, delta):
+        """
+        Updates statistics of a single department by the given delta. Minimal and
+        maximal salaries are recalculated only when a removed salary was one of them.
+        :param connection: connection of the flushed session
+        :param department_id: id of the department
+        :param delta: accumulated changes of the department
+        """
+        where = STATS_TABLE.c.department_id == department_id
+        row = cls._find_for_update(connection, where)
+        if row is None or any(salary in (row.salary_min, row.salary_max)
+                              for salary in delta['removed']):
+            recalculated = connection.execute(
+                cls.aggregate_query(department_id)).mappings().first()
+            values = {column: recalculated[column] if recalculated else None
+                      for column in STATS_COLUMNS}
+            values['headcount'] = values['headcount'] or 0
+            values['salary_sum'] = values['salary_sum'] or 0
+            values['birth_year_sum'] = values['birth_year_sum'] or 0
+        else:
+            salaries = [row.salary_min, row.salary_max] + delta['added']
+            salaries = [salary for salary in salaries if salary is not None]
+            values = {
+                'headcount': row.headcount + delta['headcount'],
+                'salary_sum': row.salary_sum + delta['salary_sum'],
+                'birth_year_sum': row.birth_year_sum + delta['birth_year_sum'],
+                'salary_min': min(salaries, default=None),
+                'salary_max': max(salaries, default=None)
+            }
+        if row is None:
+            # statistics inserted meanwhile by a concurrent transaction get the delta
+            insert_or_update(connection, STATS_TABLE, dict(values, department_id=department_id),
+                             ['department_id'], cls._merged_values(delta, values))
+        else:
+            connection.execute(STATS_TABLE.update().where(where).values(**values))
+
+    @staticmethod
+    def _find_for_update(connection, where):
+        """
+        Selects stored statistics of a department and locks them until the end of
+        the transaction.
+        :param connection: connection of the flushed session
+        :param where: condition selecting the statistics
+        :return: statistics row or None if the department has no statistics
+        """
+        return connection.execute(select(STATS_TABLE).where(where).with_for_update()).first()
+
+    @staticmethod
+    def _merged_values(delta, values):
+        """
+        Returns expressions adding the delta to statistics of a department inserted by
+        a concurrent transaction. Minimal and maximal salaries are combined with the
+        ones recalculated by this transaction.
+        :param delta: accumulated changes of the department
+        :param values: recalculated statistics of the department
+        :return: dict of column expressions
+        """
+        merged = {column: STATS_TABLE.c[column] + delta[column]
+                  for column in ('headcount', 'salary_sum', 'birth_year_sum')}
+        for column, replaces in (('salary_min', STATS_TABLE.c.salary_min.__gt__),
+                                 ('salary_max', STATS_TABLE.c.salary_max.__lt__)):
+            stored, recalculated = STATS_TABLE.c[column], values[column]
+            merged[column] = stored if recalculated is None else case(
+                (or_(stored.is_(None), replaces(recalculated)), recalculated), else_=stored)
+        return merged
+
+
+event.listen(db.session, 'before_flush', DepartmentStatsService.collect_changes)
+event.listen(db.session, 'after_flush', DepartmentStatsService.apply_changes)
@@ -3,11 +3,42 @@ Employee service module used to realize interaction with database, this module
 defines the following class:
 - EmployeeService which is an employee serialization and deserialization schema
 """
-from typing import List
-from sqlalchemy import and_
+from datetime import date as current_date
+from typing import Iterator, List
+from sqlalchemy import and_, select
+from sqlalchemy.orm import joinedload
 
 from department_app.extensions import db
+from department_app.models.department import DepartmentModel
 from department_app.models.employee import EmployeeModel
+from department_app.models.types import parse_uuid
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.errors import ConstraintError, constraint_errors
+from department_app.service.partial_update import update_and_fetch
+from department_app.service.table_version import TableVersionService
+
+EMPLOYEE_TABLE = EmployeeModel.__table__
+DEPARTMENT_TABLE = DepartmentModel.__table__
+# changes of an employee which affect department statistics
+STATS_CHANGES = ('salary', 'birth_date', 'department_uuid')
+
+
+def _department_column(column, label):
+    """
+    Builds a subquery of a column of the department an employee works in.
+    :param column: department column
+    :param label: label of the subquery
+    :return: labeled scalar subquery
+    """
+    return select(column).where(
+        DEPARTMENT_TABLE.c.id == EMPLOYEE_TABLE.c.department_id).scalar_subquery().label(label)
+
+
+# columns of an employee returned by a partial update
+PATCH_COLUMNS = (EMPLOYEE_TABLE.c.uuid, EMPLOYEE_TABLE.c.name, EMPLOYEE_TABLE.c.birth_date,
+                 EMPLOYEE_TABLE.c.salary, EMPLOYEE_TABLE.c.department_id,
+                 _department_column(DEPARTMENT_TABLE.c.name, 'department'),
+                 _department_column(DEPARTMENT_TABLE.c.uuid, 'department_uuid'))
 
 
 class EmployeeService:
@@ -15,30 +46,59 @@ class EmployeeService:
     Employee service used to make database queries.
     """
     @classmethod
+    @db.read_only
     def find_by_uuid(cls, uuid):
         """
-        Fetches an employee by given uuid from the database.
+        Fetches an employee by given uuid from the database together
+        with the department an employee works in.
         :param uuid: employee`s uuid
-        :return: employee with given uuid
+        :return: employee with given uuid or None if it does not exist or the uuid
+        is not valid
         """
-        return db.session.query(EmployeeModel).filter_by(uuid=uuid).first()
+        uuid = parse_uuid(uuid)
+        if uuid is None:
+            return None
+        return db.session.query(EmployeeModel).options(
+            joinedload(EmployeeModel.department)).filter_by(uuid=uuid).first()
 
     @classmethod
+    @db.read_only
     def find_all(cls) -> List[EmployeeModel]:
         """
-        Fetches all the employees from the database.
+        Fetches all the employees from the database with their departments
+        joined into the same query.
         :return: list of all the employees
         """
-        return db.session.query(EmployeeModel).all()
+        return db.session.query(EmployeeModel).options(
+            joinedload(EmployeeModel.department)).all()
+
+    @classmethod
+    @db.read_only
+    def find_page(cls, limit, after_id=None) -> List[EmployeeModel]:
+        """
+        Fetches a page of employees ordered by primary key with their departments
+        joined into the same query. Employees are seeked by id instead of offset.
+        :param limit: maximum number of employees
+        :param after_id: id of the last employee on the previous page
+        :return: list of the employees
+        """
+        query = db.session.query(EmployeeModel).options(
+            joinedload(EmployeeModel.department))
+        if after_id is not None:
+            query = query.filter(EmployeeModel.id > after_id)
+        return query.order_by(EmployeeModel.id).limit(limit).all()
 
     @classmethod
     def save_to_db(cls, employee_object):
         """
         Saves provided employee in the database.
         :param employee_object: given employee
+        :raises ConflictError: if the employee violates a unique constraint
+        :raises ConstraintError: if the employee violates another constraint
         """
-        db.session.add(employee_object)
-        db.session.commit()
+        with constraint_errors():
+            db.session.add(employee_object)
+            db.session.commit()
 
     @classmethod
     def delete_from_db(cls, employee_object):
@@ -53,31 +113,146 @@ class EmployeeService:
     def update_in_db(cls):
         """
         Updates given employee in the database and saves changes.
+        :raises ConflictError: if the employee violates a unique constraint
+        :raises ConstraintError: if the employee violates another constraint
         """
-        db.session.commit()
+        with constraint_errors():
+            db.session.commit()
+
+    @classmethod
+    def patch(cls, uuid, changes):
+        """
+        Updates only the given columns of the employee with given uuid by a single
+        UPDATE statement. The stored state of the employee is selected beforehand only
+        when department statistics are affected by the changes.
+        :param uuid: employee`s uuid
+        :param changes: dict of new name, birth_date, salary or department_uuid values,
+        None department_uuid removes the employee from a department
+        :return: representation of the updated employee and uuid of the department it
+        worked in before, or None if employee with such uuid does not exist
+        :raises ConstraintError: if the new department does not exist
+        """
+        uuid = parse_uuid(uuid)
+        if uuid is None:
+            return None
+        values = dict(changes)
+        previous = None
+        where = EMPLOYEE_TABLE.c.uuid == uuid
+        with constraint_errors():
+            if any(key in values for key in STATS_CHANGES):
+                department_uuid = values.pop('department_uuid', None)
+                previous = cls._find_stored_state(where, parse_uuid(department_uuid))
+                if previous is None:
+                    db.session.rollback()
+                    return None
+                if 'department_uuid' in changes:
+                    if department_uuid and previous.new_department_id is None:
+                        db.session.rollback()
+                        raise ConstraintError(f'Department {department_uuid} not found.')
+                    values['department_id'] = previous.new_department_id
+            row = update_and_fetch(EMPLOYEE_TABLE, where, values, PATCH_COLUMNS)
+            if row is None:
+                db.session.rollback()
+                return None
+            connection = db.session.connection()
+            if previous is not None:
+                DepartmentStatsService.apply_deltas(connection, [
+                    (-1, previous.department_id, previous.salary, previous.birth_date.year),
+                    (1, row.department_id, row.salary, row.birth_date.year)])
+            if values:
+                TableVersionService.bump(connection, ['employee'])
+            db.session.commit()
+        previous_department_uuid = previous.department_uuid if previous else row.department_uuid
+        return cls._representation(row, current_date.today().year), previous_department_uuid
+
+    @staticmethod
+    def _find_stored_state(where, department_uuid):
+        """
+        Selects the stored state of an employee for update together with id of
+        the department the employee moves to.
+        :param where: condition selecting the employee
+        :param department_uuid: valid uuid of the new department of the employee or None
+        :return: row with department_id, department_uuid, salary, birth_date and
+        new_department_id or None if the employee does not exist
+        """
+        return db.session.execute(select(
+            EMPLOYEE_TABLE.c.department_id, EMPLOYEE_TABLE.c.salary, EMPLOYEE_TABLE.c.birth_date,
+            _department_column(DEPARTMENT_TABLE.c.uuid, 'department_uuid'),
+            select(DEPARTMENT_TABLE.c.id).where(
+                DEPARTMENT_TABLE.c.uuid == department_uuid
+            ).scalar_subquery().label('new_department_id')
+        ).where(where).with_for_update()).first()
 
     @classmethod
+    @db.read_only
     def find_by_birth_date(cls, date) -> List[EmployeeModel]:
         """
-        Returns a list of all the employees born on a specific date.
+        Returns a list of all the employees born on a specific date
+        ordered by the birth date index.
         :param date: given date of birth
         :return: list of found employees
         """
-        employees = db.session.query(EmployeeModel).filter_by(birth_date=date).all()
+        employees = db.session.query(EmployeeModel).options(
+            joinedload(EmployeeModel.department)).filter_by(birth_date=date).order_by(
+            EmployeeModel.birth_date, EmployeeModel.id).all()
         return employees
 
     @classmethod
+    @db.read_only
     def find_by_birth_period(cls, start_date, end_date) -> List[EmployeeModel]:
         """
-        Returns a list of all the employees born in a period between dates.
+        Returns a list of all the employees born in a period between dates
+        ordered by the birth date index.
         :param start_date: start date of birth
         :param end_date: end date of birth
         :return: list of found employees
         """
         employees = db.session.query(
-            EmployeeModel).filter(
+            EmployeeModel).options(
+            joinedload(EmployeeModel.department)).filter(
             and_(EmployeeModel.birth_date > start_date,
                  EmployeeModel.birth_date < end_date
                  )
-        ).all()
+        ).order_by(EmployeeModel.birth_date, EmployeeModel.id).all()
         return employees
+
+    @classmethod
+    @db.read_only
+    def iter_export(cls, batch_size=1000) -> Iterator[dict]:
+        """
+        Streams all the employees with names and uuids of their departments joined in
+        the same query. Rows are read from a server-side cursor batch by batch without
+        building model objects, so memory use does not depend on the table size.
+        :param batch_size: number of rows fetched from the cursor at once
+        :return: generator of employee representations
+        """
+        current_year = current_date.today().year
+        query = select(
+            EMPLOYEE_TABLE.c.uuid, EMPLOYEE_TABLE.c.name, EMPLOYEE_TABLE.c.birth_date,
+            EMPLOYEE_TABLE.c.salary, DEPARTMENT_TABLE.c.name.label('department'),
+            DEPARTMENT_TABLE.c.uuid.label('department_uuid')
+        ).select_from(EMPLOYEE_TABLE.outerjoin(
+            DEPARTMENT_TABLE, EMPLOYEE_TABLE.c.department_id == DEPARTMENT_TABLE.c.id
+        )).order_by(EMPLOYEE_TABLE.c.id).execution_options(stream_results=True)
+        result = db.session.execute(query)
+        for rows in result.partitions(batch_size):
+            for row in rows:
+                yield cls._representation(row, current_year)
+
+    @staticmethod
+    def _representation(row, current_year):
+        """
+        Builds a representation of an employee row joined with its department.
+        :param row: employee row with department name and uuid
+        :param current_year: year the age is calculated in
+        :return: employee representation
+        """
+        return {
+            'uuid': row.uuid,
+            'name': row.name,
+            'birth_date': row.birth_date.strftime('%Y-%m-%d'),
+            'salary': row.salary,
+            'age': current_year - row.birth_date.year,
+            'department': row.department or 'Not added',
+            'department_uuid': row.department_uuid or 'Not added'
+        }
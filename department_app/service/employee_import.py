@@ -0,0 +1,245 @@
+"""
+Employee import service module used to create employees in bulk, this module
+defines the following classes:
+- ImportFormatError raised when an input can not be parsed at all
+- EmployeeImportService which parses, validates and inserts employees in batches
+"""
+import csv
+import json
+import uuid
+from itertools import islice
+
+from marshmallow import ValidationError
+from sqlalchemy import select
+
+from department_app.extensions import db
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.models.types import parse_uuid
+from department_app.schemas.employee import EmployeeImportSchema
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.errors import ConflictError, ConstraintError, constraint_errors
+from department_app.service.table_version import TableVersionService
+
+EMPLOYEE_TABLE = EmployeeModel.__table__
+DEPARTMENT_TABLE = DepartmentModel.__table__
+# supported input formats
+FORMATS = ('csv', 'ndjson')
+
+employee_import_schema = EmployeeImportSchema(load_instance=False)
+
+
+class ImportFormatError(Exception):
+    """
+    Error of an input which can not be parsed, such as a csv header which is not valid.
+    """
+
+
+def check_text(values):
+    """
+    Checks whether the values decoded with surrogateescape are valid utf-8 text
+    without nul characters.
+    :param values: iterable of strings or None
+    :return: error message or None if the values are valid
+    """
+    for value in values:
+        if not value:
+            continue
+        if '\x00' in value:
+            return 'Not valid csv: line contains NUL.'
+        if any('\udc80' <= char <= '\udcff' for char in value):
+            return 'Not valid utf-8.'
+    return None
+
+
+class EmployeeImportService:
+    """
+    Employee import service used to insert employees in batches.
+    """
+    @classmethod
+    def parse(cls, stream, input_format):
+        """
+        Lazily parses a binary stream of employees in the given format.
+        :param stream: binary stream of csv or ndjson data
+        :param input_format: 'csv' or 'ndjson'
+        :return: generator of line numbers and employee data or parsing errors
+        """
+        if input_format == 'csv':
+            return cls.parse_csv(line.decode('utf-8', 'surrogateescape') for line in stream)
+        return cls.parse_ndjson(stream)
+
+    @staticmethod
+    def parse_csv(lines):
+        """
+        Lazily parses csv lines with a header row, rows which are malformed or not
+        valid utf-8 are reported as parsing errors.
+        :param lines: iterable of text lines, with bytes which are not valid utf-8
+        escaped by surrogateescape
+        :return: generator of line numbers and employee data or parsing errors
+        :raise ImportFormatError: if the header row can not be parsed
+        """
+        line_number = 0
+
+        def count_lines():
+            nonlocal line_number
+            for line in lines:
+                line_number += 1
+                yield line
+
+        reader = csv.DictReader(count_lines())
+        try:
+            fieldnames = reader.fieldnames
+        except csv.Error as error:
+            raise ImportFormatError(f'Not valid csv header: {error}.') from error
+        message = check_text(fieldnames or ())
+        if message:
+            raise ImportFormatError(f'Not valid csv header. {message}')
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                yield line_number, ValidationError(f'Not valid csv: {error}.')
+                continue
+            if None in row:
+                row = ValidationError('Too many values.')
+            else:
+                message = check_text(row.values())
+                if message:
+                    row = ValidationError(message)
+            yield line_number, row
+
+    @staticmethod
+    def parse_ndjson(lines):
+        """
+        Lazily parses newline delimited json lines, blank lines are skipped.
+        :param lines: iterable of utf-8 encoded lines
+        :return: generator of line numbers and employee data or parsing errors
+        """
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                yield line_number, ValidationError('Not valid utf-8.')
+                continue
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, ValidationError('Not valid json.')
+                continue
+            if not isinstance(row, dict):
+                row = ValidationError('Json object expected.')
+            yield line_number, row
+
+    @classmethod
+    def import_rows(cls, rows, batch_size=1000):
+        """
+        Validates and inserts employees batch by batch, every batch is committed
+        in its own transaction. Invalid rows are skipped and reported, all the rows
+        of a batch which violates a database constraint are reported as well.
+        :param rows: iterable of line numbers and employee data
+        :param batch_size: number of rows in a batch
+        :return: report with a number of imported employees and errors by line
+        :raise ImportFormatError: if the input can not be parsed
+        """
+        report = {'imported': 0, 'failed': 0, 'errors': []}
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return report
+            employees, errors = cls._validate_batch(batch)
+            if employees:
+                try:
+                    cls._insert_batch([employee for _, employee in employees])
+                except (ConflictError, ConstraintError):
+                    errors.extend({'line': line_number, 'messages': {'_schema': [
+                        'Batch violates a database constraint, no employees inserted.']}}
+                        for line_number, _ in employees)
+                    errors.sort(key=lambda error: error['line'])
+                    employees = []
+            report['imported'] += len(employees)
+            report['failed'] += len(errors)
+            report['errors'].extend(errors)
+
+    @classmethod
+    def _validate_batch(cls, batch):
+        """
+        Validates rows of a batch and resolves their departments by a single query.
+        :param batch: list of line numbers and employee data
+        :return: list of line numbers and employee rows ready to insert and list of errors
+        """
+        loaded, errors = [], []
+        for line_number, row in batch:
+            if isinstance(row, ValidationError):
+                errors.append({'line': line_number, 'messages': row.messages})
+                continue
+            try:
+                data = employee_import_schema.load(row)
+            except ValidationError as error:
+                errors.append({'line': line_number, 'messages': error.messages})
+                continue
+            if data['name'].isspace():
+                errors.append({'line': line_number, 'messages': {
+                    'name': ['Employee name should not contain only whitespaces.']}})
+                continue
+            department_uuid = data.pop('department_uuid', None) or None
+            loaded.append((line_number, data, department_uuid))
+        department_ids = cls._find_department_ids(
+            {department_uuid for _, _, department_uuid in loaded if department_uuid})
+        employees = []
+        for line_number, data, department_uuid in loaded:
+            if department_uuid and department_uuid not in department_ids:
+                errors.append({'line': line_number,
+                               'messages': {'department_uuid': ['Department not found.']}})
+                continue
+            employees.append((line_number, {
+                'name': data['name'],
+                'birth_date': data['birth_date'],
+                'salary': data['salary'],
+                'uuid': str(uuid.uuid4()),
+                'department_id': department_ids.get(department_uuid)
+            }))
+        errors.sort(key=lambda error: error['line'])
+        return employees, errors
+
+    @staticmethod
+    def _find_department_ids(department_uuids):
+        """
+        Fetches ids of the departments with given uuids.
+        :param department_uuids: set of department uuids
+        :return: dictionary of department ids by uuid, uuids which are not valid are
+        not found
+        """
+        canonical = {department_uuid: parse_uuid(department_uuid)
+                     for department_uuid in department_uuids}
+        valid = {value for value in canonical.values() if value is not None}
+        if not valid:
+            return {}
+        ids = dict(db.session.execute(
+            select(DEPARTMENT_TABLE.c.uuid, DEPARTMENT_TABLE.c.id).where(
+                DEPARTMENT_TABLE.c.uuid.in_(valid))).all())
+        return {department_uuid: ids[value] for department_uuid, value in canonical.items()
+                if value in ids}
+
+    @staticmethod
+    def _insert_batch(employees):
+        """
+        Inserts employees by a single executemany statement, updates department
+        statistics and the employee table version and commits the transaction.
+        :param employees: list of employee rows
+        :raise ConflictError: if an employee conflicts with an existing one
+        :raise ConstraintError: if an employee violates another constraint, such as
+        a department deleted after the batch has been validated
+        """
+        with constraint_errors():
+            connection = db.session.connection()
+            connection.execute(EMPLOYEE_TABLE.insert(), employees)
+            DepartmentStatsService.apply_deltas(connection, [
+                (1, employee['department_id'], employee['salary'], employee['birth_date'].year)
+                for employee in employees])
+            TableVersionService.bump(connection, ['employee'])
+            db.session.commit()
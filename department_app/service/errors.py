@@ -0,0 +1,62 @@
+"""
+Service errors module used to translate database constraint violations, this module
+defines the following:
+- ConflictError raised when a write violates a unique constraint
+- ConstraintError raised when a write violates another constraint
+- constraint_errors context manager translating integrity errors of a write
+"""
+from contextlib import contextmanager
+
+from sqlalchemy.exc import IntegrityError
+
+from department_app.extensions import db
+
+# error codes of unique constraint violations: ER_DUP_ENTRY and
+# ER_DUP_ENTRY_WITH_KEY_NAME of MySQL, unique_violation of PostgreSQL
+MYSQL_DUPLICATE_CODES = (1062, 1586)
+POSTGRESQL_UNIQUE_VIOLATION = '23505'
+# message prefix of unique constraint violations of SQLite
+SQLITE_UNIQUE_VIOLATION = 'UNIQUE constraint failed'
+
+
+class ConflictError(Exception):
+    """
+    Error of a write conflicting with an existing row by a unique constraint.
+    """
+
+
+class ConstraintError(Exception):
+    """
+    Error of a write violating a foreign key, not null or check constraint.
+    """
+
+
+def is_unique_violation(error, dialect_name):
+    """
+    Checks whether an integrity error is a violation of a unique constraint.
+    :param error: integrity error raised by the database driver
+    :param dialect_name: name of the database dialect
+    :return: True if a unique constraint has been violated
+    """
+    orig = error.orig
+    if dialect_name == 'mysql':
+        return bool(orig.args) and orig.args[0] in MYSQL_DUPLICATE_CODES
+    if dialect_name == 'postgresql':
+        return getattr(orig, 'pgcode', None) == POSTGRESQL_UNIQUE_VIOLATION
+    return str(orig).startswith(SQLITE_UNIQUE_VIOLATION)
+
+
+@contextmanager
+def constraint_errors():
+    """
+    Rolls back the session and raises ConflictError or ConstraintError when a write
+    inside the block violates a database constraint, so that concurrent writes are
+    checked by the database itself instead of a preceding select.
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        db.session.rollback()
+        if is_unique_violation(error, db.engine.dialect.name):
+            raise ConflictError(str(error.orig)) from error
+        raise ConstraintError(str(error.orig)) from error
@@ -0,0 +1,30 @@
+"""
+Partial update module used by PATCH requests to write only changed columns, this
+module defines the following function:
+- update_and_fetch which updates a row by a single statement and returns its new state
+"""
+from sqlalchemy import select
+
+from department_app.extensions import db
+
+
+def update_and_fetch(table, where, values, columns):
+    """
+    Updates given columns of a row by a single UPDATE statement and returns the updated
+    row. The row is returned by the UPDATE itself on databases supporting UPDATE ...
+    RETURNING and is selected after the update elsewhere. Nothing is updated when there
+    are no values.
+    :param table: updated table
+    :param where: condition selecting a single row
+    :param values: dict of new column values
+    :param columns: columns of the returned row
+    :return: updated row or None if no row matches the condition
+    """
+    if not values:
+        return db.session.execute(select(*columns).where(where)).first()
+    statement = table.update().where(where).values(**values)
+    if db.engine.dialect.full_returning:
+        return db.session.execute(statement.returning(*columns)).first()
+    if not db.session.execute(statement).rowcount:
+        return None
+    return db.session.execute(select(*columns).where(where)).first()
@@ -0,0 +1,265 @@
+"""
+Seed service module used to generate synthetic data for load and capacity testing, this
+module defines the following class:
+- SeedService which inserts realistic departments and employees by bulk Core inserts
+"""
+import math
+import multiprocessing
+import random
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import column, create_engine, func, select, table
+
+from department_app.extensions import db, response_cache
+from department_app.models.department import DepartmentModel
+from department_app.models.department_stats import DepartmentStatsModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.table_version import TableVersionService
+
+DEPARTMENT_TABLE = DepartmentModel.__table__
+EMPLOYEE_TABLE = EmployeeModel.__table__
+STATS_TABLE = DepartmentStatsModel.__table__
+DEPARTMENT_KINDS = (
+    'Finance', 'Marketing', 'Sales', 'Engineering', 'Support', 'Legal', 'Research',
+    'Logistics', 'Purchasing', 'Security', 'Operations', 'Quality', 'Training', 'Design')
+FIRST_NAMES = (
+    'Olivia', 'Liam', 'Emma', 'Noah', 'Amelia', 'Oliver', 'Sophia', 'Elijah', 'Mia',
+    'James', 'Ava', 'Lucas', 'Yulia', 'Taras', 'Olena', 'Andrii', 'Iryna', 'Dmytro',
+    'Maria', 'Ivan', 'Anna', 'Petro', 'Sofia', 'Mykola', 'Kateryna', 'Oleh', 'Nadia')
+LAST_NAMES = (
+    'Smith', 'Johnson', 'Brown', 'Garcia', 'Miller', 'Davis', 'Wilson', 'Moore', 'Taylor',
+    'Clark', 'Lewis', 'Walker', 'Shevchenko', 'Bondarenko', 'Kovalenko', 'Tkachenko',
+    'Kravchenko', 'Melnyk', 'Boyko', 'Koval', 'Hrabovenko', 'Savchenko', 'Rudenko')
+FULL_NAMES = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+EMPLOYEE_COLUMNS = ('name', 'birth_date', 'salary', 'uuid', 'department_id')
+DAYS_IN_YEAR = 365.25
+# ages of employees are normally distributed and limited to the working age
+AGE_MEAN, AGE_DEVIATION, AGE_MIN, AGE_MAX = 40, 10, 18, 65
+# salaries are log-normally distributed around the median growing with age
+SALARY_MEDIAN, SALARY_SIGMA, SALARY_GROWTH = 2000, 0.35, 0.015
+SALARY_MIN, SALARY_MAX = 500, 20000
+
+
+def department_rows(count, first_number, rng):
+    """
+    Generates departments with unique names.
+    :param count: number of departments
+    :param first_number: number of the first department used in names
+    :param rng: random generator
+    :return: generator of department rows
+    """
+    for number in range(first_number, first_number + count):
+        kind = DEPARTMENT_KINDS[number % len(DEPARTMENT_KINDS)]
+        yield {
+            'name': f'{kind} {number}',
+            'description': f'{kind} department number {number}.',
+            'uuid': random_uuid_bytes(rng)
+        }
+
+
+def department_weights(count, skew, rng):
+    """
+    Returns cumulative weights of departments sizes following Zipf's law, so that a few
+    departments are large and most of them are small. Weights are shuffled, so that
+    sizes do not depend on the department order.
+    :param count: number of departments
+    :param skew: exponent of the distribution, 0 for departments of the same size
+    :param rng: random generator
+    :return: list of cumulative weights
+    """
+    weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return list(accumulate(weights))
+
+
+def birth_date_values(dialect, today):
+    """
+    Returns birth dates of every possible age in days, converted for the database by the
+    birth_date column type once instead of for every inserted row.
+    :param dialect: database dialect
+    :param today: date ages are calculated at
+    :return: list of bound birth dates indexed by age in days minus the minimal age
+    """
+    process = EMPLOYEE_TABLE.c.birth_date.type.bind_processor(dialect) or (lambda value: value)
+    first, last = int(AGE_MIN * DAYS_IN_YEAR), int(AGE_MAX * DAYS_IN_YEAR)
+    return [process(today - timedelta(days=days)) for days in range(first, last + 1)]
+
+
+def random_uuid_bytes(rng):
+    """
+    Returns bytes of a random version 4 uuid as stored by the uuid columns.
+    :param rng: random generator
+    :return: 16 bytes
+    """
+    value = rng.getrandbits(128) & ~(0xf000 << 64) & ~(0xc000 << 48)
+    return (value | 0x4000 << 64 | 0x8000 << 48).to_bytes(16, 'big')
+
+
+def employee_rows(count, department_ids, cum_weights, rng, birth_dates):
+    """
+    Generates employees with random names, birth dates and salaries distributed over
+    departments by the weights.
+    :param count: number of employees
+    :param department_ids: ids of departments
+    :param cum_weights: cumulative weights of the departments
+    :param rng: random generator
+    :param birth_dates: bound birth dates returned by birth_date_values
+    :return: list of employee rows
+    """
+    log_median = math.log(SALARY_MEDIAN)
+    first_day = int(AGE_MIN * DAYS_IN_YEAR)
+    rows = []
+    for department_id in rng.choices(department_ids, cum_weights=cum_weights, k=count):
+        age = min(max(rng.gauss(AGE_MEAN, AGE_DEVIATION), AGE_MIN), AGE_MAX)
+        salary = rng.lognormvariate(log_median + SALARY_GROWTH * (age - AGE_MIN), SALARY_SIGMA)
+        rows.append({
+            'name': rng.choice(FULL_NAMES),
+            'birth_date': birth_dates[int(age * DAYS_IN_YEAR) - first_day],
+            'salary': int(min(max(salary, SALARY_MIN), SALARY_MAX)) // 10 * 10,
+            'uuid': random_uuid_bytes(rng),
+            'department_id': department_id
+        })
+    return rows
+
+
+def insert_employees(engine, count, department_ids, cum_weights, batch_size, seed):
+    """
+    Inserts generated employees in batches, each batch in its own transaction. Rows are
+    inserted by a statement without column types, since their values are already
+    converted for the database, which saves type processing of every row.
+    :param engine: database engine
+    :param count: number of employees
+    :param department_ids: ids of departments
+    :param cum_weights: cumulative weights of the departments
+    :param batch_size: number of employees inserted by one statement
+    :param seed: seed of the random generator
+    :return: number of inserted employees
+    """
+    # pylint: disable=too-many-arguments
+    rng = random.Random(seed)
+    birth_dates = birth_date_values(
+        engine.dialect, datetime.combine(date.today(), datetime.min.time()))
+    statement = table(EMPLOYEE_TABLE.name, *(column(name) for name in EMPLOYEE_COLUMNS)).insert()
+    for start in range(0, count, batch_size):
+        rows = employee_rows(min(batch_size, count - start), department_ids, cum_weights,
+                             rng, birth_dates)
+        with engine.begin() as connection:
+            connection.execute(statement, rows)
+    return count
+
+
+def _insert_employees_in_process(url, *args):
+    """
+    Inserts employees in a worker process by its own engine.
+    :param url: database url
+    :param args: arguments of insert_employees
+    :return: number of inserted employees
+    """
+    connect_args = {'timeout': 60} if url.startswith('sqlite') else {}
+    engine = create_engine(url, connect_args=connect_args)
+    try:
+        return insert_employees(engine, *args)
+    finally:
+        engine.dispose()
+
+
+class SeedService:
+    """
+    Seed service used to insert synthetic data.
+    """
+    @classmethod
+    def truncate(cls):
+        """
+        Deletes all the employees, departments and their statistics.
+        """
+        db.session.execute(STATS_TABLE.delete())
+        db.session.execute(EMPLOYEE_TABLE.delete())
+        db.session.execute(DEPARTMENT_TABLE.delete())
+        db.session.commit()
+
+    @staticmethod
+    def _drop_indexes():
+        """
+        Drops non-unique indexes of the employee table, since building them once after
+        a bulk insert is faster than updating them for every row. Indexes starting with
+        the columns of a foreign key are kept, since MySQL needs them to check the key.
+        :return: list of dropped indexes
+        """
+        db.session.remove()
+        foreign_keys = [constraint.column_keys
+                        for constraint in EMPLOYEE_TABLE.foreign_key_constraints]
+        indexes = [index for index in EMPLOYEE_TABLE.indexes if not index.unique and not any(
+            [column.name for column in index.columns][:len(columns)] == columns
+            for columns in foreign_keys)]
+        for index in indexes:
+            index.drop(db.engine)
+        return indexes
+
+    @staticmethod
+    def _insert_in_processes(employees_count, department_ids, cum_weights, batch_size, seeds):
+        """
+        Inserts employees by a pool of processes with their own connections, one process
+        for every seed, each inserting its share of employees.
+        :param employees_count: number of employees
+        :param department_ids: ids of departments employees are assigned to
+        :param cum_weights: cumulative weights of the departments
+        :param batch_size: number of employees inserted by one statement
+        :param seeds: seeds of the random generators of the processes
+        """
+        processes = len(seeds)
+        url = db.engine.url.render_as_string(hide_password=False)
+        shares = [employees_count // processes + (index < employees_count % processes)
+                  for index in range(processes)]
+        with multiprocessing.Pool(processes) as pool:
+            pool.starmap(_insert_employees_in_process, [
+                (url, share, department_ids, cum_weights, batch_size, worker_seed)
+                for share, worker_seed in zip(shares, seeds)])
+
+    @classmethod
+    def seed(cls, departments_count, employees_count, skew=1.0, batch_size=50000,
+             processes=1, seed=None):
+        """
+        Inserts departments and employees by bulk Core inserts, then rebuilds department
+        statistics and increases table versions, since the inserts skip the session
+        listeners maintaining them. Non-unique employee indexes not needed by foreign keys
+        are dropped during the insert and created again afterwards, also when it fails.
+        Employees are inserted by several processes with their own connections when
+        processes is more than 1.
+        :param departments_count: number of departments
+        :param employees_count: number of employees
+        :param skew: exponent of Zipf's distribution of department sizes
+        :param batch_size: number of employees inserted by one statement
+        :param processes: number of processes inserting employees
+        :param seed: seed of the random generator, random data when None
+        :return: number of departments with statistics
+        """
+        # pylint: disable=too-many-arguments
+        rng = random.Random(seed)
+        last_id = db.session.execute(select(func.max(DEPARTMENT_TABLE.c.id))).scalar() or 0
+        db.session.execute(DEPARTMENT_TABLE.insert(),
+                           list(department_rows(departments_count, last_id + 1, rng)))
+        db.session.commit()
+        department_ids = db.session.execute(select(DEPARTMENT_TABLE.c.id).where(
+            DEPARTMENT_TABLE.c.id > last_id).order_by(DEPARTMENT_TABLE.c.id)).scalars().all()
+        if department_ids and employees_count:
+            cum_weights = department_weights(len(department_ids), skew, rng)
+            seeds = [rng.getrandbits(64) for _ in range(max(processes, 1))]
+            indexes = cls._drop_indexes()
+            try:
+                if processes > 1:
+                    cls._insert_in_processes(employees_count, department_ids, cum_weights,
+                                             batch_size, seeds)
+                else:
+                    insert_employees(db.engine, employees_count, department_ids, cum_weights,
+                                     batch_size, seeds[0])
+            finally:
+                for index in indexes:
+                    index.create(db.engine)
+        count = DepartmentStatsService.rebuild()
+        TableVersionService.bump(db.session.connection(), [
+            DEPARTMENT_TABLE.name, EMPLOYEE_TABLE.name])
+        db.session.commit()
+        response_cache.clear()
+        return count
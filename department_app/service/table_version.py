@@ -0,0 +1,80 @@
+"""
+Table version service module used to track changes of tables, this module
+defines the following class:
+- TableVersionService which increases table versions whenever tables change
+"""
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+from department_app.extensions import db
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.models.table_version import TableVersionModel
+from department_app.service.upsert import insert_or_update
+
+VERSION_TABLE = TableVersionModel.__table__
+# models whose changes are tracked
+VERSIONED_MODELS = (DepartmentModel, EmployeeModel)
+# tables whose rows are deleted by ON DELETE CASCADE together with rows of a table
+CASCADED_TABLES = {DepartmentModel.__tablename__: (EmployeeModel.__tablename__,)}
+
+
+class TableVersionService:
+    """
+    Table version service used to make database queries.
+    """
+    @classmethod
+    @db.read_only
+    def find_versions(cls, table_names):
+        """
+        Fetches versions and times of the last changes of given tables by a single query.
+        Tables which have never changed have version 0 and no change time.
+        :param table_names: names of tables
+        :return: dictionary of versions and change times by table name
+        """
+        rows = db.session.execute(select(
+            VERSION_TABLE.c.table_name, VERSION_TABLE.c.version, VERSION_TABLE.c.updated_at
+        ).where(VERSION_TABLE.c.table_name.in_(table_names)))
+        versions = {table_name: (0, None) for table_name in table_names}
+        versions.update({row.table_name: (row.version, row.updated_at) for row in rows})
+        return versions
+
+    @classmethod
+    def bump(cls, connection, table_names):
+        """
+        Increases versions of given tables in the current transaction. The first version
+        of a table is inserted by an upsert, so that concurrent first changes of the
+        table do not fail with a duplicate key. The version row of a table is locked
+        until the transaction ends, so writers of the same table are serialized by it,
+        which keeps a version from ever being visible before the change it stands for.
+        :param connection: connection of the current transaction
+        :param table_names: names of changed tables
+        """
+        now = datetime.utcnow().replace(microsecond=0)
+        for table_name in sorted(table_names):
+            insert_or_update(connection, VERSION_TABLE,
+                             {'table_name': table_name, 'version': 1, 'updated_at': now},
+                             ['table_name'],
+                             {'version': VERSION_TABLE.c.version + 1, 'updated_at': now})
+
+    @classmethod
+    def bump_changed(cls, session, flush_context):
+        """
+        Increases versions of the tables of models added, changed or deleted by a flush,
+        including tables whose rows are deleted by cascade.
+        :param session: flushed session
+        """
+        # pylint: disable=unused-argument
+        table_names = {instance.__tablename__ for instance in session.new | session.deleted
+                       if isinstance(instance, VERSIONED_MODELS)}
+        for instance in session.deleted:
+            table_names.update(CASCADED_TABLES.get(getattr(instance, '__tablename__', None), ()))
+        table_names.update(instance.__tablename__ for instance in session.dirty
+                           if isinstance(instance, VERSIONED_MODELS)
+                           and session.is_modified(instance))
+        if table_names:
+            cls.bump(session.connection(), table_names)
+
+
+event.listen(db.session, 'after_flush', TableVersionService.bump_changed)
@@ -0,0 +1,38 @@
+"""
+Upsert module used to write rows which may be inserted by concurrent transactions, this
+module defines the following function:
+- insert_or_update which inserts a row or updates the existing one by a single statement
+"""
+from sqlalchemy import and_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+# insert constructs of the databases supporting upserts
+DIALECT_INSERTS = {'mysql': mysql.insert, 'postgresql': postgresql.insert,
+                   'sqlite': sqlite.insert}
+
+
+def insert_or_update(connection, table, values, key_columns, update):
+    """
+    Inserts a row or updates the row with the same key if it already exists. MySQL uses
+    INSERT ... ON DUPLICATE KEY UPDATE, SQLite and PostgreSQL use INSERT ... ON CONFLICT
+    DO UPDATE, so that transactions inserting the same key concurrently do not fail with
+    a duplicate key error. Other databases update the row and insert it when nothing is
+    updated.
+    :param connection: connection of the current transaction
+    :param table: written table
+    :param values: dict of column values of the inserted row
+    :param key_columns: names of the primary or unique key columns
+    :param update: dict of new column values or expressions of the existing row
+    """
+    insert = DIALECT_INSERTS.get(connection.dialect.name)
+    if insert is None:
+        where = and_(*(table.c[name] == values[name] for name in key_columns))
+        if not connection.execute(table.update().where(where).values(**update)).rowcount:
+            connection.execute(table.insert().values(**values))
+        return
+    statement = insert(table).values(**values)
+    if connection.dialect.name == 'mysql':
+        statement = statement.on_duplicate_key_update(**update)
+    else:
+        statement = statement.on_conflict_do_update(index_elements=key_columns, set_=update)
+    connection.execute(statement)
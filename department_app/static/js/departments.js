@@ -1,5 +1,5 @@
 const tableBody = document.querySelector("tbody");
-const url = '/api/departments';
+const url = '/api/departments?all=true&include=stats';
 let output = '';
 
 // Department table visualisation
@@ -1,6 +1,6 @@
 const tableBody = document.querySelector("tbody");
 const dateForm = document.getElementById("dateForm");
-const url = '/api/employees';
+const url = '/api/employees?all=true';
 var output = '';
 
 // Employees table visualisation
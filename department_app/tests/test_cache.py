@@ -0,0 +1,189 @@
+"""
+This module is used to test response cache, it defines the following classes:
+- FakeRedis which is a local stand-in for a redis client
+- TestCacheBackends to test cache backends
+- TestResponseCache to test caching and invalidation of api responses
+"""
+import fnmatch
+import json
+import unittest
+from datetime import date
+from http import HTTPStatus
+from unittest.mock import patch
+
+from department_app.cache import LRUCacheBackend, NullCacheBackend, RedisCacheBackend
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+
+
+class FakeRedis:
+    """
+    Local stand-in for a redis client storing values in a dictionary.
+    """
+    def __init__(self):
+        """
+        Constructor of FakeRedis class.
+        """
+        self.values = {}
+
+    def get(self, key):
+        """
+        Returns value by key.
+        """
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        """
+        Stores value by key.
+        """
+        # pylint: disable=unused-argument
+        self.values[key] = value.encode()
+
+    def delete(self, *keys):
+        """
+        Removes values by keys.
+        """
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        """
+        Iterates over keys matching the pattern.
+        """
+        return [key for key in self.values if fnmatch.fnmatch(key, match)]
+
+
+class TestCacheBackends(unittest.TestCase):
+    """
+    Cache backends test class.
+    """
+    def test_lru_evicts_least_recently_used(self):
+        """
+        Checks whether the least recently used entry is evicted when the cache is full.
+        """
+        cache = LRUCacheBackend(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+
+    @patch('department_app.cache.time.monotonic')
+    def test_lru_expires_entries(self, mock_time):
+        """
+        Checks whether entries expire after timeout.
+        """
+        mock_time.return_value = 100
+        cache = LRUCacheBackend(default_timeout=10)
+        cache.set('a', 1)
+        mock_time.return_value = 105
+        self.assertEqual(1, cache.get('a'))
+        mock_time.return_value = 111
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+    def test_null_backend(self):
+        """
+        Checks whether null backend does not store anything.
+        """
+        cache = NullCacheBackend()
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+    def test_redis_backend(self):
+        """
+        Checks whether redis backend stores values as json under the prefix.
+        """
+        client = FakeRedis()
+        cache = RedisCacheBackend(client, prefix='test:')
+        cache.set('a', [{'name': 'Finance'}, 200])
+        self.assertEqual([{'name': 'Finance'}, 200], json.loads(client.values['test:a']))
+        self.assertEqual([{'name': 'Finance'}, 200], cache.get('a'))
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+        cache.set('b', 1)
+        cache.clear()
+        self.assertEqual({}, client.values)
+
+
+class TestResponseCache(BaseTestCase):
+    """
+    Response cache test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        self.employee = EmployeeModel('Joe Travis', date(1996, 5, 12), 2000)
+        self.department.employees = [self.employee]
+        db.session.add(self.department)
+        db.session.commit()
+        self.department_uuid = self.department.uuid
+        self.employee_uuid = self.employee.uuid
+
+    def test_get_department_cached(self):
+        """
+        Checks whether repeated get request to /api/departments/<uuid> is answered
+        from cache without querying database.
+        """
+        self.client.get(f'/api/departments/{self.department_uuid}')
+        with patch('department_app.rest.department.department_service.find_by_uuid') \
+                as mock_get:
+            response = self.client.get(f'/api/departments/{self.department_uuid}')
+            mock_get.assert_not_called()
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual('Finance', response.json['name'])
+
+    def test_employee_update_invalidates_department(self):
+        """
+        Checks whether update of an employee invalidates the cached department
+        embedding the employee and cached lists.
+        """
+        self.client.get(f'/api/departments/{self.department_uuid}')
+        self.client.get('/api/employees?all=true')
+        data = {'name': 'Joe Smith', 'birth_date': '1996-05-12', 'salary': 2500}
+        response = self.client.put(
+            f'/api/employees/{self.employee_uuid}?department_uuid={self.department_uuid}',
+            data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.client.get(f'/api/departments/{self.department_uuid}')
+        self.assertEqual('Joe Smith', response.json['employees'][0]['name'])
+        self.assertEqual(2500, response.json['average_salary'])
+        response = self.client.get('/api/employees?all=true')
+        self.assertEqual('Joe Smith', response.json[0]['name'])
+
+    def test_department_update_invalidates_employee(self):
+        """
+        Checks whether update of a department invalidates cached employees
+        embedding the department name.
+        """
+        self.client.get(f'/api/employees/{self.employee_uuid}')
+        data = {'name': 'Marketing', 'description': 'Some marketing department.'}
+        response = self.client.put(f'/api/departments/{self.department_uuid}',
+                                   data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.client.get(f'/api/employees/{self.employee_uuid}')
+        self.assertEqual('Marketing', response.json['department'])
+
+    def test_delete_invalidates_lists(self):
+        """
+        Checks whether deletion of an employee and department invalidates cached lists.
+        """
+        self.client.get('/api/departments?all=true')
+        self.client.delete(f'/api/employees/{self.employee_uuid}')
+        response = self.client.get('/api/departments?all=true')
+        self.assertEqual([], response.json[0]['employees'])
+        self.client.delete(f'/api/departments/{self.department_uuid}')
+        response = self.client.get('/api/departments?all=true')
+        self.assertEqual([], response.json)
+        response = self.client.get(f'/api/employees/{self.employee_uuid}')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
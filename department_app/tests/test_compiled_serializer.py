@@ -0,0 +1,72 @@
+"""
+This module is used to test compiled serializer, it defines the following class:
+- TestCompiledSerializer to test that compiled serializers dump the same output as schemas
+"""
+import json
+from datetime import date
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.schemas.compiled import CompiledSerializer
+from department_app.schemas.department import DepartmentSchema
+from department_app.schemas.employee import EmployeeSchema
+from department_app.service.department import DepartmentService
+
+
+class TestCompiledSerializer(BaseTestCase):
+    """
+    Compiled serializer test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.department_1 = DepartmentModel('Finance', 'Some finance department.')
+        self.department_2 = DepartmentModel('Marketing', 'Some marketing department.')
+        self.department_1.employees = [
+            EmployeeModel('Joe Travis', date(1996, 5, 12), 2000),
+            EmployeeModel('Lisa Simons', date(1990, 8, 10), 3500)
+        ]
+        self.employee = EmployeeModel('Dylan Miller', date(1991, 9, 2), 2400)
+        db.session.add_all([self.department_1, self.department_2, self.employee])
+        db.session.commit()
+
+    def assert_same_output(self, schema, data):
+        """
+        Checks whether compiled serializer of the schema dumps the same json as the schema.
+        :param schema: marshmallow schema
+        :param data: object or list of objects to dump
+        """
+        expected = json.dumps(schema.dump(data), sort_keys=True)
+        self.assertEqual(expected, json.dumps(CompiledSerializer(schema).dump(data),
+                                              sort_keys=True))
+
+    def test_employees(self):
+        """
+        Checks whether employees with and without departments are dumped as by the schema.
+        """
+        self.assert_same_output(EmployeeSchema(many=True), EmployeeModel.query.all())
+        self.assert_same_output(EmployeeSchema(), self.employee)
+
+    def test_departments(self):
+        """
+        Checks whether departments with nested employees, calculated or loaded statistics
+        and limited fields are dumped as by the schema.
+        """
+        departments = DepartmentModel.query.all()
+        self.assert_same_output(DepartmentSchema(many=True), departments)
+        DepartmentService.load_employees_stats(departments)
+        self.assert_same_output(DepartmentSchema(many=True), departments)
+        self.assert_same_output(
+            DepartmentSchema(many=True, only=('uuid', 'name', 'average_salary')), departments)
+
+    def test_dump_many_argument(self):
+        """
+        Checks whether many argument of dump overrides the setting of the schema.
+        """
+        serializer = CompiledSerializer(EmployeeSchema())
+        self.assertEqual([serializer.dump(self.employee)],
+                         serializer.dump([self.employee], many=True))
@@ -0,0 +1,94 @@
+"""
+This module is used to test response compression, it defines the following class:
+- TestCompression to test negotiation, thresholds and streaming compression
+"""
+import gzip
+import json
+import unittest
+from datetime import date
+from http import HTTPStatus
+
+from department_app.compression import brotli
+from department_app.extensions import compress, db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+
+
+class TestCompression(BaseTestCase):
+    """
+    Response compression test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        self.department.employees = [
+            EmployeeModel(f'Employee {number}', date(1990, 1, 1), 2000) for number in range(20)]
+        db.session.add(self.department)
+        db.session.commit()
+
+    def test_gzip_response(self):
+        """
+        Checks whether large responses are compressed with gzip when the client accepts it
+        and whether bytes saved by compression are counted.
+        """
+        saved = compress.bytes_saved
+        response = self.client.get('/api/employees', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        data = gzip.decompress(response.data)
+        self.assertEqual(20, len(json.loads(data)['items']))
+        self.assertEqual(len(data) - len(response.data), compress.bytes_saved - saved)
+
+    def test_not_compressed(self):
+        """
+        Checks whether responses are not compressed when the client does not accept
+        compression or they are smaller than the threshold.
+        """
+        response = self.client.get('/api/employees')
+        self.assertNotIn('Content-Encoding', response.headers)
+        response = self.client.get(f'/api/departments/{self.department.uuid}?include=',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual('Finance', response.json['name'])
+
+    def test_revalidation_of_compressed_response(self):
+        """
+        Checks whether weak entity tag of a compressed response is accepted by
+        conditional get request.
+        """
+        headers = {'Accept-Encoding': 'gzip'}
+        etag = self.client.get('/api/employees', headers=headers).headers['ETag']
+        response = self.client.get('/api/employees',
+                                   headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(etag, response.headers['ETag'])
+
+    def test_streamed_export(self):
+        """
+        Checks whether streamed export is compressed while it is sent.
+        """
+        response = self.client.get('/api/employees/export',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertTrue(response.is_streamed)
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertNotIn('Content-Length', response.headers)
+        lines = gzip.decompress(response.data).decode().splitlines()
+        self.assertEqual(20, len(lines))
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        """
+        Checks whether brotli is chosen when the client accepts both encodings.
+        """
+        response = self.client.get('/api/employees',
+                                   headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual('br', response.headers['Content-Encoding'])
+        self.assertEqual(20, len(json.loads(brotli.decompress(response.data))['items']))
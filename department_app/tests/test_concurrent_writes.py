@@ -0,0 +1,84 @@
+"""
+This module is used to test writes relying on database constraints, it
+defines the following class:
+- TestConcurrentWrites to test conflicts of concurrent and repeated writes
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.service.department import DepartmentService
+from department_app.service.errors import ConflictError
+
+
+class TestConcurrentWrites(BaseTestCase):
+    """
+    Concurrent writes test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    def post_department(self, name):
+        """
+        Posts a department to /api/departments from a separate test client.
+        :param name: department name
+        :return: status code of the response
+        """
+        data = {'name': name, 'description': 'Some department.'}
+        response = self.app.test_client().post(
+            '/api/departments', data=json.dumps(data), content_type='application/json')
+        db.session.remove()
+        return response.status_code
+
+    def test_save_conflict(self):
+        """
+        Checks whether saving a department with an existing name raises ConflictError
+        and leaves the session usable.
+        """
+        DepartmentService.save_to_db(DepartmentModel('Finance', 'Some finance department.'))
+        with self.assertRaises(ConflictError):
+            DepartmentService.save_to_db(DepartmentModel('Finance', 'Another department.'))
+        DepartmentService.save_to_db(DepartmentModel('Sales', 'Some sales department.'))
+        self.assertEqual(2, DepartmentModel.query.count())
+
+    def test_post_existing_name_conflict(self):
+        """
+        Checks whether creating or renaming a department to an existing name returns
+        an error message with a status code 409.
+        """
+        self.assertEqual(HTTPStatus.CREATED, self.post_department('Finance'))
+        self.assertEqual(HTTPStatus.CREATED, self.post_department('Sales'))
+        response = self.client.post('/api/departments', content_type='application/json',
+                                    data=json.dumps({'name': 'Finance',
+                                                     'description': 'Some department.'}))
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        self.assertEqual(response.json,
+                         {'message': 'Department with name Finance already exists.'})
+        sales = DepartmentModel.query.filter_by(name='Sales').first()
+        response = self.client.put(f'/api/departments/{sales.uuid}',
+                                   content_type='application/json',
+                                   data=json.dumps({'name': 'Finance',
+                                                    'description': 'Some department.'}))
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        db.session.remove()
+        self.assertEqual(['Finance', 'Sales'],
+                         sorted(department.name for department in DepartmentModel.query.all()))
+
+    def test_concurrent_posts(self):
+        """
+        Checks whether concurrent posts of the same department create it once and
+        the others get a status code 409 instead of a server error.
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(executor.map(self.post_department, ['Finance'] * 16))
+        self.assertEqual(1, statuses.count(HTTPStatus.CREATED))
+        self.assertEqual(15, statuses.count(HTTPStatus.CONFLICT))
+        self.assertEqual(1, DepartmentModel.query.filter_by(name='Finance').count())
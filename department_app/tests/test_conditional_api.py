@@ -0,0 +1,118 @@
+"""
+This module is used to test conditional requests to the api, it
+defines the following class:
+- TestConditionalApi to test entity tags and 304 Not Modified responses
+"""
+import json
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from unittest.mock import patch
+
+from werkzeug.http import http_date
+
+from department_app.extensions import db, response_cache
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.table_version import TableVersionService
+
+
+class TestConditionalApi(BaseTestCase):
+    """
+    Conditional Api test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        self.department.employees = [EmployeeModel('Joe Travis', date(1996, 5, 12), 2000)]
+        db.session.add(self.department)
+        db.session.commit()
+        self.url = f'/api/departments/{self.department.uuid}'
+
+    def test_validators_in_response(self):
+        """
+        Checks whether strong ETag and Last-Modified headers are returned
+        when performing get request to /api/departments/<uuid>.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(response.headers['ETag'].startswith('W/'))
+        self.assertIn('Last-Modified', response.headers)
+
+    def test_if_none_match_not_modified(self):
+        """
+        Checks whether 304 is returned without querying and serializing the department
+        when performing get request with the current ETag in If-None-Match.
+        """
+        etag = self.client.get(self.url).headers['ETag']
+        response_cache.clear()
+        with patch('department_app.rest.department.department_service.find_by_uuid') \
+                as mock_get:
+            response = self.client.get(self.url, headers={'If-None-Match': etag})
+            mock_get.assert_not_called()
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(b'', response.data)
+        self.assertEqual(etag, response.headers['ETag'])
+
+    def test_first_version_upserted(self):
+        """
+        Checks whether the first version of a table is inserted and later ones increase
+        it, each by a single upsert.
+        """
+        for _ in range(2):
+            TableVersionService.bump(db.session.connection(), ['report'])
+            db.session.commit()
+        self.assertEqual(2, TableVersionService.find_versions(['report'])['report'][0])
+
+    def test_etag_changes_after_update(self):
+        """
+        Checks whether the department is returned again with a new ETag after it changes.
+        """
+        etag = self.client.get(self.url).headers['ETag']
+        data = {'name': 'Marketing', 'description': 'Some marketing department.'}
+        self.client.put(self.url, data=json.dumps(data), content_type='application/json')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(etag, response.headers['ETag'])
+        self.assertEqual('Marketing', response.json['name'])
+
+    def test_cached_body_follows_etag(self):
+        """
+        Checks whether a response cached before another worker changed the department
+        is not returned under the new ETag, although the local cache was not invalidated.
+        """
+        etag = self.client.get(self.url).headers['ETag']
+        db.session.execute(DepartmentModel.__table__.update().values(name='Marketing'))
+        TableVersionService.bump(db.session.connection(), ['department'])
+        db.session.commit()
+        response = self.client.get(self.url)
+        self.assertNotEqual(etag, response.headers['ETag'])
+        self.assertEqual('Marketing', response.json['name'])
+
+    def test_employee_list_etag_changes_after_delete(self):
+        """
+        Checks whether ETag of employee list changes after an employee is deleted.
+        """
+        etag = self.client.get('/api/employees').headers['ETag']
+        employee_uuid = self.department.employees[0].uuid
+        self.client.delete(f'/api/employees/{employee_uuid}')
+        response = self.client.get('/api/employees', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([], response.json['items'])
+
+    def test_if_modified_since(self):
+        """
+        Checks whether 304 is returned when the department has not changed since given
+        time and the department is returned when it has.
+        """
+        future = datetime.utcnow() + timedelta(days=1)
+        response = self.client.get(self.url, headers={'If-Modified-Since': http_date(future)})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        past = datetime.utcnow() - timedelta(days=1)
+        response = self.client.get(self.url, headers={'If-Modified-Since': http_date(past)})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -0,0 +1,82 @@
+"""
+This module is used to test database engine tuning, it defines the following class:
+- TestDatabase to test engine options, pool warm-up, metrics and disposal after fork
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from config import engine_options
+from department_app.database import (
+    InstrumentedQueuePool, dispose_engines_after_fork, pool_metrics, warm_up_pool)
+
+
+class TestDatabase(unittest.TestCase):
+    """
+    Database engine test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.engine = create_engine(f'sqlite:///{self.path}', poolclass=InstrumentedQueuePool,
+                                    pool_size=2, max_overflow=2)
+
+    def tearDown(self):
+        """
+        Defines instructions that will be executed after each test.
+        """
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def test_engine_options_from_environment(self):
+        """
+        Checks whether engine options are read from environment variables.
+        """
+        environ = {'DB_POOL_SIZE': '20', 'DB_MAX_OVERFLOW': '5', 'DB_POOL_RECYCLE': '280',
+                   'DB_POOL_PRE_PING': 'false', 'DB_CONNECT_TIMEOUT': '3'}
+        with patch.dict(os.environ, environ, clear=True):
+            self.assertEqual({'pool_pre_ping': False, 'pool_recycle': 280, 'pool_size': 20,
+                              'max_overflow': 5, 'connect_args': {'connect_timeout': 3}},
+                             engine_options())
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual({'pool_pre_ping': True, 'pool_recycle': 1800}, engine_options())
+
+    def test_warm_up_and_metrics(self):
+        """
+        Checks whether warm-up opens connections in advance and checkouts are counted.
+        """
+        checkouts = pool_metrics.checkouts
+        warm_up_pool(self.engine, 2)
+        self.assertEqual(2, self.engine.pool.checkedin())
+        self.assertEqual(checkouts + 2, pool_metrics.checkouts)
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            metrics = pool_metrics.collect(self.engine)
+        self.assertEqual(1, metrics['checked_out'])
+        self.assertEqual(4, metrics['limit'])
+        self.assertEqual(0.25, metrics['saturation'])
+        self.assertGreaterEqual(metrics['wait_seconds_max'], 0)
+
+    def test_dispose_after_fork(self):
+        """
+        Checks whether pools inherited by a forked worker are replaced with empty ones.
+        """
+        warm_up_pool(self.engine, 2)
+        pool = self.engine.pool
+        dispose_engines_after_fork()
+        self.assertIsNot(pool, self.engine.pool)
+        self.assertEqual(0, self.engine.pool.checkedin())
+        self.assertEqual(2, pool.checkedin())
+
+    def test_pool_logger_name(self):
+        """
+        Checks whether the pool logs under sqlalchemy.pool, so that levels of sqlalchemy
+        loggers apply to it.
+        """
+        self.assertTrue(self.engine.pool.logger.name.startswith('sqlalchemy.pool.'))
@@ -2,10 +2,11 @@
 This module is used to test department api, it
 defines the following class:
 - TestDepartmentApi to test the department api functionality
+- TestDepartmentApiQuery to test pagination, fieldsets and includes of the department api
 """
 import json
 from http import HTTPStatus
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from datetime import date
 from werkzeug.exceptions import NotFound, BadRequest
 from marshmallow import ValidationError
@@ -15,6 +16,8 @@ from department_app.tests.testconf import BaseTestCase
 from department_app.tests.serialization_funcs import dep_to_json
 from department_app.models.department import DepartmentModel
 from department_app.models.employee import EmployeeModel
+from department_app.rest.department import delete_executor
+from department_app.service.department_stats import DepartmentStatsService
 
 
 class TestDepartmentApi(BaseTestCase):
@@ -47,7 +50,7 @@ class TestDepartmentApi(BaseTestCase):
         """
         departments = [self.department1, self.department2]
         mock_get.return_value = departments
-        response = self.client.get('/api/departments')
+        response = self.client.get('/api/departments?all=true')
         mock_get.assert_called_once()
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(response.json, [dep_to_json(d) for d in mock_get.return_value])
@@ -208,6 +211,21 @@ class TestDepartmentApi(BaseTestCase):
             self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
         self.assertEqual("Validation error message.", exception.exception.messages[0])
 
+    def test_put_department_uuid_read_only(self):
+        """
+        Checks whether uuid in the body of put request to /api/department/<uuid> is
+        rejected with a status code 400 and the stored uuid is kept.
+        """
+        db.session.add(self.department1)
+        db.session.commit()
+        uuid = self.department1.uuid
+        response = self.client.put(f'/api/departments/{uuid}',
+                                   data=json.dumps({'uuid': 'not-a-uuid', 'name': 'Sales'}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('uuid', response.json)
+        self.assertEqual('Finance', self.client.get(f'/api/departments/{uuid}').json['name'])
+
     @patch('department_app.rest.department.department_service.delete_from_db')
     def test_delete_department_success(self, mock_delete):
         """
@@ -227,6 +245,23 @@ class TestDepartmentApi(BaseTestCase):
             ''
         )
 
+    def test_delete_department_invalidates_after_commit(self):
+        """
+        Checks whether cached responses of a department are invalidated only after
+        the department is deleted from the database.
+        """
+        db.session.add(self.department1)
+        db.session.commit()
+        calls = Mock()
+        with patch('department_app.rest.department.department_service.delete_from_db',
+                   calls.delete_from_db), \
+                patch('department_app.rest.department.invalidate_department',
+                      calls.invalidate_department):
+            response = self.client.delete(f'/api/departments/{self.department1.uuid}')
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertEqual(['delete_from_db', 'invalidate_department'],
+                         [name for name, _, _ in calls.mock_calls])
+
     @patch('department_app.rest.department.department_service.delete_from_db')
     def test_delete_department_failure(self, mock_delete):
         """
@@ -238,3 +273,123 @@ class TestDepartmentApi(BaseTestCase):
         response = self.client.delete(f'/api/departments/{uuid}')
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
         self.assertEqual(response.json, {'message': 'Department not found error'})
+
+    def test_patch_department(self):
+        """
+        Checks whether patch request to /api/department/<uuid> updates only supplied
+        fields and returns error messages with status codes 400, 404 and 409.
+        """
+        db.session.add_all([self.department1, self.department2])
+        db.session.commit()
+        uuid = self.department1.uuid
+        response = self.client.patch(f'/api/departments/{uuid}',
+                                     data=json.dumps({'description': 'Patched.'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json,
+                         {'uuid': uuid, 'name': 'Finance', 'description': 'Patched.'})
+        response = self.client.patch(f'/api/departments/{uuid}',
+                                     data=json.dumps({'name': 'Management'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        response = self.client.patch(f'/api/departments/{uuid}',
+                                     data=json.dumps({'uuid': 'fake_uuid'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.client.patch('/api/departments/fake_uuid',
+                                     data=json.dumps({'name': 'Sales'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_delete_department_in_background(self):
+        """
+        Checks whether delete request to /api/department/<uuid>?background=true returns
+        a status code 202 and deletes the department with its employees chunk by chunk.
+        """
+        self.app.config['DEPARTMENT_DELETE_CHUNK_SIZE'] = 2
+        self.department1.employees = [EmployeeModel(f'Employee {index}', date(1990, 1, 1), 1000)
+                                      for index in range(5)]
+        db.session.add_all([self.department1, self.department2])
+        db.session.commit()
+        uuid = self.department1.uuid
+        response = self.client.delete(f'/api/departments/{uuid}?background=true')
+        self.assertEqual(response.status_code, HTTPStatus.ACCEPTED)
+        # the single delete worker runs scheduled deletions in order
+        delete_executor.submit(lambda: None).result()
+        db.session.remove()
+        self.assertEqual(['Management'], [department.name for department in
+                                          DepartmentModel.query])
+        self.assertEqual(0, EmployeeModel.query.count())
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+
+class TestDepartmentApiQuery(BaseTestCase):
+    """
+    Department Api pagination, fieldsets and includes test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        # test data
+        self.department1 = DepartmentModel('Finance', 'Some finance department.')
+        self.department2 = DepartmentModel('Management', 'Some management department.')
+
+    def test_get_departments_pages(self):
+        """
+        Checks whether departments are returned page by page with a cursor of the next
+        page when performing get requests to /api/departments?limit={limit}&after={cursor}.
+        """
+        self.department1.employees = [EmployeeModel('John Williams', date(1996, 5, 12), 2000)]
+        db.session.add_all([self.department1, self.department2])
+        db.session.commit()
+        response = self.client.get('/api/departments?limit=1&include=employees,stats')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json['items'], [dep_to_json(self.department1)])
+        cursor = response.json['next_cursor']
+        response = self.client.get(
+            f'/api/departments?limit=1&after={cursor}&include=employees,stats')
+        self.assertEqual(response.json['items'], [dep_to_json(self.department2)])
+        self.assertIsNone(response.json['next_cursor'])
+
+    def test_get_departments_without_employees(self):
+        """
+        Checks whether departments are returned with employees statistics but without
+        employees when performing get request to /api/departments with default arguments.
+        """
+        self.department1.employees = [EmployeeModel('John Williams', date(1996, 5, 12), 2000)]
+        db.session.add_all([self.department1, self.department2])
+        db.session.commit()
+        response = self.client.get('/api/departments')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        expected = dep_to_json(self.department1)
+        del expected['employees']
+        self.assertEqual(response.json['items'][0], expected)
+
+    def test_get_departments_fields(self):
+        """
+        Checks whether only requested fields are returned when performing get requests
+        to /api/departments?fields={fields}&include= and /api/departments/<uuid>?fields={fields}.
+        """
+        db.session.add(self.department1)
+        db.session.commit()
+        response = self.client.get('/api/departments?fields=uuid,name&include=')
+        self.assertEqual(response.json['items'],
+                         [{'uuid': self.department1.uuid, 'name': self.department1.name}])
+        response = self.client.get(
+            f'/api/departments/{self.department1.uuid}?fields=name&include=stats')
+        self.assertEqual(response.json, {'name': self.department1.name, 'employees_count': 0,
+                                         'average_salary': 0, 'employees_average_age': 0})
+
+    def test_get_departments_unknown_fields(self):
+        """
+        Checks whether error message is returned with a status code 400 when unknown
+        field or include is requested from /api/departments.
+        """
+        response = self.client.get('/api/departments?fields=uuid,password')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.client.get('/api/departments?include=salaries')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
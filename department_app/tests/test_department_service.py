@@ -156,3 +156,15 @@ class TestDepartmentService(BaseTestCase):
         db.session.commit()
         department = DepartmentModel.query.filter_by(uuid=self.department1.uuid).first()
         self.assertEqual(0, self.department_service.find_employees_average_age(department))
+
+    def test_load_employees_stats_without_employees(self):
+        """
+        Checks whether zero statistics are attached to the department
+        when no employees are added to the department.
+        """
+        self.department1.employees = []
+        db.session.commit()
+        self.department_service.load_employees_stats([self.department1, self.department2])
+        self.assertEqual({'employees_count': 0, 'average_salary': 0, 'employees_average_age': 0},
+                         self.department1.stats)
+        self.assertEqual(2, self.department2.stats['employees_count'])
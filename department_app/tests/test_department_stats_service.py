@@ -0,0 +1,154 @@
+"""
+This module is used to test department statistics service, it
+defines the following class:
+- TestDepartmentStatsService to test maintenance of the department_stats table
+"""
+from datetime import date
+from unittest.mock import patch
+
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.department_stats import DepartmentStatsModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.department_stats import DepartmentStatsService, STATS_TABLE
+from department_app.service.employee import EmployeeService
+from department_app.cli import department_stats_cli
+from department_app.extensions import db
+
+
+class TestDepartmentStatsService(BaseTestCase):
+    """
+    Department Statistics Service test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.department1 = DepartmentModel('Finance', 'Some finance department.')
+        self.department2 = DepartmentModel('Management', 'Some management department.')
+        self.employee1 = EmployeeModel('Dylan Miller', date(1991, 9, 2), 2400)
+        self.employee2 = EmployeeModel('Teressa Atkinson', date(1995, 2, 7), 1700)
+        self.employee3 = EmployeeModel('John Arthur', date(1986, 4, 6), 2000)
+        self.department1.employees = [self.employee1, self.employee2]
+        self.department2.employees = [self.employee3]
+        db.session.add(self.department1)
+        db.session.add(self.department2)
+        db.session.commit()
+
+    @staticmethod
+    def _stats(department):
+        """
+        Returns stored statistics of the department.
+        :param department: department object
+        :return: statistics of the department
+        """
+        db.session.expire_all()
+        return db.session.get(DepartmentStatsModel, department.id)
+
+    def test_stats_of_saved_employees(self):
+        """
+        Checks whether statistics are stored when departments with employees are saved.
+        """
+        stats = self._stats(self.department1)
+        self.assertEqual(2, stats.headcount)
+        self.assertEqual(4100, stats.salary_sum)
+        self.assertEqual(1700, stats.salary_min)
+        self.assertEqual(2400, stats.salary_max)
+        self.assertEqual(1991 + 1995, stats.birth_year_sum)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_after_employee_save(self):
+        """
+        Checks whether statistics are updated when an employee is saved.
+        """
+        employee = EmployeeModel('Jennifer Bales', date(1983, 8, 2), 3000)
+        employee.department = self.department2
+        EmployeeService.save_to_db(employee)
+        stats = self._stats(self.department2)
+        self.assertEqual(2, stats.headcount)
+        self.assertEqual(3000, stats.salary_max)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_after_employee_update(self):
+        """
+        Checks whether statistics are updated when salary of an expired employee changes.
+        """
+        self.employee1.salary = 1000
+        EmployeeService.update_in_db()
+        stats = self._stats(self.department1)
+        self.assertEqual(2700, stats.salary_sum)
+        self.assertEqual(1000, stats.salary_min)
+        self.assertEqual(1700, stats.salary_max)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_after_employee_moves(self):
+        """
+        Checks whether statistics of both departments are updated when an employee
+        moves between departments.
+        """
+        self.employee1.department = self.department2
+        EmployeeService.update_in_db()
+        self.assertEqual(1, self._stats(self.department1).headcount)
+        self.assertEqual(2, self._stats(self.department2).headcount)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_after_employee_delete(self):
+        """
+        Checks whether statistics are updated when an employee is deleted.
+        """
+        EmployeeService.delete_from_db(self.employee3)
+        stats = self._stats(self.department2)
+        self.assertEqual(0, stats.headcount)
+        self.assertIsNone(stats.salary_min)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_after_department_delete(self):
+        """
+        Checks whether statistics are removed together with the department.
+        """
+        db.session.delete(self.department1)
+        db.session.commit()
+        self.assertEqual(0, DepartmentStatsModel.query.filter_by(
+            department_id=self.department1.id).count())
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_stats_inserted_concurrently(self):
+        """
+        Checks whether statistics inserted by a concurrent transaction after they were
+        found missing get the changes instead of failing with a duplicate key.
+        """
+        employee = EmployeeModel('Ann Lee', date(1990, 3, 1), 1500)
+        employee.department = self.department2
+        with patch.object(DepartmentStatsService, '_find_for_update', return_value=None):
+            EmployeeService.save_to_db(employee)
+        stats = self._stats(self.department2)
+        self.assertEqual(2, stats.headcount)
+        self.assertEqual(1500, stats.salary_min)
+        self.assertEqual(2000, stats.salary_max)
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_check_consistency_and_rebuild(self):
+        """
+        Checks whether drifted statistics are reported and repaired by rebuild.
+        """
+        db.session.execute(STATS_TABLE.update().values(headcount=5))
+        db.session.commit()
+        differences = DepartmentStatsService.check_consistency()
+        self.assertIn((self.department1.id, 'headcount', 5, 2), differences)
+        self.assertEqual(2, DepartmentStatsService.rebuild())
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_cli_check(self):
+        """
+        Checks whether check command fails on drifted statistics and succeeds after rebuild.
+        """
+        runner = self.app.test_cli_runner()
+        db.session.execute(STATS_TABLE.delete())
+        db.session.commit()
+        result = runner.invoke(department_stats_cli, ['check'])
+        self.assertEqual(1, result.exit_code)
+        result = runner.invoke(department_stats_cli, ['rebuild'])
+        self.assertIn('Rebuilt statistics of 2 departments.', result.output)
+        result = runner.invoke(department_stats_cli, ['check'])
+        self.assertEqual(0, result.exit_code)
@@ -44,11 +44,36 @@ class TestEmployeeApi(BaseTestCase):
         """
         employees = [self.employee_1, self.employee_2]
         mock_get.return_value = employees
-        response = self.client.get('/api/employees')
+        response = self.client.get('/api/employees?all=true')
         mock_get.assert_called_once()
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(response.json, [emp_to_json(d) for d in mock_get.return_value])
 
+    def test_get_employees_pages(self):
+        """
+        Checks whether employees are returned page by page with a cursor of the next
+        page when performing get requests to /api/employees?limit={limit}&after={cursor}.
+        """
+        db.session.add_all([self.employee_1, self.employee_2])
+        db.session.commit()
+        response = self.client.get('/api/employees?limit=1')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json['items'], [emp_to_json(self.employee_1)])
+        cursor = response.json['next_cursor']
+        self.assertIsNotNone(cursor)
+        response = self.client.get(f'/api/employees?limit=1&after={cursor}')
+        self.assertEqual(response.json['items'], [emp_to_json(self.employee_2)])
+        self.assertIsNone(response.json['next_cursor'])
+
+    def test_get_employees_invalid_cursor(self):
+        """
+        Checks whether error message is returned with a status code 400 when
+        performing get request to /api/employees with a malformed cursor.
+        """
+        response = self.client.get('/api/employees?after=fake_cursor')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response.json, {'message': 'Not valid cursor'})
+
     @patch('department_app.rest.employee.employee_service.save_to_db', autospec=True)
     def test_post_success(self, mock_post):
         """
@@ -251,3 +276,36 @@ class TestEmployeeApi(BaseTestCase):
         mock_get.assert_called_once()
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(response.json, expected_value)
+
+    def test_patch_employee(self):
+        """
+        Checks whether patch request to /api/employees/<uuid> updates only supplied
+        fields and returns error messages with status codes 400 and 404.
+        """
+        self.employee_1.department = self.department
+        db.session.add(self.employee_1)
+        db.session.commit()
+        uuid = self.employee_1.uuid
+        response = self.client.patch(f'/api/employees/{uuid}',
+                                     data=json.dumps({'salary': 2500}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json['salary'], 2500)
+        self.assertEqual(response.json['name'], 'Joe Travis')
+        self.assertEqual(response.json['department'], 'Finance')
+        response = self.client.patch(f'/api/employees/{uuid}',
+                                     data=json.dumps({'department_uuid': None}),
+                                     content_type='application/json')
+        self.assertEqual(response.json['department'], 'Not added')
+        response = self.client.patch(f'/api/employees/{uuid}',
+                                     data=json.dumps({'department_uuid': 'fake_uuid'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.client.patch(f'/api/employees/{uuid}',
+                                     data=json.dumps({'salary': 'a lot'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.client.patch('/api/employees/fake_uuid',
+                                     data=json.dumps({'name': 'Joe'}),
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
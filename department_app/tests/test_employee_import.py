@@ -0,0 +1,171 @@
+"""
+This module is used to test bulk import of employees, it
+defines the following class:
+- TestEmployeeImport to test the employee import api and command
+"""
+import json
+import os
+import tempfile
+from http import HTTPStatus
+from unittest.mock import patch
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.employee_import import EmployeeImportService
+from department_app.cli import employees_cli
+
+
+class TestEmployeeImport(BaseTestCase):
+    """
+    Employee import test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        db.session.add(self.department)
+        db.session.commit()
+
+    def test_import_csv(self):
+        """
+        Checks whether employees from csv are created in batches with their departments
+        when performing post request to /api/employees/import.
+        """
+        data = 'name,birth_date,salary,department_uuid\n' \
+               f'Joe Travis,1996-05-12,2000,{self.department.uuid}\n' \
+               'Lisa Simons,1990-08-10,3500,\n' \
+               f'Dylan Miller,1991-09-02,2400,{self.department.uuid}\n'
+        response = self.client.post('/api/employees/import?batch_size=2', data=data,
+                                    content_type='text/csv')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, {'imported': 3, 'failed': 0, 'errors': []})
+        self.assertEqual(3, EmployeeModel.query.count())
+        self.assertEqual(2, len(DepartmentModel.query.first().employees))
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_import_ndjson_errors(self):
+        """
+        Checks whether invalid ndjson rows are skipped and reported by line while
+        valid ones are created when performing post request to /api/employees/import.
+        """
+        lines = [
+            json.dumps({'name': 'Joe Travis', 'birth_date': '1996-05-12', 'salary': 2000}),
+            '{not json',
+            json.dumps({'name': 'Lisa Simons', 'birth_date': '1990-08-10', 'salary': 'x'}),
+            json.dumps({'name': 'Dylan Miller', 'birth_date': '1991-09-02', 'salary': 2400,
+                        'department_uuid': 'fake_uuid'}),
+            json.dumps({'name': '   ', 'birth_date': '1991-09-02', 'salary': 2400})
+        ]
+        response = self.client.post('/api/employees/import', data='\n'.join(lines),
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(1, response.json['imported'])
+        self.assertEqual(4, response.json['failed'])
+        self.assertEqual([2, 3, 4, 5], [error['line'] for error in response.json['errors']])
+        self.assertEqual({'salary': ['Not a valid integer.']},
+                         response.json['errors'][1]['messages'])
+        self.assertEqual({'department_uuid': ['Department not found.']},
+                         response.json['errors'][2]['messages'])
+        self.assertEqual(1, EmployeeModel.query.count())
+
+    def test_import_ndjson_not_valid_utf8(self):
+        """
+        Checks whether ndjson rows which are not valid utf-8 or have a department uuid
+        which is not a string are reported by line when performing post request
+        to /api/employees/import.
+        """
+        data = b'{"name": "Joe Travis", "birth_date": "1996-05-12", "salary": 2000}\n' \
+               b'{"name": "Lisa \xff", "birth_date": "1990-08-10", "salary": 3500}\n' \
+               b'{"name": "Dylan Miller", "birth_date": "1991-09-02", "salary": 2400, ' \
+               b'"department_uuid": ["x"]}\n'
+        response = self.client.post('/api/employees/import', data=data,
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(1, response.json['imported'])
+        self.assertEqual([{'line': 2, 'messages': ['Not valid utf-8.']},
+                          {'line': 3, 'messages': {'department_uuid': ['Not a valid string.']}}],
+                         response.json['errors'])
+
+    def test_import_csv_malformed_rows(self):
+        """
+        Checks whether csv rows which are not valid utf-8 or contain a nul byte are
+        reported by line when performing post request to /api/employees/import.
+        """
+        data = b'name,birth_date,salary,department_uuid\n' \
+               b'Joe Travis,1996-05-12,2000,\n' \
+               b'Lisa \xff,1990-08-10,3500,\n' \
+               b'Dylan\x00 Miller,1991-09-02,2400,\n' \
+               b'Ann Smith,1992-01-03,2600,\n'
+        response = self.client.post('/api/employees/import', data=data,
+                                    content_type='text/csv')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(2, response.json['imported'])
+        self.assertEqual([3, 4], [error['line'] for error in response.json['errors']])
+        self.assertEqual(['Not valid utf-8.'], response.json['errors'][0]['messages'])
+        self.assertEqual(2, EmployeeModel.query.count())
+
+    def test_import_csv_malformed_header(self):
+        """
+        Checks whether error message is returned with a status code 400 when performing
+        post request to /api/employees/import with a csv header which can not be parsed.
+        """
+        for header in (b'name,birth_\x00date,salary\n', b'name,birth_date,\xffsalary\n'):
+            response = self.client.post('/api/employees/import',
+                                        data=header + b'Joe Travis,1996-05-12,2000\n',
+                                        content_type='text/csv')
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(0, EmployeeModel.query.count())
+
+    def test_import_constraint_violation(self):
+        """
+        Checks whether all the rows of a batch violating a database constraint are
+        reported while other batches are created when performing post request
+        to /api/employees/import.
+        """
+        data = 'name,birth_date,salary,department_uuid\n' \
+               'Joe Travis,1996-05-12,2000,\n' \
+               f'Lisa Simons,1990-08-10,3500,{self.department.uuid}\n'
+        with patch.object(EmployeeImportService, '_find_department_ids',
+                          side_effect=lambda uuids: {value: -1 for value in uuids}):
+            response = self.client.post('/api/employees/import?batch_size=1', data=data,
+                                        content_type='text/csv')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(1, response.json['imported'])
+        self.assertEqual([3], [error['line'] for error in response.json['errors']])
+        self.assertEqual(1, EmployeeModel.query.count())
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_import_unsupported_type(self):
+        """
+        Checks whether error message is returned with a status code 415 when
+        performing post request to /api/employees/import with unsupported content type.
+        """
+        response = self.client.post('/api/employees/import', data='[]',
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+
+    def test_import_command(self):
+        """
+        Checks whether employees are created from a csv file by the import command.
+        """
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as file:
+            file.write('name,birth_date,salary,department_uuid\n'
+                       f'Joe Travis,1996-05-12,2000,{self.department.uuid}\n'
+                       'Lisa Simons,1990-13-10,3500,\n')
+        try:
+            result = self.app.test_cli_runner().invoke(
+                employees_cli, ['import', path, '--batch-size', '1'])
+        finally:
+            os.remove(path)
+        self.assertEqual(0, result.exit_code)
+        self.assertIn('Imported 1 employees, 1 failed.', result.output)
+        self.assertIn('Line 3', result.output)
+        self.assertEqual(1, EmployeeModel.query.count())
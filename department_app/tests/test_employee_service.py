@@ -129,3 +129,14 @@ class TestEmployeeService(BaseTestCase):
                              datetime(1999, 7, 13, 0, 0),
                              datetime(2020, 8, 4, 0, 0))
                          )
+
+    def test_find_by_birth_period_ordered_by_birth_date(self):
+        """
+        Checks whether the employees born in the period between dates are
+        returned ordered by their birth dates.
+        """
+        self.assertEqual([self.employee2, self.employee1],
+                         self.employee_service.find_by_birth_period(
+                             datetime(1980, 1, 1, 0, 0),
+                             datetime(1996, 5, 7, 0, 0))
+                         )
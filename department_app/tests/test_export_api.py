@@ -0,0 +1,82 @@
+"""
+This module is used to test streaming export api, it
+defines the following class:
+- TestExportApi to test the employee and department export functionality
+"""
+import csv
+import io
+import json
+from datetime import date
+from http import HTTPStatus
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.tests.serialization_funcs import emp_to_json
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+
+
+class TestExportApi(BaseTestCase):
+    """
+    Export Api test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        self.employee_1 = EmployeeModel('Joe Travis', date(1996, 5, 12), 2000)
+        self.employee_2 = EmployeeModel('Lisa Simons', date(1990, 8, 10), 3500)
+        self.department.employees = [self.employee_1]
+        db.session.add_all([self.department, self.employee_2])
+        db.session.commit()
+
+    def test_export_employees_ndjson(self):
+        """
+        Checks whether employees are streamed as ndjson with the same representation
+        as the employee api when performing get request to /api/employees/export.
+        """
+        response = self.client.get('/api/employees/export')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        employees = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(employees, [emp_to_json(self.employee_1), emp_to_json(self.employee_2)])
+
+    def test_export_employees_csv(self):
+        """
+        Checks whether employees are streamed as csv when performing get request
+        to /api/employees/export?format=csv.
+        """
+        response = self.client.get('/api/employees/export?format=csv')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(2, len(rows))
+        self.assertEqual('Finance', rows[0]['department'])
+        self.assertEqual('Not added', rows[1]['department'])
+
+    def test_export_departments(self):
+        """
+        Checks whether departments are streamed with employees statistics when
+        performing get request to /api/departments/export.
+        """
+        response = self.client.get('/api/departments/export')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        departments = [json.loads(line)
+                       for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(1, len(departments))
+        self.assertEqual(self.department.uuid, departments[0]['uuid'])
+        self.assertEqual(1, departments[0]['employees_count'])
+        self.assertEqual(2000, departments[0]['average_salary'])
+
+    def test_export_invalid_format(self):
+        """
+        Checks whether error is returned with a status code 400 when performing get
+        request to /api/employees/export with unknown format.
+        """
+        response = self.client.get('/api/employees/export?format=xml')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,102 @@
+"""
+This module is used to test the logging pipeline, it defines the following class:
+- TestLogs to test queued logging, deferred formatting and shared file rotation
+"""
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from department_app import create_app
+from department_app.logs import (
+    SharedRotatingFileHandler, init_logging, log_listener, parse_levels)
+
+
+# pylint: disable=too-few-public-methods
+class Formatted:
+    """
+    Log argument remembering threads it has been formatted in.
+    """
+    def __init__(self):
+        """
+        Constructor of Formatted class.
+        """
+        self.threads = []
+
+    def __str__(self):
+        """
+        Remembers the current thread.
+        :return: string representation
+        """
+        self.threads.append(threading.current_thread().name)
+        return 'formatted'
+
+
+class TestLogs(unittest.TestCase):
+    """
+    Logging test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+
+    def tearDown(self):
+        """
+        Defines instructions that will be executed after each test.
+        """
+        log_listener.stop()
+        create_app()
+        shutil.rmtree(self.directory)
+
+    def test_deferred_formatting(self):
+        """
+        Checks whether messages of disabled levels are not formatted and messages of
+        enabled levels are formatted and written by the listener thread.
+        """
+        app = create_app()
+        app.config.update(LOG_FILE=self.path, LOG_LEVEL='INFO')
+        init_logging(app)
+        logger = logging.getLogger('department_app')
+        disabled, argument = Formatted(), Formatted()
+        logger.debug('Disabled %s', disabled)
+        logger.info('Enabled %s', argument)
+        log_listener.stop()
+        self.assertEqual([], disabled.threads)
+        self.assertTrue(argument.threads)
+        self.assertNotIn(threading.current_thread().name, argument.threads)
+        with open(self.path, encoding='utf-8') as log_file:
+            self.assertIn('INFO - department_app - Enabled formatted', log_file.read())
+
+    def test_shared_rotation(self):
+        """
+        Checks whether handlers of several processes writing the same file rotate it
+        without losing records.
+        """
+        handlers = [SharedRotatingFileHandler(self.path, max_bytes=200, backup_count=50)
+                    for _ in range(2)]
+        for number in range(40):
+            handlers[number % 2].emit(logging.makeLogRecord(
+                {'msg': 'record %03d', 'args': (number,)}))
+        for handler in handlers:
+            handler.close()
+        lines = []
+        for path in glob.glob(f'{self.path}*'):
+            if not path.endswith('.lock'):
+                with open(path, encoding='utf-8') as log_file:
+                    lines.extend(log_file.read().split())
+        self.assertGreater(len(glob.glob(f'{self.path}.*')), 2)
+        self.assertEqual([f'{number:03d}' for number in range(40)],
+                         sorted(line for line in lines if line != 'record'))
+
+    def test_parse_levels(self):
+        """
+        Checks whether levels of particular loggers are parsed.
+        """
+        self.assertEqual({'sqlalchemy': 'WARNING', 'werkzeug': 'INFO'},
+                         parse_levels('sqlalchemy=warning, werkzeug=INFO,,broken'))
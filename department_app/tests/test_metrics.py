@@ -0,0 +1,119 @@
+"""
+This module is used to test request metrics, it defines the following class:
+- TestMetrics to test per-resource metrics, their exposition and worker aggregation
+"""
+import json
+import os
+import tempfile
+from http import HTTPStatus
+
+from department_app.extensions import db
+from department_app.metrics import RequestMetrics, merge_snapshots, request_metrics
+from department_app.models.department import DepartmentModel
+from department_app.tests.testconf import BaseTestCase
+
+
+class TestMetrics(BaseTestCase):
+    """
+    Request metrics test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        request_metrics.registry.clear()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        db.session.add(self.department)
+        db.session.commit()
+
+    def test_request_metrics(self):
+        """
+        Checks whether latency, status and database queries of requests are exposed by
+        resource and method.
+        """
+        self.client.get('/api/departments')
+        self.client.get('/api/departments/unknown')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        labels = 'resource="DepartmentList",method="get"'
+        self.assertIn('# TYPE department_app_request_duration_seconds histogram', text)
+        self.assertIn(f'department_app_request_duration_seconds_count{{{labels}}} 1', text)
+        self.assertIn(f'department_app_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+                      text)
+        self.assertIn(f'department_app_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn('department_app_requests_total{resource="Department",method="get",'
+                      'status="404"} 1', text)
+        self.assertIn(f'department_app_requests_in_flight{{{labels}}} 0', text)
+        self.assertIn('department_app_db_pool_checkouts_total', text)
+        self.assertIn('# TYPE department_app_db_pool_limit gauge', text)
+        queries = next(line for line in text.splitlines() if line.startswith(
+            f'department_app_request_db_queries_total{{{labels}}}'))
+        self.assertGreater(int(queries.split()[-1]), 0)
+
+    def test_worker_aggregation(self):
+        """
+        Checks whether counters of all workers are summed and gauges of exited workers
+        are dropped.
+        """
+        labels = [['resource', 'DepartmentList'], ['method', 'get']]
+        snapshot = {'counters': [['requests_total', labels, 2]],
+                    'gauges': [['requests_in_flight', labels, 1]],
+                    'histograms': [['request_duration_seconds', labels, [1, 2, 3]]]}
+        counters, gauges, histograms = merge_snapshots(
+            [(os.getpid(), snapshot), (2 ** 22 + 1, snapshot)])
+        key = tuple(map(tuple, labels))
+        self.assertEqual(4, counters[('requests_total', key)])
+        self.assertEqual(1, gauges[('requests_in_flight', key)])
+        self.assertEqual([2, 4, 6], histograms[('request_duration_seconds', key)])
+
+    def test_metrics_directory(self):
+        """
+        Checks whether metrics of the process are written to the shared directory and
+        metrics of other workers are read from it.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            request_metrics.directory = directory
+            try:
+                with open(os.path.join(directory, 'metrics_1.json'), 'w',
+                          encoding='utf-8') as metrics_file:
+                    json.dump({'counters': [['requests_total', [['resource', 'Employee'],
+                                                                ['method', 'get']], 5]],
+                               'gauges': [], 'histograms': []}, metrics_file)
+                self.client.get('/api/departments')
+                text = self.client.get('/metrics').get_data(as_text=True)
+                self.assertTrue(any(filename.startswith(f'metrics_{os.getpid()}_')
+                                    for filename in os.listdir(directory)))
+            finally:
+                request_metrics.directory = None
+        self.assertIn('department_app_requests_total{resource="Employee",method="get"} 5', text)
+        self.assertIn('department_app_requests_total{resource="DepartmentList",method="get",'
+                      'status="200"} 1', text)
+
+    def test_reused_pid(self):
+        """
+        Checks whether a worker with the process id of an exited worker writes its own
+        file, keeping counters of the exited worker and dropping its gauges.
+        """
+        labels = [['resource', 'Employee'], ['method', 'get']]
+        with tempfile.TemporaryDirectory() as directory:
+            exited = os.path.join(directory, f'metrics_{os.getpid()}_exited.json')
+            with open(exited, 'w', encoding='utf-8') as metrics_file:
+                json.dump({'counters': [['requests_total', labels, 5]],
+                           'gauges': [['requests_in_flight', labels, 1]],
+                           'histograms': []}, metrics_file)
+            metrics = RequestMetrics()
+            metrics.directory = directory
+            metrics.flush()
+            self.assertEqual(2, len(os.listdir(directory)))
+            with open(exited, encoding='utf-8') as metrics_file:
+                snapshot = json.load(metrics_file)
+            text = metrics.render()
+        self.assertEqual([], snapshot['gauges'])
+        self.assertEqual([['requests_total', labels, 5]], snapshot['counters'])
+        self.assertIn('department_app_requests_total{resource="Employee",method="get"} 5', text)
+        self.assertNotIn('department_app_requests_in_flight{resource="Employee"', text)
@@ -0,0 +1,91 @@
+"""
+This module is used to test query instrumentation, it defines the following class:
+- TestQueries to test normalization, slow query log and N+1 detection
+"""
+from datetime import date
+from unittest.mock import patch
+
+from department_app.extensions import db, logger
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.queries import normalize_sql, query_instrumentation
+from department_app.tests.testconf import BaseTestCase
+
+
+class TestQueries(BaseTestCase):
+    """
+    Query instrumentation test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.app.add_url_rule('/lazy', 'lazy', self._lazy_view)
+        self.client = self.app.test_client()
+        for number in range(5):
+            department = DepartmentModel(f'Department {number}', 'Some department.')
+            department.employees = [EmployeeModel(f'Employee {number}', date(1990, 1, 1), 1000)]
+            db.session.add(department)
+        db.session.commit()
+        db.session.remove()
+
+    def tearDown(self):
+        """
+        Defines instructions that will be executed after each test.
+        """
+        query_instrumentation.slow_query_threshold = self.app.config['SLOW_QUERY_THRESHOLD']
+        query_instrumentation.n_plus_one_threshold = self.app.config['N_PLUS_ONE_THRESHOLD']
+        super().tearDown()
+
+    @staticmethod
+    def _lazy_view():
+        """
+        Loads employees of every department one by one.
+        :return: number of the employees
+        """
+        return str(sum(len(department.employees) for department in DepartmentModel.query))
+
+    def test_normalize_sql(self):
+        """
+        Checks whether literals, placeholders, lists of values and whitespace are
+        normalized.
+        """
+        self.assertEqual(
+            'SELECT * FROM employee WHERE salary > ? AND name = ? AND id IN (?)',
+            normalize_sql("SELECT *\n  FROM employee WHERE salary > 1000.5 AND "
+                          "name = 'O''Neil' AND id IN (%s, %s, %s)"))
+
+    def test_n_plus_one_logged(self):
+        """
+        Checks whether a statement repeated for every row of a request is logged as
+        a probable N+1 query.
+        """
+        query_instrumentation.n_plus_one_threshold = 5
+        with self.assertLogs('department_app', 'WARNING') as logs:
+            self.assertEqual('5', self.client.get('/lazy').get_data(as_text=True))
+        self.assertEqual(1, len(logs.output))
+        self.assertIn('Probable N+1 query in GET /lazy, executed 5 times: SELECT', logs.output[0])
+        self.assertIn('FROM employee', logs.output[0])
+
+    def test_requests_counted_separately(self):
+        """
+        Checks whether statements of consecutive requests sharing an application context
+        are not added up.
+        """
+        query_instrumentation.n_plus_one_threshold = 8
+        with patch.object(logger, 'warning') as warning:
+            self.client.get('/lazy')
+            self.client.get('/lazy')
+        warning.assert_not_called()
+
+    def test_slow_query_logged(self):
+        """
+        Checks whether statements over the threshold are logged with normalized SQL.
+        """
+        query_instrumentation.slow_query_threshold = 1e-9
+        with self.assertLogs('department_app.slow_query', 'WARNING') as logs:
+            DepartmentModel.query.filter_by(name='Department 1').first()
+        self.assertRegex(logs.output[0], r'Slow query \d+\.\d{3}s: SELECT .* WHERE '
+                                         r'department\.name = \? LIMIT \? OFFSET \?')
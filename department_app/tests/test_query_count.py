@@ -0,0 +1,192 @@
+"""
+This module is used to test the number of database queries issued by the
+read and partial update endpoints, it defines the following class:
+- TestQueryCount to check that the query count does not grow with the row count
+"""
+import json
+from datetime import date
+
+from department_app.extensions import db, response_cache
+from department_app.queries import capture_queries, query_budget
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.department_stats import DepartmentStatsService
+
+
+class TestQueryCount(BaseTestCase):
+    """
+    Query count test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.statements = []
+
+    @staticmethod
+    def _seed(departments_count, employees_per_department):
+        """
+        Saves given amount of departments with their employees to the database.
+        :param departments_count: number of departments to create
+        :param employees_per_department: number of employees in each department
+        """
+        start = DepartmentModel.query.count()
+        for number in range(start, start + departments_count):
+            department = DepartmentModel(f'Department {number}', 'Some department.')
+            department.employees = [
+                EmployeeModel(f'Employee {number}-{index}', date(1990, 1, 1), 1000 + index)
+                for index in range(employees_per_department)
+            ]
+            db.session.add(department)
+        db.session.commit()
+        db.session.expunge_all()
+
+    def _count_queries(self, url):
+        """
+        Performs get request to given url and returns the number of executed queries.
+        :param url: url to request
+        :return: amount of the queries
+        """
+        response_cache.clear()
+        with capture_queries() as stats:
+            response = self.client.get(url)
+            self.assertEqual(200, response.status_code)
+            db.session.remove()
+        self.statements = stats.statements
+        return len(self.statements)
+
+    def _patch(self, url, data):
+        """
+        Performs patch request to given url and returns the executed statements.
+        :param url: url to request
+        :param data: patched fields
+        :return: list of the statements
+        """
+        with capture_queries() as stats:
+            response = self.client.patch(url, data=json.dumps(data),
+                                         content_type='application/json')
+            self.assertEqual(200, response.status_code)
+            db.session.remove()
+        return stats.statements
+
+    def test_departments_list_query_count_is_constant(self):
+        """
+        Checks whether the number of queries performed by get request to
+        /api/departments does not depend on the number of departments and employees.
+        """
+        self._seed(2, 2)
+        small = self._count_queries('/api/departments?all=true')
+        self._seed(20, 5)
+        large = self._count_queries('/api/departments?all=true')
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 4)
+
+    def test_departments_list_query_budget(self):
+        """
+        Checks whether get request to /api/departments stays within its query budget
+        and whether exceeding a budget fails with the executed statements.
+        """
+        self._seed(10, 10)
+        with query_budget(3):
+            self.assertEqual(200, self.client.get('/api/departments').status_code)
+        response_cache.clear()
+        with self.assertRaisesRegex(AssertionError, 'budget is 1:\nSELECT'):
+            with query_budget(1):
+                self.client.get('/api/departments')
+
+    def test_departments_page_skips_employees(self):
+        """
+        Checks whether get request to /api/departments with default arguments does not
+        load employees and only selects requested columns when fields are given.
+        """
+        self._seed(5, 5)
+        self.assertEqual(3, self._count_queries('/api/departments'))
+        self.assertFalse(any('FROM employee' in statement for statement in self.statements))
+        self._count_queries('/api/departments?fields=uuid,name&include=')
+        self.assertEqual(2, len(self.statements))
+        self.assertNotIn('department.description', self.statements[-1])
+
+    def test_department_detail_query_count_is_constant(self):
+        """
+        Checks whether the number of queries performed by get request to
+        /api/departments/<uuid> does not depend on the number of employees.
+        """
+        self._seed(1, 1)
+        small_uuid = DepartmentModel.query.first().uuid
+        small = self._count_queries(f'/api/departments/{small_uuid}')
+        self._seed(1, 30)
+        large_uuid = DepartmentModel.query.filter_by(name='Department 1').first().uuid
+        large = self._count_queries(f'/api/departments/{large_uuid}')
+        self.assertEqual(small, large)
+        self.assertEqual(2, large)
+
+    def test_employees_list_query_count_is_constant(self):
+        """
+        Checks whether the number of queries performed by get request to
+        /api/employees does not depend on the number of employees and departments.
+        """
+        self._seed(2, 2)
+        small = self._count_queries('/api/employees?all=true')
+        self._seed(20, 5)
+        large = self._count_queries('/api/employees?all=true')
+        self.assertEqual(small, large)
+        self.assertEqual(2, large)
+
+    def test_department_patch_single_update(self):
+        """
+        Checks whether patch request to /api/departments/<uuid> updates the supplied
+        column by a single statement without loading employees.
+        """
+        self._seed(1, 10)
+        uuid = DepartmentModel.query.first().uuid
+        statements = self._patch(f'/api/departments/{uuid}', {'description': 'Patched.'})
+        updates = [statement for statement in statements
+                   if statement.startswith('UPDATE department ')]
+        self.assertEqual(['UPDATE department SET description=? WHERE department.uuid = ?'],
+                         updates)
+        self.assertFalse(any('FROM employee' in statement for statement in statements))
+        self.assertLessEqual(len(statements), 3)
+        self.assertEqual('Patched.', DepartmentModel.query.first().description)
+
+    def test_employee_patch_single_update(self):
+        """
+        Checks whether patch request to /api/employees/<uuid> updates the supplied
+        columns by a single statement and keeps department statistics consistent.
+        """
+        self._seed(2, 3)
+        employee = EmployeeModel.query.first()
+        uuid, other = employee.uuid, DepartmentModel.query.all()[1].uuid
+        statements = self._patch(f'/api/employees/{uuid}', {'name': 'Patched'})
+        self.assertEqual(1, sum(statement.startswith('UPDATE employee ')
+                                for statement in statements))
+        self.assertLessEqual(len(statements), 3)
+        statements = self._patch(f'/api/employees/{uuid}',
+                                 {'salary': 5000, 'department_uuid': other})
+        self.assertEqual(['UPDATE employee SET salary=?, department_id=? '
+                          'WHERE employee.uuid = ?'],
+                         [statement for statement in statements
+                          if statement.startswith('UPDATE employee ')])
+        employee = EmployeeModel.query.filter_by(uuid=uuid).first()
+        self.assertEqual(('Patched', 5000, other),
+                         (employee.name, employee.salary, employee.department.uuid))
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+
+    def test_department_delete_cascades_in_database(self):
+        """
+        Checks whether delete request to /api/departments/<uuid> deletes employees by
+        the database cascade without loading and deleting them one by one.
+        """
+        self._seed(2, 20)
+        uuid = DepartmentModel.query.first().uuid
+        with capture_queries() as stats:
+            response = self.client.delete(f'/api/departments/{uuid}')
+            self.assertEqual(204, response.status_code)
+            db.session.remove()
+        self.assertFalse(any(statement.startswith('DELETE FROM employee')
+                             for statement in stats.statements))
+        self.assertEqual(20, EmployeeModel.query.count())
+        self.assertEqual([], DepartmentStatsService.check_consistency())
@@ -0,0 +1,111 @@
+"""
+This module is used to test routing of reads to read replicas, it
+defines the following class:
+- TestReplicaRouting to test reads of GET requests from a replica database
+"""
+import json
+import os
+import tempfile
+from http import HTTPStatus
+from unittest.mock import patch
+
+from department_app.extensions import db, response_cache
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.service.department import DepartmentService
+
+
+class TestReplicaRouting(BaseTestCase):
+    """
+    Replica routing test class, a second sqlite file stands in for the replica.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        handle, self.replica_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.app.config['SQLALCHEMY_BINDS'] = {'replica_0': f'sqlite:///{self.replica_path}'}
+        self.app.config['SQLALCHEMY_REPLICA_BINDS'] = ['replica_0']
+        self.replica = db.get_engine(self.app, bind='replica_0')
+        db.Model.metadata.create_all(self.replica)
+        department = DepartmentModel('Finance', 'Some finance department.')
+        db.session.add(department)
+        db.session.commit()
+        self.uuid = department.uuid
+        with self.replica.begin() as connection:
+            connection.execute(DepartmentModel.__table__.insert(), {
+                'uuid': self.uuid, 'name': 'Finance replica',
+                'description': 'Some finance department.'})
+        db.session.remove()
+        response_cache.clear()
+
+    def tearDown(self):
+        """
+        Defines instructions that will be executed after each test.
+        """
+        super().tearDown()
+        self.replica.dispose()
+        os.remove(self.replica_path)
+
+    def test_get_reads_replica(self):
+        """
+        Checks whether get requests read departments from the replica.
+        """
+        response = self.client.get(f'/api/departments/{self.uuid}')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual('Finance replica', response.json['name'])
+        response = self.client.get('/api/departments?include=')
+        self.assertEqual('Finance replica', response.json['items'][0]['name'])
+
+    def test_write_uses_primary(self):
+        """
+        Checks whether put request reads and writes the primary database.
+        """
+        data = {'name': 'Marketing', 'description': 'Some marketing department.'}
+        response = self.client.put(f'/api/departments/{self.uuid}',
+                                   data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual('Marketing', DepartmentModel.query.first().name)
+        with self.replica.connect() as connection:
+            names = connection.execute(DepartmentModel.__table__.select()).all()
+        self.assertEqual('Finance replica', names[0].name)
+
+    def test_read_after_write_uses_primary(self):
+        """
+        Checks whether reads of a request go to the primary after it has written
+        and to the replica again in the next request.
+        """
+        with self.app.test_request_context(method='GET'):
+            self.assertEqual('Finance replica', DepartmentService.find_by_uuid(self.uuid).name)
+            db.session.remove()
+            DepartmentService.save_to_db(DepartmentModel('Sales', 'Some sales department.'))
+            self.assertEqual('Finance', DepartmentService.find_by_uuid(self.uuid).name)
+            self.assertIsNotNone(DepartmentService.find_by_name('Sales'))
+        db.session.remove()
+        with self.app.test_request_context(method='GET'):
+            self.assertIsNone(DepartmentService.find_by_name('Sales'))
+
+    def test_replica_chosen_once_per_request(self):
+        """
+        Checks whether all the reads of a request go to the same replica and the next
+        request chooses its replica again.
+        """
+        self.app.config['SQLALCHEMY_BINDS']['replica_1'] = f'sqlite:///{self.replica_path}'
+        self.app.config['SQLALCHEMY_REPLICA_BINDS'] = ['replica_0', 'replica_1']
+        with patch('department_app.routing.random.choice', return_value='replica_1') \
+                as mock_choice:
+            with self.app.test_request_context(method='GET'):
+                for _ in range(3):
+                    self.assertEqual('Finance replica',
+                                     DepartmentService.find_by_uuid(self.uuid).name)
+                    db.session.expire_all()
+                mock_choice.assert_called_once()
+                self.assertEqual('replica_1', db.session.info['replica'])
+            with self.app.test_request_context(method='GET'):
+                DepartmentService.find_by_uuid(self.uuid)
+            self.assertEqual(2, mock_choice.call_count)
+        db.get_engine(self.app, bind='replica_1').dispose()
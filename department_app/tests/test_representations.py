@@ -0,0 +1,150 @@
+"""
+This module is used to test json and msgpack representations of api responses, it
+defines the following classes:
+- TestJsonRepresentation to test json encoder backends and output format
+- TestMsgpackRepresentation to test msgpack responses and request bodies
+"""
+import json
+import unittest
+import uuid
+from datetime import date, datetime
+from http import HTTPStatus
+from unittest.mock import patch
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.representations import (
+    dumps_orjson, dumps_stdlib, json_backend, msgpack, orjson)
+
+
+class TestJsonRepresentation(BaseTestCase):
+    """
+    Json representation test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        db.session.add(DepartmentModel('Finance', 'Some finance department.'))
+        db.session.commit()
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_backends_encode_same_data(self):
+        """
+        Checks whether orjson and stdlib backends encode dates and uuids the same way.
+        """
+        data = {'uuid': uuid.UUID(int=1), 'birth_date': date(1996, 5, 12),
+                'created': datetime(2021, 1, 2, 3, 4, 5), 'names': ['Joe', 'Лiза'], 'salary': 2.5}
+        self.assertEqual(json.loads(dumps_stdlib(data)), json.loads(dumps_orjson(data)))
+        self.assertEqual('1996-05-12', json.loads(dumps_stdlib(data))['birth_date'])
+        self.assertEqual(json.loads(dumps_orjson(data)),
+                         json.loads(dumps_orjson(data, compact=False)))
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_backends_encode_same_output(self):
+        """
+        Checks whether orjson and stdlib backends produce the same bytes, both compact
+        and indented.
+        """
+        data = {'uuid': uuid.UUID(int=1), 'birth_date': date(1996, 5, 12),
+                'names': ['Joe', 'Лiза'], 'employees': [], 'stats': {'salary': 2.5}}
+        self.assertEqual(dumps_stdlib(data), dumps_orjson(data))
+        self.assertEqual(dumps_stdlib(data, compact=False), dumps_orjson(data, compact=False))
+
+    def test_auto_backend_falls_back_to_stdlib(self):
+        """
+        Checks whether stdlib backend is chosen when orjson is not installed.
+        """
+        self.assertIs(dumps_stdlib if orjson is None else dumps_orjson, json_backend('auto'))
+        self.assertIs(dumps_stdlib, json_backend('stdlib'))
+        with patch('department_app.representations.orjson', None):
+            self.assertIs(dumps_stdlib, json_backend('auto'))
+            with self.assertRaises(RuntimeError):
+                json_backend('orjson')
+
+    def test_compact_output(self):
+        """
+        Checks whether responses are compact unless debug mode or JSON_COMPACT say otherwise.
+        """
+        self.app.config['JSON_COMPACT'] = True
+        response = self.client.get('/api/departments?all=true')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertNotIn(b'\n ', response.data)
+        self.assertNotIn(b'": ', response.data)
+        self.app.config['JSON_COMPACT'] = False
+        self.app.config['JSON_BACKEND'] = 'stdlib'
+        response = self.client.get('/api/departments?all=true&include=')
+        self.assertIn(b'\n  {', response.data)
+        self.assertEqual('Finance', response.json[0]['name'])
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class TestMsgpackRepresentation(BaseTestCase):
+    """
+    Msgpack representation test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        self.department.employees = [EmployeeModel('Joe Travis', date(1996, 5, 12), 2000)]
+        db.session.add(self.department)
+        db.session.commit()
+
+    def test_get_msgpack(self):
+        """
+        Checks whether list and detail responses are encoded as msgpack with the same
+        data as json when performing get requests with Accept: application/msgpack.
+        """
+        for url in ('/api/employees', f'/api/departments/{self.department.uuid}'):
+            response = self.client.get(url, headers={'Accept': 'application/msgpack'})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(response.content_type, 'application/msgpack')
+            self.assertEqual(self.client.get(url).json,
+                             msgpack.unpackb(response.data, raw=False))
+
+    def test_json_is_default(self):
+        """
+        Checks whether json is returned when msgpack is not requested.
+        """
+        response = self.client.get('/api/employees', headers={'Accept': '*/*'})
+        self.assertEqual(response.content_type, 'application/json')
+
+    def test_post_and_put_msgpack(self):
+        """
+        Checks whether msgpack request bodies are accepted by post and put requests.
+        """
+        body = msgpack.packb({'name': 'Marketing', 'description': 'Some marketing department.'})
+        response = self.client.post('/api/departments', data=body,
+                                    content_type='application/msgpack',
+                                    headers={'Accept': 'application/msgpack'})
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        department = msgpack.unpackb(response.data, raw=False)
+        self.assertEqual('Marketing', department['name'])
+        body = msgpack.packb({'name': 'Joe Smith', 'birth_date': '1996-05-12', 'salary': 2500})
+        employee_uuid = self.department.employees[0].uuid
+        response = self.client.put(
+            f'/api/employees/{employee_uuid}?department_uuid={department["uuid"]}',
+            data=body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual('Joe Smith', response.json['name'])
+        self.assertEqual('Marketing', response.json['department'])
+
+    def test_post_invalid_msgpack(self):
+        """
+        Checks whether error message is returned with a status code 400 when
+        request body is not valid msgpack.
+        """
+        response = self.client.post('/api/employees', data=b'\xc1\x00',
+                                    content_type='application/msgpack')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,86 @@
+"""
+This module is used to test generation of synthetic data, it defines the following class:
+- TestSeed to test the seed service and the flask seed command
+"""
+import uuid
+from collections import Counter
+from unittest.mock import patch
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+from department_app.cli import seed_cli
+from department_app.extensions import db
+from department_app.models.department import DepartmentModel
+from department_app.models.employee import EmployeeModel
+from department_app.service.department_stats import DepartmentStatsService
+from department_app.service.seed import SeedService
+from department_app.service.table_version import TableVersionService
+from department_app.tests.testconf import BaseTestCase
+
+
+class TestSeed(BaseTestCase):
+    """
+    Seed test class.
+    """
+    def test_seed(self):
+        """
+        Checks whether departments and employees are inserted with valid values, skewed
+        department sizes, consistent statistics and increased table versions.
+        """
+        SeedService.seed(10, 2000, skew=1.5, batch_size=300, seed=1)
+        employees = EmployeeModel.query.all()
+        self.assertEqual(10, DepartmentModel.query.count())
+        self.assertEqual(2000, len(employees))
+        self.assertEqual(2000, len({employee.uuid for employee in employees}))
+        self.assertTrue(all(uuid.UUID(employee.uuid).version == 4 for employee in employees))
+        self.assertTrue(all(500 <= employee.salary <= 20000 for employee in employees))
+        self.assertTrue(all(18 <= employee.age <= 66 for employee in employees))
+        sizes = sorted(Counter(employee.department_id for employee in employees).values())
+        self.assertGreater(sizes[-1], 5 * sizes[0])
+        self.assertEqual([], DepartmentStatsService.check_consistency())
+        versions = TableVersionService.find_versions(['department', 'employee'])
+        self.assertEqual([1, 1], [version for version, _ in versions.values()])
+        self.assertEqual(self._index_names(), {
+            index.name for index in EmployeeModel.__table__.indexes})
+
+    @staticmethod
+    def _index_names():
+        """
+        Returns names of the indexes of the employee table in the database.
+        :return: set of index names
+        """
+        return {index['name'] for index in inspect(db.engine).get_indexes('employee')}
+
+    def test_seed_failure_restores_indexes(self):
+        """
+        Checks whether indexes dropped for the insert are created again when it fails
+        and indexes starting with foreign key columns are never dropped.
+        """
+        indexes = self._index_names()
+        dropped = SeedService._drop_indexes()  # pylint: disable=protected-access
+        self.assertEqual(['ix_employee_birth_date'], [index.name for index in dropped])
+        for index in dropped:
+            index.create(db.engine)
+        with patch('department_app.service.seed.insert_employees',
+                   side_effect=OperationalError('INSERT', {}, Exception('disk full'))):
+            with self.assertRaises(OperationalError):
+                SeedService.seed(2, 10, seed=1)
+        self.assertEqual(indexes, self._index_names())
+
+    def test_seed_command(self):
+        """
+        Checks whether flask seed command appends departments and employees and deletes
+        the existing ones with the truncate option.
+        """
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(seed_cli, ['--departments', '3', '--employees', '50'])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn('Inserted 3 departments and 50 employees', result.output)
+        runner.invoke(seed_cli, ['--departments', '2', '--employees', '20'])
+        self.assertEqual(5, DepartmentModel.query.count())
+        result = runner.invoke(seed_cli, ['--departments', '2', '--employees', '20',
+                                          '--truncate', '--seed', '7'])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual((2, 20), (DepartmentModel.query.count(), EmployeeModel.query.count()))
+        self.assertEqual([], DepartmentStatsService.check_consistency())
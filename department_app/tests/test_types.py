@@ -0,0 +1,76 @@
+"""
+This module is used to test custom column types, it defines the following class:
+- TestBinaryUUID to test uuids stored as 16 bytes
+"""
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.exc import StatementError
+
+from department_app.extensions import db
+from department_app.tests.testconf import BaseTestCase
+from department_app.models.department import DepartmentModel
+from department_app.service.department import DepartmentService
+
+
+class TestBinaryUUID(BaseTestCase):
+    """
+    Binary uuid column type test class.
+    """
+    def setUp(self) -> None:
+        """
+        Defines instructions that will be executed before each test.
+        """
+        super().setUp()
+        self.department = DepartmentModel('Finance', 'Some finance department.')
+        db.session.add(self.department)
+        db.session.commit()
+
+    def test_uuid_stored_as_bytes(self):
+        """
+        Checks whether uuid is stored as 16 bytes and loaded as a canonical string.
+        """
+        raw = db.session.execute(
+            select(DepartmentModel.__table__.c.uuid.cast(db.LargeBinary))).scalar()
+        self.assertEqual(16, len(raw))
+        self.assertEqual(str(uuid.UUID(bytes=raw)), self.department.uuid)
+        db.session.expire_all()
+        self.assertEqual(str(uuid.UUID(bytes=raw)), DepartmentModel.query.first().uuid)
+
+    def test_find_by_uuid(self):
+        """
+        Checks whether departments are found by string or uuid object, and not found
+        by a string which is not a valid uuid.
+        """
+        self.assertEqual('Finance', DepartmentService.find_by_uuid(self.department.uuid).name)
+        self.assertEqual('Finance', DepartmentService.find_by_uuid(
+            uuid.UUID(self.department.uuid)).name)
+        self.assertIsNone(DepartmentService.find_by_uuid('not-a-uuid'))
+
+    def test_malformed_uuid_rejected(self):
+        """
+        Checks whether a value which is not a valid uuid is not stored as NULL.
+        """
+        self.department.uuid = 'not-a-uuid'
+        with self.assertRaises(StatementError):
+            db.session.commit()
+        db.session.rollback()
+        self.assertIsNotNone(DepartmentService.find_by_uuid(
+            DepartmentModel.query.first().uuid))
+
+    def test_literal_uuid(self):
+        """
+        Checks whether a uuid is rendered as a binary literal, e.g. in offline migrations.
+        """
+        value = str(uuid.UUID(int=1))
+        statement = insert(DepartmentModel.__table__).values(
+            uuid=value, name='Sales', description='Some sales department.')
+        rendered = {dialect.name: str(statement.compile(
+            dialect=dialect, compile_kwargs={'literal_binds': True}))
+            for dialect in (mysql.dialect(), postgresql.dialect(), db.engine.dialect)}
+        self.assertIn("X'00000000000000000000000000000001'", rendered['mysql'])
+        self.assertIn("decode('00000000000000000000000000000001', 'hex')",
+                      rendered['postgresql'])
+        db.session.execute(rendered['sqlite'])
+        self.assertEqual('Sales', DepartmentService.find_by_uuid(value).name)